@@ -22,7 +22,7 @@ async def approve_training(
     Approve training data.
     """
     from app.core.config import get_settings
-    settings = get_settings(force_reload=True)
+    settings = get_settings()
     if settings.RBAC_ENABLED:
         perms = user.get("permissions") or []
         aliases = {"training:approve", "training.approve"}
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends
 
 from app.api.dependencies import require_permission, UserContext
 from app.core.config import get_settings
+from app.services.observability_service import ObservabilityService
 
 
 router = APIRouter(prefix="/admin/observability", tags=["admin-observability"])
@@ -20,3 +21,48 @@ async def observability_status(user: UserContext = Depends(require_permission("a
         "arabic_nlp": arabic_nlp,
         "alerts": alerts,
     }
+
+
+@router.get("/db-pool")
+async def db_pool_status(user: UserContext = Depends(require_permission("admin:view"))):
+    return ObservabilityService.db_pool_stats()
+
+
+@router.get("/sql-guard")
+async def sql_guard_status(user: UserContext = Depends(require_permission("admin:view"))):
+    return ObservabilityService.sql_guard_stats()
+
+
+@router.get("/audit-writer")
+async def audit_writer_status(user: UserContext = Depends(require_permission("admin:view"))):
+    return ObservabilityService.audit_writer_stats()
+
+
+@router.get("/result-cache")
+async def result_cache_status(user: UserContext = Depends(require_permission("admin:view"))):
+    return ObservabilityService.result_cache_stats()
+
+
+@router.get("/semantic-cache")
+async def semantic_cache_status(user: UserContext = Depends(require_permission("admin:view"))):
+    return ObservabilityService.semantic_cache_stats()
+
+
+@router.get("/embedding-cache")
+async def embedding_cache_status(user: UserContext = Depends(require_permission("admin:view"))):
+    return ObservabilityService.embedding_cache_stats()
+
+
+@router.get("/coalescing")
+async def coalescing_status(user: UserContext = Depends(require_permission("admin:view"))):
+    return ObservabilityService.coalescing_stats()
+
+
+@router.get("/llm-router")
+async def llm_router_status(user: UserContext = Depends(require_permission("admin:view"))):
+    return ObservabilityService.llm_router_stats()
+
+
+@router.get("/rate-limit")
+async def rate_limit_status(user: UserContext = Depends(require_permission("admin:view"))):
+    return ObservabilityService.rate_limit_stats()
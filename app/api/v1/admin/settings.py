@@ -6,10 +6,11 @@ from typing import Dict, Any, List
 
 from fastapi import APIRouter, Depends, HTTPException
 from opentelemetry import trace
+from pydantic import TypeAdapter, ValidationError
 from opentelemetry.trace import Status, StatusCode
 
 from app.api.dependencies import require_permission, UserContext
-from app.core.config import get_settings
+from app.core.config import Settings, apply_runtime_toggle, get_settings
 from app.core.exceptions import ServiceUnavailableError
 from app.services.audit_service import AuditService
 from app.services.sentry_service import SentryService
@@ -37,7 +38,7 @@ _SENTRY_CALL_LOG: List[float] = []
 
 
 def _ensure_admin(user: UserContext) -> None:
-    settings = get_settings(force_reload=True)
+    settings = get_settings()
     if settings.ENV.lower() == "local" and getattr(settings, "ADMIN_LOCAL_BYPASS", False):
         return
     if user.get("role") != "admin":
@@ -48,7 +49,7 @@ def _ensure_admin(user: UserContext) -> None:
 
 
 def _current_feature_state() -> Dict[str, Any]:
-    settings = get_settings(force_reload=True)
+    settings = get_settings()
     return {
         "ENABLE_SEMANTIC_CACHE": settings.ENABLE_SEMANTIC_CACHE,
         "ENABLE_RATE_LIMIT": settings.ENABLE_RATE_LIMIT,
@@ -114,6 +115,10 @@ async def update_feature_toggle(payload: dict, user: UserContext = Depends(requi
         raise HTTPException(status_code=400, detail="Unsupported feature toggle")
     if not reason or len(reason) < 10:
         raise HTTPException(status_code=400, detail="Change reason is required.")
+    try:
+        new_value = TypeAdapter(Settings.model_fields[feature].annotation).validate_python(new_value)
+    except ValidationError:
+        raise HTTPException(status_code=400, detail=f"Invalid value for {feature}.")
 
     state = _current_feature_state()
     old_value = state.get(feature)
@@ -132,8 +137,9 @@ async def update_feature_toggle(payload: dict, user: UserContext = Depends(requi
         },
     ) as span:
         try:
-            # Runtime application: registry can be added here.
-            # For now, acknowledge change (no .env mutation).
+            # Runtime application: publish a new settings snapshot with the
+            # override (no .env mutation); subsequent requests see it.
+            apply_runtime_toggle(feature, new_value)
             audit_service.log(
                 user_id=user.get("user_id", "anonymous"),
                 role=user.get("role", "guest"),
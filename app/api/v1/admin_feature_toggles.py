@@ -15,7 +15,7 @@ from typing import Optional
 from pydantic import BaseModel, Field
 from fastapi import APIRouter, HTTPException, Depends, status
 
-from app.core.config import get_settings
+from app.core.config import apply_runtime_toggle, get_settings
 from app.core.admin_rbac import (
     require_admin,
     require_reason,
@@ -109,6 +109,9 @@ async def change_feature_toggle(request: FeatureToggleRequest) -> FeatureToggleR
         # Get old value
         old_value = getattr(settings, toggle_name, None)
         
+        # Apply in-process: publishes a new settings snapshot
+        apply_runtime_toggle(toggle_name, new_value)
+        
         # Record in audit trail
         if new_value:
             audit_event = audit_trail.toggle_enabled(
@@ -29,7 +29,7 @@ async def chat_stream(
     - No policy logic here
     - No exception leakage
     """
-    settings = get_settings(force_reload=True)
+    settings = get_settings()
 
     async def event_stream():
         trace_payload = {
@@ -89,7 +89,10 @@ async def chat_stream(
         yield f"event: technical_view\ndata: {json.dumps(technical_view)}\n\n"
 
         # EXECUTION
-        raw_result = await orchestrator.execute_sql(prep["sql"])
+        raw_result = await orchestrator.execute_sql(
+            prep["sql"],
+            cache_key=orchestrator.result_cache_key(prep, user, "rows"),
+        )
 
         if isinstance(raw_result, dict) and raw_result.get("error"):
             yield f"event: error\ndata: {json.dumps({'code': 'EXECUTION_FAILED', 'message': raw_result['error']})}\n\n"
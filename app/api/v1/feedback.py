@@ -8,7 +8,8 @@ from pydantic import BaseModel, Field
 
 from app.api.dependencies import require_permission, UserContext
 from app.core.db import session_scope
-from app.models.internal import TrainingStaging, SchemaAccessPolicy, UserFeedback
+from app.models.internal import TrainingStaging, UserFeedback
+from app.services.schema_policy_service import get_active_policy
 
 
 router = APIRouter(tags=["feedback"])
@@ -31,13 +32,7 @@ async def submit_feedback(
     if not assumptions:
         raise HTTPException(status_code=400, detail="Assumptions are required.")
 
-    with session_scope() as session:
-        policy = (
-            session.query(SchemaAccessPolicy)
-            .filter(SchemaAccessPolicy.status == "active")
-            .order_by(SchemaAccessPolicy.created_at.desc())
-            .first()
-        )
+    policy = get_active_policy()
 
     normalized_sql = payload.sql
 
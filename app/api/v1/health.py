@@ -1,6 +1,7 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
 from app.services.health_service import HealthService
-from app.services.observability_service import ObservabilityService
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -16,4 +17,6 @@ async def llm_health():
 
 @router.get("")
 async def system_health():
-    return ObservabilityService.system_health()
+    health = await HealthService.system_health()
+    # HEALTH_AGGREGATION_MODE=strict reports any failing component as 503.
+    return JSONResponse(health, status_code=503 if health["status"] == "unhealthy" else 200)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 
 from app.api.dependencies import require_permission, optional_auth, UserContext
+from app.services.health_service import HealthService
 from app.services.observability_service import ObservabilityService
 
 router = APIRouter(prefix="/admin", tags=["observability"])
@@ -8,7 +9,7 @@ router = APIRouter(prefix="/admin", tags=["observability"])
 
 @router.get("/health")
 async def system_health(user: UserContext = Depends(require_permission("admin:view"))):
-    return ObservabilityService.system_health()
+    return await HealthService.system_health()
 
 
 @router.get("/metrics")
@@ -1,6 +1,8 @@
+import asyncio
 import json
 import uuid
 from datetime import datetime
+from typing import Literal, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
@@ -28,6 +30,33 @@ def _ts() -> str:
     return datetime.utcnow().isoformat() + "Z"
 
 
+async def _single_batch(batch):
+    yield batch
+
+
+async def _progress_until_done(task: asyncio.Task, progress: asyncio.Queue):
+    """Yield events put on `progress` until `task` finishes; later events are dropped."""
+    while True:
+        getter = asyncio.ensure_future(progress.get())
+        done, _ = await asyncio.wait({task, getter}, return_when=asyncio.FIRST_COMPLETED)
+        if getter in done:
+            yield getter.result()
+            continue
+        getter.cancel()
+        return
+
+
+def _data_body(batch, fmt: str) -> Tuple[dict, list, int]:
+    """Return (payload body, column names, row count) for one data batch."""
+    if fmt == "columnar":
+        batch = batch or {"columns": [], "types": [], "data": []}
+        data = batch.get("data") or []
+        return {"format": "columnar", **batch}, batch.get("columns", []), len(data[0]) if data else 0
+    rows = batch or []
+    columns = list(rows[0].keys()) if rows and isinstance(rows[0], dict) else []
+    return {"rows": rows}, columns, len(rows)
+
+
 def _chunk(chunk_type: str, payload: dict, *, trace_id: str, tier: ConfidenceTier, ts: str) -> str:
     return json.dumps(
         {
@@ -45,6 +74,7 @@ async def ask(
     request: QueryRequest | None = None,
     question: str | None = Query(default=None),
     top_k: int | None = Query(default=None),
+    result_format: Literal["rows", "columnar"] | None = Query(default=None),
     user: UserContext = Depends(require_permission("query:execute")),
 ):
     """
@@ -55,12 +85,13 @@ async def ask(
     
     Args:
         question: Natural language question
+        result_format: "rows" (default) or "columnar" data_chunk encoding
         user: User context (injected automatically)
     
     Returns:
         Query result with optional RLS filtering
     """
-    settings = get_settings(force_reload=True)
+    settings = get_settings()
     if settings.AUTH_ENABLED and not user.get("is_authenticated"):
         raise HTTPException(status_code=401, detail="Authentication required")
     if settings.STREAM_PROTOCOL != "ndjson":
@@ -74,7 +105,7 @@ async def ask(
     orchestration_service: OrchestrationService = tier_router.resolve_ask_service()  # type: ignore[assignment]
 
     async def ndjson_stream():
-        """Stream NDJSON chunks in strict order: technical_view -> data -> chart -> summary."""
+        """Stream NDJSON chunks in strict order: technical_view -> data_chunk(s) -> chart -> summary."""
 
         # NOTE: Runtime contract: NDJSON with strict order technical_view -> data (chart/summary optional).
         # Accept either JSON body (QueryRequest) or query params (question/top_k)
@@ -84,6 +115,7 @@ async def ask(
             raise HTTPException(status_code=422, detail="question is required")
 
         tk = tk if tk is not None else 5
+        fmt = result_format or (request.result_format if request else "rows")
 
         chunk_count = 0
         trace_id = uuid.uuid4().hex
@@ -125,17 +157,37 @@ async def ask(
                     outcome="started",
                 )
 
+                # SQL generation progress (token counts, raw drafts) is forwarded
+                # as extra, non-authoritative thinking chunks while prepare() runs.
+                progress: asyncio.Queue = asyncio.Queue()
                 with tracer.start_as_current_span(
                     "sql.generate",
                     attributes={
                         "question": q_text,
                     },
                 ):
-                    technical_view = await orchestration_service.prepare(
-                        question=q_text,
-                        top_k=tk,
-                        user_context=user,
+                    prepare_task = asyncio.create_task(
+                        orchestration_service.prepare(
+                            question=q_text,
+                            top_k=tk,
+                            user_context=user,
+                            on_progress=progress.put_nowait,
+                        )
                     )
+                    try:
+                        async for event in _progress_until_done(prepare_task, progress):
+                            yield _chunk(
+                                "thinking",
+                                event,
+                                trace_id=trace_id,
+                                tier=ConfidenceTier.TIER_1_LAB,
+                                ts=_ts(),
+                            )
+                            chunk_count += 1
+                    finally:
+                        if not prepare_task.done():
+                            prepare_task.cancel()
+                    technical_view = prepare_task.result()
 
                 sql_text = technical_view.get("sql", "")
                 sql_hash = hashlib.sha256(sql_text.encode("utf-8")).hexdigest() if sql_text else ""
@@ -233,9 +285,27 @@ async def ask(
                             ts=_ts(),
                         )
                         return
-                    raw_result = await orchestration_service.execute_sql(sql_text)
+                    raw_result = None
+                    if not settings.STREAM_DATA_CHUNKS:
+                        raw_result = await orchestration_service.execute_sql(
+                            sql_text,
+                            cache_key=orchestration_service.result_cache_key(technical_view, user, "rows"),
+                        )
 
-                data_payload = orchestration_service.normalise_rows(raw_result)
+                if settings.STREAM_DATA_CHUNKS:
+                    # Pull-driven: each batch is fetched only after the previous
+                    # chunk has been handed to the client (backpressure).
+                    data_batches = orchestration_service.stream_rows(
+                        sql_text,
+                        result_format=fmt,
+                        cache_key=orchestration_service.result_cache_key(technical_view, user, fmt),
+                    )
+                else:
+                    data_batches = _single_batch(
+                        orchestration_service.to_columnar(raw_result)
+                        if fmt == "columnar"
+                        else orchestration_service.normalise_rows(raw_result)
+                    )
 
                 with tracer.start_as_current_span(
                     "ask.stream",
@@ -259,17 +329,45 @@ async def ask(
                             "question": q_text,
                         },
                     ):
-                        yield _chunk(
-                            "data_chunk",
-                            {"rows": data_payload, "row_count": len(data_payload)},
-                            trace_id=trace_id,
-                            tier=ConfidenceTier.TIER_0_FORTRESS,
-                            ts=_ts(),
-                        )
-                        chunk_count += 1
+                        columns: list = []
+                        total_rows = 0
+                        chunk_index = 0
+                        async for batch in data_batches:
+                            body, batch_columns, batch_rows = _data_body(batch, fmt)
+                            if chunk_index and not batch_rows:
+                                continue
+                            columns = columns or batch_columns
+                            total_rows += batch_rows
+                            yield _chunk(
+                                "data_chunk",
+                                {
+                                    **body,
+                                    "row_count": batch_rows,
+                                    "chunk_index": chunk_index,
+                                    "rows_so_far": total_rows,
+                                },
+                                trace_id=trace_id,
+                                tier=ConfidenceTier.TIER_0_FORTRESS,
+                                ts=_ts(),
+                            )
+                            chunk_index += 1
+                            chunk_count += 1
+
+                        if chunk_index == 0:
+                            body, _, _ = _data_body(None, fmt)
+                            yield _chunk(
+                                "data_chunk",
+                                {**body, "row_count": 0, "chunk_index": 0, "rows_so_far": 0},
+                                trace_id=trace_id,
+                                tier=ConfidenceTier.TIER_0_FORTRESS,
+                                ts=_ts(),
+                            )
+                            chunk_index += 1
+                            chunk_count += 1
+                        stream_span.set_attribute("stream.data_chunks", chunk_index)
+                        stream_span.set_attribute("stream.row_count", total_rows)
 
-                        chart_payload = orchestration_service.chart_recommendation(data_payload)
-                        columns = list(data_payload[0].keys()) if data_payload and isinstance(data_payload[0], dict) else []
+                        chart_payload = orchestration_service.chart_recommendation(columns)
                         advisory_chart = advisor.suggest_chart(columns)
                         if advisory_chart:
                             yield _chunk(
@@ -281,7 +379,10 @@ async def ask(
                             )
                             chunk_count += 1
 
-                        summary_payload = orchestration_service.summary_text(raw_result)
+                        if settings.STREAM_DATA_CHUNKS:
+                            summary_payload = orchestration_service.row_count_summary(total_rows)["text"]
+                        else:
+                            summary_payload = orchestration_service.summary_text(raw_result)
                         yield _chunk(
                             "business_view",
                             {"chart": chart_payload, "summary": summary_payload},
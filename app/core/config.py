@@ -5,6 +5,22 @@ This module exposes the Settings model and cached accessors.
 It intentionally contains no tier-specific or business logic.
 """
 
-from app.core.settings import Settings, get_settings, settings
+from app.core.settings import (
+    Settings,
+    apply_runtime_toggle,
+    clear_runtime_toggles,
+    get_settings,
+    get_settings_version,
+    refresh_settings,
+    settings,
+)
 
-__all__ = ["Settings", "get_settings", "settings"]
+__all__ = [
+    "Settings",
+    "apply_runtime_toggle",
+    "clear_runtime_toggles",
+    "get_settings",
+    "get_settings_version",
+    "refresh_settings",
+    "settings",
+]
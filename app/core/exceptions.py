@@ -9,6 +9,8 @@ them into JSON responses with consistent structure.
 from __future__ import annotations
 
 from typing import Callable
+import functools
+import inspect
 import time
 
 
@@ -69,16 +71,35 @@ class CircuitBreaker:
     databases).  When the number of consecutive failures exceeds
     `max_failures`, the circuit is opened and subsequent calls will
     immediately raise `ServiceUnavailableError` until `timeout`
-    seconds have passed.
+    seconds have passed.  Coroutine functions are wrapped with an async
+    wrapper so failures are recorded when the call is awaited.  Exceptions
+    listed in `ignore` propagate without counting as failures.
     """
 
-    def __init__(self, max_failures: int = 5, timeout: int = 60):
+    def __init__(self, max_failures: int = 5, timeout: int = 60, ignore: tuple = ()):
         self.max_failures = max_failures
         self.timeout = timeout
+        self.ignore = ignore
         self.failure_count = 0
         self.last_failure_time: float | None = None
 
     def __call__(self, func: Callable):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if self._is_open():
+                    raise ServiceUnavailableError()
+                try:
+                    result = await func(*args, **kwargs)
+                    self._reset()
+                    return result
+                except self.ignore:
+                    raise
+                except Exception:
+                    self._record_failure()
+                    raise
+            return async_wrapper
+
         def wrapper(*args, **kwargs):
             if self._is_open():
                 raise ServiceUnavailableError()
@@ -86,11 +107,26 @@ class CircuitBreaker:
                 result = func(*args, **kwargs)
                 self._reset()
                 return result
+            except self.ignore:
+                raise
             except Exception:
                 self._record_failure()
                 raise
         return wrapper
 
+    @property
+    def is_open(self) -> bool:
+        return self.failure_count >= self.max_failures and (
+            self.last_failure_time is None or time.time() - self.last_failure_time < self.timeout
+        )
+
+    def record_success(self) -> None:
+        """Close the circuit; for callers that track outcomes themselves."""
+        self._reset()
+
+    def record_failure(self) -> None:
+        self._record_failure()
+
     def _is_open(self) -> bool:
         if self.failure_count >= self.max_failures:
             if self.last_failure_time is None:
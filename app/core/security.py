@@ -4,7 +4,8 @@ Security and authentication utilities.
 Governance Compliance:
 - JWT secrets are validated at startup by policy_guard.py
 - No global JWT manager instances at import time
-- All functions use get_settings(force_reload=True) for runtime validation
+- All functions read the current settings snapshot (get_settings) so env
+  file changes and admin toggles are honoured without per-call re-parsing
 """
 
 import logging
@@ -40,7 +41,7 @@ def create_access_token(
         - Requires JWT secrets to be configured
         - Fails closed if secrets missing
     """
-    settings = get_settings(force_reload=True)
+    settings = get_settings()
     
     if not settings.JWT_SECRET_KEY:
         raise ValueError("JWT_SECRET_KEY is not configured")
@@ -93,7 +94,7 @@ def decode_access_token(token: str) -> Dict[str, Any]:
         - Checks issuer and audience claims
         - Fails closed if secrets missing
     """
-    settings = get_settings(force_reload=True)
+    settings = get_settings()
     
     if not settings.JWT_SECRET_KEY:
         raise AuthenticationError("JWT_SECRET_KEY is not configured")
@@ -146,7 +147,7 @@ def verify_token_claims(payload: Dict[str, Any]) -> bool:
 # Test function for development
 def generate_test_token() -> str:
     """Generate a test token for development purposes."""
-    settings = get_settings(force_reload=True)
+    settings = get_settings()
     if settings.ENV != "local":
         raise RuntimeError("Test tokens only available in local environment")
     
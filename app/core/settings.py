@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import os
 import re
-from functools import lru_cache
-from typing import Literal, Optional
+import threading
+from typing import Any, Dict, Literal, Optional, Tuple
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, ValidationInfo, field_validator
@@ -22,7 +23,7 @@ class Settings(BaseSettings):
     # Core Provider Selectors
     # =========================================================================
     DB_PROVIDER: Literal["oracle", "mssql"] = "oracle"
-    LLM_PROVIDER: Literal["openai", "google", "ollama", "openai_compatible", "groq"] = "groq"
+    LLM_PROVIDER: Literal["openai", "google", "ollama", "openai_compatible", "groq", "router"] = "groq"
     VECTOR_DB: Literal["chromadb", "qdrant"] = "chromadb"
 
     # =========================================================================
@@ -41,12 +42,21 @@ class Settings(BaseSettings):
     RBAC_ENABLED: bool = True
     RLS_ENABLED: bool = True
     ADMIN_LOCAL_BYPASS: bool = False
+    POLICY_CACHE_TTL_SECONDS: int = 30
+    SQLGUARD_VERDICT_CACHE_SIZE: int = 1024
 
     # =========================================================================
     # Feature Toggles
     # =========================================================================
     ENABLE_LOGGING: bool = True
     ENABLE_AUDIT_LOGGING: bool = True
+    AUDIT_WRITE_MODE: Literal["sync", "async"] = "async"
+    AUDIT_BATCH_SIZE: int = Field(100, ge=1)
+    AUDIT_FLUSH_INTERVAL_MS: int = Field(250, ge=1)
+    AUDIT_QUEUE_MAX: int = Field(10000, ge=1)
+    AUDIT_QUEUE_OVERFLOW: Literal["block", "spill"] = "block"
+    AUDIT_QUEUE_BLOCK_TIMEOUT_MS: int = Field(200, ge=0)
+    AUDIT_SPILL_PATH: str = "./data/audit_spill.jsonl"
     ENABLE_RATE_LIMIT: bool = True
     ENABLE_GZIP_COMPRESSION: bool = True
     ENABLE_PERFORMANCE: bool = True
@@ -90,6 +100,18 @@ class Settings(BaseSettings):
     ORACLE_PASSWORD: Optional[str] = None
     ORACLE_DSN: Optional[str] = None
 
+    # Session pool (shared by every tier within a worker process)
+    ORACLE_POOL_ENABLED: bool = True
+    ORACLE_POOL_MIN: int = Field(1, ge=0)
+    ORACLE_POOL_MAX: int = Field(10, ge=1)
+    ORACLE_POOL_INCREMENT: int = Field(1, ge=1)
+    ORACLE_POOL_PING_INTERVAL: int = 60
+    ORACLE_POOL_STMT_CACHE_SIZE: int = Field(50, ge=0)
+    ORACLE_POOL_ACQUIRE_TIMEOUT: int = Field(10, ge=0)
+
+    # Per-worker cap on concurrent business-DB queries (bounded executor)
+    DB_MAX_CONCURRENCY: int = Field(8, ge=1)
+
     # =========================================================================
     # System Database
     # =========================================================================
@@ -100,6 +122,8 @@ class Settings(BaseSettings):
     # Vector Store
     # =========================================================================
     VECTOR_STORE_PATH: str = "./data/vectorstore"
+    EMBEDDING_CACHE_MAX_BYTES: int = Field(67_108_864, ge=0)
+    EMBEDDING_CACHE_DIR: str = ""
     QDRANT_URL: Optional[str] = None
     QDRANT_API_KEY: Optional[str] = None
 
@@ -139,6 +163,9 @@ class Settings(BaseSettings):
 
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "llama3"
+    OLLAMA_TIMEOUT: int = Field(120, ge=1)
+    OLLAMA_KEEP_ALIVE: str = "30m"
+    OLLAMA_WARMUP: bool = True
 
     GROQ_API_KEY: Optional[str] = None
     GROQ_MODEL: str = "llama-3.1-8b-instant"
@@ -156,11 +183,30 @@ class Settings(BaseSettings):
     LLM_TEMPERATURE: float = Field(0.1, ge=0.0, le=1.0)
     LLM_MAX_TOKENS: int = 2048
     LLM_REQUEST_TIMEOUT: int = 60
+    LLM_CONNECT_TIMEOUT_SECONDS: float = Field(5.0, gt=0)
+    LLM_MAX_RETRIES: int = Field(2, ge=0)
+    LLM_HTTP2: bool = True
+    LLM_HTTP_MAX_CONNECTIONS: int = Field(100, ge=1)
+    LLM_HTTP_MAX_KEEPALIVE: int = Field(20, ge=0)
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = Field(30.0, ge=0)
+    LLM_STREAM_SQL: bool = True
+    LLM_STREAM_SQL_DRAFTS: bool = True
+    LLM_STREAM_PROGRESS_EVERY_TOKENS: int = Field(16, ge=1)
+    LLM_ROUTER_PROVIDERS: list[str] = Field(default_factory=lambda: ["groq", "openai_compatible"])
+    LLM_ROUTER_HEDGE: bool = True
+    LLM_ROUTER_HEDGE_MIN_MS: int = Field(250, ge=0)
+    LLM_ROUTER_HEDGE_MAX_MS: int = Field(5000, ge=0)
+    LLM_ROUTER_ATTEMPT_TIMEOUT_SECONDS: float = Field(20.0, gt=0)
+    LLM_ROUTER_WINDOW: int = Field(100, ge=1)
+    LLM_ROUTER_MAX_FAILURES: int = Field(3, ge=1)
+    LLM_ROUTER_RESET_SECONDS: int = Field(30, ge=1)
 
     # =========================================================================
     # RAG / Vanna Controls
     # =========================================================================
     RAG_TOP_K: int = 5
+    RAG_CONTEXT_TOKEN_BUDGET: int = Field(1500, ge=1)
+    RAG_PRUNE_MIN_COLUMNS: int = Field(12, ge=0)
     MAX_SQL_TOKENS: int = 2000
     VANNA_ALLOW_DDL: bool = False
     VANNA_MAX_ROWS: int = 500
@@ -220,13 +266,25 @@ Rules:
     # Governed Semantic Cache
     # =========================================================================
     ENABLE_SEMANTIC_CACHE: bool = False
+    ENABLE_REQUEST_COALESCING: bool = True
     SEMANTIC_CACHE_SIMILARITY_THRESHOLD: float = 0.85
     SEMANTIC_CACHE_MAX_RESULTS: int = 3
     SEMANTIC_CACHE_TTL_SECONDS: int = 3600
     SEMANTIC_CACHE_GOVERNANCE_MODE: Literal["revalidate"] = "revalidate"
     SEMANTIC_CACHE_STORE_SQL: bool = True
     SEMANTIC_CACHE_STORE_RESULTS: bool = True
+    SEMANTIC_CACHE_RESULT_TTL_SECONDS: int = Field(300, ge=0)
+    SEMANTIC_CACHE_RESULT_MAX_ROWS: int = Field(5000, ge=0)
+    SEMANTIC_CACHE_RESULT_MAX_ENTRY_BYTES: int = Field(1_048_576, ge=0)
+    SEMANTIC_CACHE_RESULT_MAX_BYTES: int = Field(67_108_864, ge=0)
+    SEMANTIC_CACHE_MEMORY_MAX_BYTES: int = Field(33_554_432, ge=0)
+    SEMANTIC_CACHE_MEMORY_MAX_ENTRIES: int = Field(10_000, ge=0)
+    SEMANTIC_CACHE_NEAR_CACHE_TTL_SECONDS: int = Field(10, ge=0)
     REDIS_URL: Optional[str] = None
+    REDIS_MAX_CONNECTIONS: int = Field(50, ge=1)
+    REDIS_SOCKET_TIMEOUT_MS: int = Field(250, ge=1)
+    REDIS_CIRCUIT_MAX_FAILURES: int = Field(5, ge=1)
+    REDIS_CIRCUIT_RESET_SECONDS: int = Field(30, ge=1)
 
     # =========================================================================
     # Admin Feature Governance
@@ -256,14 +314,18 @@ Rules:
     # =========================================================================
     # Rate Limiting
     # =========================================================================
-    RATE_LIMIT_REQUESTS_PER_MINUTE: int = 60
+    RATE_LIMIT_REQUESTS_PER_MINUTE: int = Field(60, ge=1)
     RATE_LIMIT_SCOPE: Literal["user", "ip", "global"] = "user"
+    RATE_LIMIT_BACKEND: Literal["memory", "redis"] = "memory"
+    RATE_LIMIT_MAX_KEYS: int = Field(100_000, ge=1)
+    RATE_LIMIT_EXEMPT_PATHS: list[str] = Field(default_factory=lambda: ["/api/v1/health", "/metrics"])
 
     # =========================================================================
     # Health Checks
     # =========================================================================
     HEALTH_CHECK_ENABLED: bool = True
     HEALTH_CHECK_TIMEOUT: int = 5
+    HEALTH_CHECK_INTERVAL_SECONDS: int = Field(15, ge=1)
     HEALTH_AGGREGATION_MODE: Literal["strict", "degraded"] = "degraded"
 
     # =========================================================================
@@ -273,6 +335,8 @@ Rules:
     CORS_ORIGINS: list[str] = Field(default_factory=list)
     STREAM_PROTOCOL: Literal["ndjson", "sse"] = "ndjson"
     DEFAULT_ROW_LIMIT: int = 100
+    STREAM_DATA_CHUNKS: bool = True
+    STREAM_CHUNK_ROWS: int = Field(500, ge=1)
 
     # =========================================================================
     # Sandbox / Shadow Execution
@@ -340,11 +404,95 @@ Rules:
                 self.TRAINING_READINESS_ENFORCED = False
 
 
-@lru_cache
+# =============================================================================
+# Settings snapshot
+# =============================================================================
+#
+# Parsing `.env` and validating every field is far too expensive to do per
+# request, so the process holds one versioned Settings snapshot.  It is
+# rebuilt only when:
+#   - the env file changes on disk (mtime/size stamp differs), or
+#   - an admin applies a runtime toggle (apply_runtime_toggle), or
+#   - a caller explicitly asks for it (refresh_settings / force_reload=True).
+#
+# Treat the returned object as read-only: it is shared by every request.
+
+_snapshot: Optional[Settings] = None
+_snapshot_version = 0
+_snapshot_stamp: Optional[Tuple[int, int]] = None
+_runtime_overrides: Dict[str, Any] = {}
+_snapshot_lock = threading.Lock()
+
+
+def _env_file_stamp() -> Optional[Tuple[int, int]]:
+    env_file = Settings.model_config.get("env_file")
+    if not env_file or not isinstance(env_file, (str, os.PathLike)):
+        return None
+    try:
+        st = os.stat(env_file)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _rebuild_snapshot(stamp: Optional[Tuple[int, int]], overrides: Optional[Dict[str, Any]] = None) -> Settings:
+    global _snapshot, _snapshot_version, _snapshot_stamp
+    _snapshot = Settings(**(_runtime_overrides if overrides is None else overrides))
+    _snapshot_stamp = stamp
+    _snapshot_version += 1
+    return _snapshot
+
+
 def get_settings(force_reload: bool = False) -> Settings:
-    if force_reload:
-        get_settings.cache_clear()
-    return Settings()
+    """
+    Return the current settings snapshot.
+
+    Cheap on the hot path (one stat of the env file).  `force_reload=True`
+    rebuilds the snapshot unconditionally and is meant for scripts and
+    tests that change the environment, not for request handlers.
+    """
+    stamp = _env_file_stamp()
+    current = _snapshot
+    if current is not None and not force_reload and stamp == _snapshot_stamp:
+        return current
+    with _snapshot_lock:
+        if _snapshot is not None and not force_reload and stamp == _snapshot_stamp:
+            return _snapshot
+        return _rebuild_snapshot(stamp)
+
+
+def refresh_settings() -> Settings:
+    """Re-read the environment and publish a new snapshot."""
+    return get_settings(force_reload=True)
+
+
+def get_settings_version() -> int:
+    """Monotonic version of the active snapshot (bumps on every rebuild)."""
+    get_settings()
+    return _snapshot_version
+
+
+def apply_runtime_toggle(name: str, value: Any) -> Settings:
+    """
+    Override a runtime toggle in-process and publish a new snapshot.
+
+    Overrides take precedence over the env file and survive env-file driven
+    refreshes until cleared with `clear_runtime_toggles`.  The override is
+    kept only if the resulting settings validate; otherwise the pydantic
+    ValidationError (a ValueError) propagates and nothing changes.
+    """
+    if name not in Settings.model_fields:
+        raise ValueError(f"Unknown setting: {name}")
+    with _snapshot_lock:
+        snapshot = _rebuild_snapshot(_env_file_stamp(), {**_runtime_overrides, name: value})
+        _runtime_overrides[name] = getattr(snapshot, name)
+        return snapshot
+
+
+def clear_runtime_toggles() -> Settings:
+    with _snapshot_lock:
+        _runtime_overrides.clear()
+        return _rebuild_snapshot(_env_file_stamp())
 
 
 settings = get_settings()
\ No newline at end of file
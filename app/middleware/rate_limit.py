@@ -1,33 +1,274 @@
 """
-Rate limiting middleware stub.
+Request rate limiting.
 
-This middleware limits the number of requests per user/IP within a
-time window.  It is disabled by default via configuration.  Actual
-implementation should store counters in a shared cache (e.g. Redis).
+Each client may make RATE_LIMIT_REQUESTS_PER_MINUTE requests per minute.
+Clients are keyed by RATE_LIMIT_SCOPE:
+
+- `user`: the `sub` of a valid bearer token, or the client IP for
+  anonymous requests;
+- `ip`: the client IP;
+- `global`: one budget shared by every client.
+
+Limits use a sliding-window counter.  Each key keeps only the request
+counts of the current and previous fixed window.  The previous count is
+weighted by how much of it still overlaps the sliding window.  Memory is
+O(1) per key and each request is O(1), unlike the old per-IP timestamp
+lists.
+
+Backends (RATE_LIMIT_BACKEND):
+
+- `memory`: per process.  Keys idle for a full window are evicted, and
+  at most RATE_LIMIT_MAX_KEYS are kept (least recently seen first out).
+- `redis`: one atomic Lua script per request on the shared REDIS_URL
+  pool, so every worker enforces the same budget.  The script uses
+  Redis' clock.  While Redis is unavailable, the process falls back to
+  its in-memory counters.
+
+Rejected requests get 429 with `Retry-After`.  Every limited response
+carries `X-RateLimit-Limit` and `X-RateLimit-Remaining`.  Paths under
+RATE_LIMIT_EXEMPT_PATHS (health probes) are not limited.  The
+middleware is always installed and checks ENABLE_RATE_LIMIT on every
+request, so the admin feature toggle takes effect without a restart.
 """
 
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
-from fastapi import HTTPException, status
-import time
+from starlette.responses import JSONResponse, Response
+
+from app.core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 60
+
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0
+
+
+def _retry_after(previous: float, current: float, elapsed: float, window: float, limit: int) -> float:
+    """Seconds until one more request fits under the sliding-window estimate."""
+    if current + 1 <= limit:
+        # The weighted previous window has to decay far enough.
+        return max((window - elapsed) - (limit - 1 - current) * window / previous, 0.0)
+    # The current window alone is full: wait for it to roll over and decay.
+    return (window - elapsed) + window * (1 - (limit - 1) / current)
+
+
+class InMemoryRateLimiter:
+    """Sliding-window counters per key, with idle-key eviction."""
+
+    def __init__(self, limit: int, window_seconds: float = WINDOW_SECONDS, max_keys: int = 100_000) -> None:
+        self.limit = limit
+        self.window = window_seconds
+        self.max_keys = max_keys
+        # key -> [window index, current count, previous count]; oldest-seen first.
+        self._counters: "OrderedDict[str, List[int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._rejected = 0
+
+    def _evict(self, index: int) -> None:
+        while self._counters:
+            key, counter = next(iter(self._counters.items()))
+            if counter[0] >= index - 1 and len(self._counters) <= self.max_keys:
+                break
+            del self._counters[key]
+
+    def _counter(self, key: str, index: int) -> List[int]:
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = [index, 0, 0]
+        else:
+            self._counters.move_to_end(key)
+            if counter[0] != index:
+                counter[2] = counter[1] if counter[0] == index - 1 else 0
+                counter[0], counter[1] = index, 0
+        return counter
+
+    def hit(self, key: str, now: Optional[float] = None, *, record: bool = True) -> RateLimitDecision:
+        """Count one request for `key` if it fits; report the outcome either way."""
+        now = time.time() if now is None else now
+        index = int(now // self.window)
+        elapsed = now - index * self.window
+        with self._lock:
+            counter = self._counter(key, index)
+            self._evict(index)
+            _, current, previous = counter
+            estimate = previous * (self.window - elapsed) / self.window + current
+            if estimate + 1 > self.limit:
+                self._rejected += 1
+                return RateLimitDecision(
+                    False, self.limit, 0, _retry_after(previous, current, elapsed, self.window, self.limit)
+                )
+            if record:
+                counter[1] += 1
+            return RateLimitDecision(True, self.limit, max(int(self.limit - estimate - 1), 0))
+
+    # RateLimiterProtocol (app.providers.concerns_base)
+    def is_allowed(self, user_id: str) -> bool:
+        return self.hit(user_id, record=False).allowed
+
+    def record_request(self, user_id: str) -> None:
+        self.hit(user_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"keys": len(self._counters), "rejected": self._rejected}
+
+
+_SLIDING_WINDOW_LUA = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local index = math.floor(now_ms / window)
+local elapsed = now_ms - index * window
+local current_key = KEYS[1] .. ':' .. index
+local current = tonumber(redis.call('GET', current_key) or '0')
+local previous = tonumber(redis.call('GET', KEYS[1] .. ':' .. (index - 1)) or '0')
+local estimate = previous * (window - elapsed) / window + current
+if estimate + 1 > limit then
+  local retry
+  if current + 1 <= limit then
+    retry = (window - elapsed) - (limit - 1 - current) * window / previous
+  else
+    retry = (window - elapsed) + window * (1 - (limit - 1) / current)
+  end
+  return {0, 0, math.ceil(math.max(retry, 0))}
+end
+redis.call('INCR', current_key)
+redis.call('PEXPIRE', current_key, window * 2)
+return {1, math.floor(limit - estimate - 1), 0}
+"""
+
+
+class RedisRateLimiter:
+    """Sliding-window counters in Redis, shared by every worker."""
+
+    def __init__(self, backend: Any, limit: int, fallback: InMemoryRateLimiter,
+                 window_seconds: float = WINDOW_SECONDS, prefix: str = "ratelimit") -> None:
+        self.backend = backend
+        self.limit = limit
+        self.window_ms = int(window_seconds * 1000)
+        self.prefix = prefix
+        self.fallback = fallback
+        self._script = backend.client.register_script(_SLIDING_WINDOW_LUA)
+
+    async def hit(self, key: str) -> RateLimitDecision:
+        try:
+            allowed, remaining, retry_ms = await self.backend.run_script(
+                self._script,
+                # Hash tag keeps both window keys of a client in one cluster slot.
+                keys=[f"{self.prefix}:{{{key}}}"],
+                args=[self.limit, self.window_ms],
+            )
+        except Exception as exc:
+            logger.warning("Redis rate limiter unavailable, using local counters: %s", exc)
+            return self.fallback.hit(key)
+        return RateLimitDecision(bool(allowed), self.limit, max(int(remaining), 0), int(retry_ms) / 1000)
+
+
+_local_limiter: Optional[InMemoryRateLimiter] = None
+_local_lock = threading.Lock()
+
+
+def get_local_rate_limiter(settings: Settings) -> InMemoryRateLimiter:
+    """Process-wide in-memory limiter (the `memory` backend, and the Redis fallback)."""
+    global _local_limiter
+    with _local_lock:
+        if _local_limiter is None:
+            _local_limiter = InMemoryRateLimiter(
+                settings.RATE_LIMIT_REQUESTS_PER_MINUTE,
+                max_keys=settings.RATE_LIMIT_MAX_KEYS,
+            )
+        return _local_limiter
+
+
+def reset_rate_limiters() -> None:
+    global _local_limiter
+    with _local_lock:
+        _local_limiter = None
+
+
+def rate_limit_stats() -> Dict[str, Any]:
+    with _local_lock:
+        return _local_limiter.stats() if _local_limiter is not None else {"keys": 0, "rejected": 0}
+
+
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit_key(request: Request, scope: str) -> str:
+    """Identity a request is counted against under RATE_LIMIT_SCOPE."""
+    if scope == "global":
+        return "global"
+    if scope == "user":
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and token:
+            from app.core.security import decode_access_token
+            try:
+                subject = decode_access_token(token).get("sub")
+            except Exception:
+                # Invalid tokens are rejected by auth; count them per IP.
+                subject = None
+            if subject:
+                return f"user:{subject}"
+    return f"ip:{_client_ip(request)}"
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, max_requests: int = 100, window_seconds: int = 60):
+    def __init__(self, app, settings: Optional[Settings] = None):
         super().__init__(app)
-        self.max_requests = max_requests
-        self.window_seconds = window_seconds
-        self.requests: dict[str, list[float]] = {}
+        # Without explicit settings, every request reads the current
+        # snapshot so ENABLE_RATE_LIMIT can be toggled at runtime.
+        self._settings = settings
+        initial = settings or get_settings()
+        self.local = get_local_rate_limiter(initial)
+        self.redis: Optional[RedisRateLimiter] = None
+        if initial.RATE_LIMIT_BACKEND == "redis":
+            from app.providers.cache.redis_provider import get_redis_cache
+            backend = get_redis_cache(initial)
+            if backend is None:
+                logger.warning("RATE_LIMIT_BACKEND=redis without REDIS_URL; limiting per process")
+            else:
+                self.redis = RedisRateLimiter(backend, initial.RATE_LIMIT_REQUESTS_PER_MINUTE, self.local)
+
+    @property
+    def settings(self) -> Settings:
+        return self._settings or get_settings()
 
     async def dispatch(self, request: Request, call_next) -> Response:
-        identifier = request.client.host  # naive IP‑based identifier
-        current_time = time.time()
-        requests = self.requests.setdefault(identifier, [])
-        # Remove timestamps outside the window
-        self.requests[identifier] = [t for t in requests if current_time - t < self.window_seconds]
-        if len(self.requests[identifier]) >= self.max_requests:
-            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many requests")
-        # Record this request
-        self.requests[identifier].append(current_time)
-        return await call_next(request)
\ No newline at end of file
+        settings = self.settings
+        if not settings.ENABLE_RATE_LIMIT:
+            return await call_next(request)
+        if request.url.path.startswith(tuple(settings.RATE_LIMIT_EXEMPT_PATHS)):
+            return await call_next(request)
+
+        key = rate_limit_key(request, settings.RATE_LIMIT_SCOPE)
+        decision = await self.redis.hit(key) if self.redis is not None else self.local.hit(key)
+        headers = {
+            "X-RateLimit-Limit": str(decision.limit),
+            "X-RateLimit-Remaining": str(decision.remaining),
+        }
+        if not decision.allowed:
+            headers["Retry-After"] = str(max(math.ceil(decision.retry_after), 1))
+            return JSONResponse({"detail": "Too many requests"}, status_code=429, headers=headers)
+
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
@@ -6,7 +6,7 @@ requests for different endpoints.
 """
 
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Literal, Optional, List
 
 
 class QueryRequest(BaseModel):
@@ -15,6 +15,7 @@ class QueryRequest(BaseModel):
     question: str
     context: Optional[dict] = None
     top_k: int = 5
+    result_format: Literal["rows", "columnar"] = "rows"
 
 
 class TrainingItem(BaseModel):
@@ -8,7 +8,9 @@ concrete providers based on configuration.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Iterable, Tuple, Dict, List
+from typing import Any, AsyncIterator, Iterable, Iterator, Tuple, Dict, List, Optional
+
+from app.utils.column_types import infer_column_types
 
 
 class BaseDatabaseProvider(ABC):
@@ -22,6 +24,85 @@ class BaseDatabaseProvider(ABC):
     def execute(self, sql: str, parameters: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
         """Execute a read‑only query and return rows as dictionaries."""
 
+    async def execute_async(
+        self, sql: str, parameters: Dict[str, Any] | None = None
+    ) -> List[Dict[str, Any]]:
+        """Run `execute` on the bounded DB executor without blocking the event loop."""
+        from app.providers.database.executor import get_db_executor
+
+        return await get_db_executor().run(self.execute, sql, parameters)
+
+    def iter_batches(
+        self,
+        sql: str,
+        parameters: Dict[str, Any] | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield result rows in batches of at most `batch_size`.
+
+        The default implementation slices a fully fetched result; drivers
+        with cursor-level fetching should override it to bound memory.
+        """
+        rows = self.execute(sql, parameters)
+        for start in range(0, len(rows), max(batch_size, 1)):
+            yield rows[start:start + batch_size]
+
+    def iter_columnar_batches(
+        self,
+        sql: str,
+        parameters: Dict[str, Any] | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield batches as `{"columns", "types", "data"}` with one array per column.
+
+        The default implementation transposes `iter_batches`.  Types are
+        inferred once per stream, from the first non-null value of each
+        column in the first batch, and repeated unchanged on later batches;
+        a column with no value in that batch is "unknown".
+        """
+        columns: List[str] | None = None
+        types: List[str] = []
+        for rows in self.iter_batches(sql, parameters, batch_size):
+            if not rows:
+                continue
+            if columns is None:
+                columns = list(rows[0].keys())
+            data = [[row.get(col) for row in rows] for col in columns]
+            if not types:
+                types = infer_column_types(data)
+            yield {"columns": columns, "types": types, "data": data}
+
+    async def stream_async(
+        self,
+        sql: str,
+        parameters: Dict[str, Any] | None = None,
+        batch_size: int = 500,
+        columnar: bool = False,
+    ) -> AsyncIterator[Any]:
+        """
+        Asynchronously yield row batches, fetching each one on the DB executor.
+
+        Fetching is pull-driven: the next batch is only requested when the
+        consumer asks for it, so a slow client naturally throttles the cursor.
+        With `columnar=True` batches come from `iter_columnar_batches`.
+        """
+        from app.providers.database.executor import get_db_executor
+
+        executor = get_db_executor()
+        source = self.iter_columnar_batches if columnar else self.iter_batches
+        batches = source(sql, parameters, batch_size)
+        exhausted = object()
+        try:
+            while True:
+                batch = await executor.run(next, batches, exhausted)
+                if batch is exhausted:
+                    break
+                yield batch
+        finally:
+            await executor.run(batches.close)
+
 
 class BaseVectorStore(ABC):
     """Contract for vector store providers used in RAG."""
@@ -34,6 +115,25 @@ class BaseVectorStore(ABC):
     def query(self, query_text: str, n_results: int) -> List[Tuple[str, Dict[str, Any]]]:
         """Return the top N documents similar to the query text."""
 
+    def query_scored(
+        self, query_text: str, n_results: int, query_embedding: Any = None
+    ) -> List[Tuple[str, Dict[str, Any], Optional[float]]]:
+        """
+        Like `query`, with each document's distance to the query (lower is
+        closer).  Stores that do not report distances return None scores
+        in similarity order.
+        """
+        extra = {"query_embedding": query_embedding} if query_embedding is not None else {}
+        return [(doc, meta, None) for doc, meta in self.query(query_text, n_results=n_results, **extra)]
+
+    def embed(self, texts: List[str]) -> List[Any] | None:
+        """
+        Embed `texts` with the store's embedding model so callers can reuse
+        one vector across several queries.  None means the store embeds
+        internally and only accepts text.
+        """
+        return None
+
 
 class BaseLLMProvider(ABC):
     """
@@ -44,6 +144,15 @@ class BaseLLMProvider(ABC):
     async def generate_sql(self, prompt: str) -> str:
         ...
 
+    async def stream_sql(
+        self, prompt: str, temperature: float = 0.0, max_tokens: int = 512
+    ) -> AsyncIterator[str]:
+        """
+        Yield the completion as it is produced.  Providers without a
+        streaming API yield the whole `generate_sql` result once.
+        """
+        yield await self.generate_sql(prompt=prompt, temperature=temperature, max_tokens=max_tokens)
+
     @abstractmethod
     async def health_check(self) -> Dict[str, Any]:
         """
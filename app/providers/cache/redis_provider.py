@@ -0,0 +1,150 @@
+"""
+Asyncio Redis backend for the governed semantic cache.
+
+One `AsyncRedisCache` per Redis URL is shared by the whole process, so
+every `SemanticCacheService` draws from the same connection pool
+(REDIS_MAX_CONNECTIONS).  When every connection is busy a command waits
+up to REDIS_SOCKET_TIMEOUT_MS for one to be released, then runs bounded
+by REDIS_SOCKET_TIMEOUT_MS, behind a `CircuitBreaker`: after
+REDIS_CIRCUIT_MAX_FAILURES consecutive failures calls fail fast with
+`ServiceUnavailableError` for REDIS_CIRCUIT_RESET_SECONDS, and callers
+degrade to their in-process cache instead of waiting on a dead server.
+
+A pool that stays exhausted raises `MaxConnectionsError`.  That is local
+back-pressure, not a sign the server is down, so it does not count
+towards opening the circuit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    import redis.asyncio as aioredis  # type: ignore
+    from redis.exceptions import ConnectionError as RedisConnectionError  # type: ignore
+    from redis.exceptions import MaxConnectionsError  # type: ignore
+except Exception:  # pragma: no cover
+    aioredis = None
+
+    class MaxConnectionsError(Exception):  # type: ignore[no-redef]
+        pass
+
+from app.core.config import Settings
+from app.core.exceptions import CircuitBreaker
+
+
+class AsyncRedisCache:
+    """Pooled `redis.asyncio` client with timeouts and a circuit breaker."""
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        timeout: float,
+        pool_timeout: float = 0.0,
+        max_failures: int = 5,
+        reset_seconds: int = 30,
+    ) -> None:
+        self.client = client
+        self.timeout = timeout
+        self.pool_timeout = pool_timeout
+        self.breaker = CircuitBreaker(
+            max_failures=max_failures, timeout=reset_seconds, ignore=(MaxConnectionsError,)
+        )
+        self._execute = self.breaker(self._execute_raw)
+
+    async def _execute_raw(self, command: Callable[[Any], Awaitable[Any]]) -> Any:
+        # The pool wait and the command itself each get their own budget.
+        return await asyncio.wait_for(command(self.client), self.pool_timeout + self.timeout)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._execute(lambda client: client.get(key))
+
+    async def set_many(self, items: Iterable[Tuple[str, str, int]]) -> None:
+        """Write several `(key, value, ttl_seconds)` entries in one round trip."""
+
+        async def command(client: Any) -> Any:
+            pipe = client.pipeline(transaction=False)
+            for key, value, ttl in items:
+                pipe.set(key, value, ex=ttl)
+            return await pipe.execute()
+
+        await self._execute(command)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._execute(lambda client: client.delete(*keys))
+
+    async def run_script(self, script: Any, keys: Iterable[str], args: Iterable[Any]) -> Any:
+        """Run a script registered with `client.register_script` (EVALSHA, loaded on first miss)."""
+        return await self._execute(lambda client: script(keys=list(keys), args=list(args), client=client))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "circuit_open": self.breaker.is_open,
+            "consecutive_failures": self.breaker.failure_count,
+        }
+
+
+if aioredis is not None:
+
+    class _BlockingPool(aioredis.BlockingConnectionPool):
+        """Waits `timeout` for a free connection, then raises `MaxConnectionsError`."""
+
+        async def get_connection(self, *args: Any, **kwargs: Any) -> Any:
+            try:
+                return await super().get_connection(*args, **kwargs)
+            except RedisConnectionError as exc:
+                if isinstance(exc.__cause__, asyncio.TimeoutError):
+                    raise MaxConnectionsError("Redis connection pool exhausted") from exc
+                raise
+
+
+_backends: Dict[str, AsyncRedisCache] = {}
+_backends_lock = threading.Lock()
+
+
+def get_redis_cache(settings: Settings) -> Optional[AsyncRedisCache]:
+    """Process-wide backend for `settings.REDIS_URL` (None when unset)."""
+    url = settings.REDIS_URL
+    if not url or aioredis is None:
+        return None
+    with _backends_lock:
+        backend = _backends.get(url)
+        if backend is None:
+            timeout = settings.REDIS_SOCKET_TIMEOUT_MS / 1000
+            pool = _BlockingPool.from_url(
+                url,
+                decode_responses=True,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=timeout,
+                socket_timeout=timeout,
+                socket_connect_timeout=timeout,
+            )
+            backend = AsyncRedisCache(
+                aioredis.Redis(connection_pool=pool),
+                timeout=timeout,
+                pool_timeout=timeout,
+                max_failures=settings.REDIS_CIRCUIT_MAX_FAILURES,
+                reset_seconds=settings.REDIS_CIRCUIT_RESET_SECONDS,
+            )
+            _backends[url] = backend
+        return backend
+
+
+def redis_cache_stats() -> Dict[str, Any]:
+    with _backends_lock:
+        return {url.rsplit("@", 1)[-1]: backend.stats() for url, backend in _backends.items()}
+
+
+async def close_redis_caches() -> None:
+    with _backends_lock:
+        backends = list(_backends.values())
+        _backends.clear()
+    for backend in backends:
+        try:
+            await backend.client.aclose()
+        except Exception:
+            pass
@@ -40,9 +40,8 @@ def get_rate_limiter(settings: Settings):
     if not settings.ENABLE_RATE_LIMIT:
         return NoOpRateLimiter()
 
-    # Import real implementation when available
-    # For now, return NoOp as placeholder
-    return NoOpRateLimiter()
+    from app.middleware.rate_limit import get_local_rate_limiter
+    return get_local_rate_limiter(settings)
 
 
 def get_audit_logger(settings: Settings):
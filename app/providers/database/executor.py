@@ -0,0 +1,117 @@
+"""
+Bounded executor for blocking database drivers.
+
+Database providers (`oracledb` thin mode, `pyodbc`) expose synchronous
+APIs.  Calling them directly from an `async` route freezes the event loop
+for the full round-trip and serialises every concurrent stream in the
+worker.  This module runs those calls on a dedicated thread pool whose
+size is capped by DB_MAX_CONCURRENCY, so:
+
+- the event loop keeps serving other requests while a query runs;
+- at most DB_MAX_CONCURRENCY queries hit the database per worker
+  (excess callers wait in the queue instead of piling onto the DB).
+
+Keep ORACLE_POOL_MAX >= DB_MAX_CONCURRENCY so that executor threads never
+block on pool acquisition.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from app.core.config import get_settings
+
+T = TypeVar("T")
+
+
+class DatabaseExecutor:
+    """Thread pool dedicated to blocking DB calls, with queue/in-flight stats."""
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max(int(max_workers), 1)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="db-exec",
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._total_queue_ms = 0.0
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run `func(*args, **kwargs)` on the DB thread pool and await it."""
+        submitted = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        def _call() -> T:
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._in_flight += 1
+                self._total_queue_ms += (started - submitted) * 1000
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                    self._completed += 1
+
+        try:
+            future = self._pool.submit(_call)
+        except RuntimeError:
+            self._unqueue()
+            raise
+        # A pool future can only be cancelled before `_call` starts (the
+        # awaiting request was cancelled, or shutdown dropped the queue).
+        future.add_done_callback(self._unqueue_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _unqueue_if_cancelled(self, future: Future) -> None:
+        if future.cancelled():
+            self._unqueue()
+
+    def _unqueue(self) -> None:
+        with self._lock:
+            self._queued -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._completed
+            return {
+                "max_concurrency": self.max_workers,
+                "in_flight": self._in_flight,
+                "queued": self._queued,
+                "completed": completed,
+                "avg_queue_ms": round(self._total_queue_ms / completed, 3) if completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: DatabaseExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> DatabaseExecutor:
+    """Return the per-process DB executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = DatabaseExecutor(get_settings().DB_MAX_CONCURRENCY)
+    return _executor
+
+
+def shutdown_db_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
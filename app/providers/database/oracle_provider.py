@@ -9,19 +9,109 @@ IMPORTANT:
 - This provider is shared across Tier-0, Tier-1, and Tier-2.
 - It does NOT enforce read-only behavior.
 - Governance and query restrictions are handled at higher layers.
+
+POOLING:
+- When ORACLE_POOL_ENABLED is true, queries borrow sessions from a
+  process-wide `oracledb` session pool instead of opening a new
+  connection per query.
+- Pools are keyed by (user, dsn), so every provider instance in the
+  worker (VannaService, GuardedSqlRunner, NativeSqlRunner, /schema/*)
+  shares the same bounded set of sessions.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 import os
 import re
+import threading
+import time
 import oracledb  # type: ignore
 
 from app.core.config import Settings
 from app.core.exceptions import AppException, InvalidConnectionStringError
+from app.utils.column_types import db_column_type
 from ..base import BaseDatabaseProvider
 
 
+# ============================================================================
+# Process-wide Session Pools
+# ============================================================================
+
+@dataclass
+class _PoolEntry:
+    pool: Any
+    label: str
+    acquires: int = 0
+    timeouts: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record_wait(self, wait_ms: float) -> None:
+        with self.lock:
+            self.acquires += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def record_timeout(self) -> None:
+        with self.lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.pool
+        with self.lock:
+            acquires = self.acquires
+            avg_wait = (self.total_wait_ms / acquires) if acquires else 0.0
+            return {
+                "pool": self.label,
+                "min": getattr(pool, "min", None),
+                "max": getattr(pool, "max", None),
+                "increment": getattr(pool, "increment", None),
+                "open": getattr(pool, "opened", None),
+                "busy": getattr(pool, "busy", None),
+                "acquires": acquires,
+                "acquire_timeouts": self.timeouts,
+                "avg_wait_ms": round(avg_wait, 3),
+                "max_wait_ms": round(self.max_wait_ms, 3),
+            }
+
+
+_POOLS: Dict[Tuple[str, str], _PoolEntry] = {}
+_POOLS_LOCK = threading.Lock()
+# One creation lock per pool key: creating a pool opens ORACLE_POOL_MIN
+# sessions, which must not stall lookups of other, already-built pools.
+_POOL_CREATION_LOCKS: Dict[Tuple[str, str], threading.Lock] = {}
+
+# Errors raised when a POOL_GETMODE_TIMEDWAIT acquire runs out of time
+# (thin mode / thick mode).  Other acquire errors are not pool timeouts.
+_ACQUIRE_TIMEOUT_CODES = frozenset({"DPY-4005", "ORA-24459"})
+
+
+def _error_code(exc: Exception) -> str:
+    err = exc.args[0] if exc.args else None
+    return getattr(err, "full_code", None) or f"ORA-{getattr(err, 'code', '')}"
+
+
+def get_pool_stats() -> List[Dict[str, Any]]:
+    """Return busy/open/wait statistics for every Oracle pool in this process."""
+    with _POOLS_LOCK:
+        entries = list(_POOLS.values())
+    return [entry.snapshot() for entry in entries]
+
+
+def close_pools() -> None:
+    """Close every Oracle pool in this process (used on shutdown)."""
+    with _POOLS_LOCK:
+        entries = list(_POOLS.values())
+        _POOLS.clear()
+    for entry in entries:
+        try:
+            entry.pool.close(force=True)
+        except Exception:
+            pass
+
+
 @dataclass
 class OracleProvider(BaseDatabaseProvider):
     settings: Settings
@@ -38,25 +128,27 @@ class OracleProvider(BaseDatabaseProvider):
         1) ORACLE_CONNECTION_STRING
         2) Discrete DB_* variables
         """
+        return self._connect_with_parts(*self._resolve_parts())
+
+    def _resolve_parts(self) -> Tuple[str, str, str, int, str, bool]:
         conn_str = getattr(self.settings, "ORACLE_CONNECTION_STRING", None)
         if conn_str:
-            return self._connect_from_conn_str(conn_str)
+            return self._parts_from_conn_str(conn_str)
 
         env_conn = self._resolve_env_connection()
         if env_conn:
-            user, password, host, port, db_name, use_service = env_conn
-            return self._connect_with_parts(
-                user, password, host, port, db_name, use_service
-            )
+            return env_conn
 
         raise InvalidConnectionStringError(
             "Missing Oracle connection details; set ORACLE_CONNECTION_STRING "
             "or DB_USER/DB_PASSWORD/DB_HOST/DB_PORT/DB_NAME"
         )
 
-    def _connect_from_conn_str(self, conn_str: str) -> oracledb.Connection:
+    def _parts_from_conn_str(
+        self, conn_str: str
+    ) -> Tuple[str, str, str, int, str, bool]:
         """
-        Parse and connect using a single connection string.
+        Parse a single connection string into connection parts.
 
         Defensive cleanup is applied to tolerate env formatting issues.
         """
@@ -64,8 +156,7 @@ class OracleProvider(BaseDatabaseProvider):
         clean = clean.split()[0]
 
         try:
-            parts = self._parse_connection_string(clean)
-            return self._connect_with_parts(*parts)
+            return self._parse_connection_string(clean)
         except InvalidConnectionStringError:
             raise
         except Exception as exc:
@@ -127,6 +218,14 @@ class OracleProvider(BaseDatabaseProvider):
 
         return user, password, host, port, name, use_service
 
+    @staticmethod
+    def _make_dsn(host: str, port: int, name: str, use_service: bool) -> str:
+        return (
+            oracledb.makedsn(host, port, service_name=name)
+            if use_service
+            else oracledb.makedsn(host, port, sid=name)
+        )
+
     def _connect_with_parts(
         self,
         user: str,
@@ -137,11 +236,7 @@ class OracleProvider(BaseDatabaseProvider):
         use_service: bool,
     ) -> oracledb.Connection:
         try:
-            dsn = (
-                oracledb.makedsn(host, port, service_name=name)
-                if use_service
-                else oracledb.makedsn(host, port, sid=name)
-            )
+            dsn = self._make_dsn(host, port, name, use_service)
             return oracledb.connect(user=user, password=password, dsn=dsn)
 
         except oracledb.Error as exc:
@@ -150,12 +245,107 @@ class OracleProvider(BaseDatabaseProvider):
         except Exception as exc:
             raise AppException(f"Unexpected Oracle connection error: {exc}")
 
+    # ------------------------------------------------------------------ #
+    # Session Pool
+    # ------------------------------------------------------------------ #
+
+    def _pooling_enabled(self) -> bool:
+        return bool(getattr(self.settings, "ORACLE_POOL_ENABLED", False))
+
+    def _get_pool(self) -> _PoolEntry:
+        user, password, host, port, name, use_service = self._resolve_parts()
+        dsn = self._make_dsn(host, port, name, use_service)
+        key = (user.upper(), dsn)
+
+        entry = _POOLS.get(key)
+        if entry is not None:
+            return entry
+
+        with _POOLS_LOCK:
+            creation_lock = _POOL_CREATION_LOCKS.setdefault(key, threading.Lock())
+        with creation_lock:
+            entry = _POOLS.get(key)
+            if entry is None:
+                entry = _PoolEntry(
+                    pool=self._create_pool(user, password, dsn),
+                    label=f"{user.upper()}@{host}:{port}/{name}",
+                )
+                with _POOLS_LOCK:
+                    _POOLS[key] = entry
+        return entry
+
+    def _create_pool(self, user: str, password: str, dsn: str) -> Any:
+        s = self.settings
+        pool_max = max(int(s.ORACLE_POOL_MAX), 1)
+        try:
+            return oracledb.create_pool(
+                user=user,
+                password=password,
+                dsn=dsn,
+                min=min(int(s.ORACLE_POOL_MIN), pool_max),
+                max=pool_max,
+                increment=max(int(s.ORACLE_POOL_INCREMENT), 1),
+                ping_interval=int(s.ORACLE_POOL_PING_INTERVAL),
+                stmtcachesize=int(s.ORACLE_POOL_STMT_CACHE_SIZE),
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=int(s.ORACLE_POOL_ACQUIRE_TIMEOUT) * 1000,
+            )
+        except oracledb.Error as exc:
+            err = exc.args[0]
+            raise AppException(f"Oracle error ORA-{err.code}: {err.message}")
+        except Exception as exc:
+            raise AppException(f"Unexpected Oracle pool error: {exc}")
+
+    @contextmanager
+    def session(self) -> Iterator[oracledb.Connection]:
+        """
+        Borrow a connection for the duration of the block.
+
+        Pooled mode returns the session to the shared pool on exit;
+        otherwise a dedicated connection is opened and closed.
+        """
+        if not self._pooling_enabled():
+            conn = self.connect()
+            try:
+                yield conn
+            finally:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            return
+
+        entry = self._get_pool()
+        started = time.perf_counter()
+        try:
+            conn = entry.pool.acquire()
+        except oracledb.Error as exc:
+            code = _error_code(exc)
+            if code in _ACQUIRE_TIMEOUT_CODES:
+                entry.record_timeout()
+            raise AppException(f"Oracle pool acquire failed {code}: {exc.args[0].message}")
+        entry.record_wait((time.perf_counter() - started) * 1000)
+
+        try:
+            yield conn
+        finally:
+            try:
+                entry.pool.release(conn)
+            except Exception:
+                pass
+
+    def pool_stats(self) -> Optional[Dict[str, Any]]:
+        """Return statistics for this provider's pool, if one has been created."""
+        if not self._pooling_enabled():
+            return None
+        user, _, host, port, name, use_service = self._resolve_parts()
+        entry = _POOLS.get((user.upper(), self._make_dsn(host, port, name, use_service)))
+        return entry.snapshot() if entry else None
+
     def execute(
         self, sql: str, parameters: Dict[str, Any] | None = None
     ) -> List[Dict[str, Any]]:
-        conn = None
-        try:
-            conn = self.connect()
+        with self.session() as conn:
             with conn.cursor() as cursor:
                 cursor.execute(sql, parameters or {})
                 if not cursor.description:
@@ -163,9 +353,67 @@ class OracleProvider(BaseDatabaseProvider):
                 columns = [col[0] for col in cursor.description]
                 return [dict(zip(columns, row)) for row in cursor.fetchall()]
 
-        finally:
-            if conn:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
+    def _iter_cursor_batches(
+        self,
+        sql: str,
+        parameters: Dict[str, Any] | None,
+        batch_size: int,
+    ) -> Iterator[Tuple[List[Any], List[tuple]]]:
+        """
+        Yield `(description, rows)` in `fetchmany` batches over one session.
+
+        `arraysize` matches the batch size so each batch is one round-trip;
+        peak memory is bounded by the batch rather than the result size.
+        """
+        batch_size = max(int(batch_size), 1)
+        with self.session() as conn:
+            with conn.cursor() as cursor:
+                cursor.arraysize = batch_size
+                cursor.prefetchrows = batch_size + 1
+                cursor.execute(sql, parameters or {})
+                if not cursor.description:
+                    return
+                description = list(cursor.description)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield description, rows
+
+    def iter_batches(
+        self,
+        sql: str,
+        parameters: Dict[str, Any] | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield rows as dictionaries in `fetchmany` batches."""
+        for description, rows in self._iter_cursor_batches(sql, parameters, batch_size):
+            columns = [col[0] for col in description]
+            yield [dict(zip(columns, row)) for row in rows]
+
+    def iter_columnar_batches(
+        self,
+        sql: str,
+        parameters: Dict[str, Any] | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield batches transposed straight from cursor tuples into column arrays.
+
+        No per-row dictionaries are built; types come from the cursor
+        description (e.g. DB_TYPE_NUMBER -> "number", DB_TYPE_DATE ->
+        "datetime").
+        """
+        for description, rows in self._iter_cursor_batches(sql, parameters, batch_size):
+            yield {
+                "columns": [col[0] for col in description],
+                "types": [self._type_name(col) for col in description],
+                "data": [list(values) for values in zip(*rows)],
+            }
+
+    @staticmethod
+    def _type_name(col: Any) -> str:
+        type_code = getattr(col, "type_code", None)
+        if type_code is None and isinstance(col, (tuple, list)) and len(col) > 1:
+            type_code = col[1]
+        return db_column_type(type_code)
@@ -10,10 +10,30 @@ Design principles:
 - This module is intentionally conservative and dependency-isolated.
 """
 
+from typing import List
+
 from app.core.config import Settings
 from app.providers.base import BaseLLMProvider
 
 
+def provider_name(name: str) -> str:
+    """Canonical form of a configured provider name (e.g. " Ollama" -> "ollama")."""
+    return (name or "").strip().lower()
+
+
+def llm_backend_names(settings: Settings) -> List[str]:
+    """
+    Canonical names of the LLM providers serving completions: the
+    LLM_ROUTER_PROVIDERS backends (deduplicated) with LLM_PROVIDER=router,
+    LLM_PROVIDER itself otherwise.
+    """
+    provider = provider_name(settings.LLM_PROVIDER)
+    if provider != "router":
+        return [provider]
+    names = dict.fromkeys(provider_name(n) for n in settings.LLM_ROUTER_PROVIDERS)
+    return [name for name in names if name and name != "router"]
+
+
 # ============================================================================
 # LLM Provider Factory
 # ============================================================================
@@ -26,7 +46,10 @@ def create_llm_provider(settings: Settings) -> BaseLLMProvider:
     - This factory does NOT handle Vanna-native LLMs.
     - Vanna LLM services are instantiated separately via vanna_common.
     """
-    provider = settings.LLM_PROVIDER.lower()
+    provider = provider_name(settings.LLM_PROVIDER)
+
+    if provider == "router":
+        return _create_llm_router(settings)
 
     if provider == "openai_compatible":
         from app.providers.llm.openai_compatible_provider import (
@@ -57,20 +80,47 @@ def create_llm_provider(settings: Settings) -> BaseLLMProvider:
 
         # Map Groq configuration into OpenAI-compatible fields
         # This preserves reuse without duplicating provider logic.
+        # Work on a copy: the settings snapshot is shared process-wide.
+        overrides = {}
         if not settings.OPENAI_API_KEY and settings.GROQ_API_KEY:
-            settings.OPENAI_API_KEY = settings.GROQ_API_KEY
+            overrides["OPENAI_API_KEY"] = settings.GROQ_API_KEY
 
         if not getattr(settings, "OPENAI_BASE_URL", None) and settings.GROQ_BASE_URL:
-            settings.OPENAI_BASE_URL = settings.GROQ_BASE_URL
+            overrides["OPENAI_BASE_URL"] = settings.GROQ_BASE_URL
 
         if not settings.OPENAI_MODEL and settings.GROQ_MODEL:
-            settings.OPENAI_MODEL = settings.GROQ_MODEL
+            overrides["OPENAI_MODEL"] = settings.GROQ_MODEL
+
+        if overrides.get("OPENAI_BASE_URL"):
+            overrides["OPENAI_TIMEOUT"] = settings.GROQ_TIMEOUT
+
+        if overrides:
+            settings = settings.model_copy(update=overrides)
 
         return OpenAICompatibleProvider(settings)
 
     raise ValueError(f"Unsupported LLM provider: {provider}")
 
 
+def _create_llm_router(settings: Settings) -> BaseLLMProvider:
+    """
+    Build every backend in LLM_ROUTER_PROVIDERS behind one routing provider.
+    Backends that cannot be configured (missing key, unknown name) are
+    skipped with a warning; the router refuses to start with none.
+    """
+    import logging
+
+    from app.providers.llm.router_provider import LLMRouterProvider
+
+    backends = []
+    for name in llm_backend_names(settings):
+        try:
+            backends.append((name, create_llm_provider(settings.model_copy(update={"LLM_PROVIDER": name}))))
+        except Exception as exc:
+            logging.getLogger(__name__).warning("LLM router skips provider %s: %s", name, exc)
+    return LLMRouterProvider(settings, backends)
+
+
 # ============================================================================
 # Database Provider Factory
 # ============================================================================
@@ -83,7 +133,7 @@ def create_db_provider(settings: Settings):
     - Tier-specific governance is NOT enforced here.
     - Providers are instantiated in their native capability mode.
     """
-    provider = settings.DB_PROVIDER.lower()
+    provider = provider_name(settings.DB_PROVIDER)
 
     if provider == "oracle":
         from app.providers.database.oracle_provider import OracleProvider
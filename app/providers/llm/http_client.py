@@ -0,0 +1,102 @@
+"""
+Shared HTTP transport for OpenAI-compatible LLM endpoints.
+
+Providers are built per `VannaService`, i.e. per request, and the old
+provider talked to the legacy module-level `openai` API, so every call
+opened a fresh TLS connection and blocked the event loop.  This module
+keeps one `httpx.AsyncClient` per process:
+
+- keep-alive pooling bounded by LLM_HTTP_MAX_CONNECTIONS /
+  LLM_HTTP_MAX_KEEPALIVE, idle sockets closed after
+  LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS;
+- HTTP/2 when LLM_HTTP2 is on and the `h2` package is installed;
+- connect timeout LLM_CONNECT_TIMEOUT_SECONDS, read timeout per endpoint
+  (OPENAI_TIMEOUT / GROQ_TIMEOUT / PHI3_TIMEOUT).
+
+`AsyncOpenAI` clients built on top of it are cached per
+(base URL, API key, read timeout) and retry transient failures (connection
+errors, 408/409/429/5xx) LLM_MAX_RETRIES times with the SDK's jittered
+exponential backoff.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.config import Settings
+
+try:
+    import h2  # type: ignore  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    _HTTP2_AVAILABLE = False
+
+
+_http_client: httpx.AsyncClient | None = None
+_clients: Dict[Tuple[Optional[str], str, float], AsyncOpenAI] = {}
+_lock = threading.Lock()
+
+
+def _build_http_client(settings: Settings) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=settings.LLM_HTTP2 and _HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            settings.LLM_REQUEST_TIMEOUT,
+            connect=settings.LLM_CONNECT_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+def get_llm_http_client(settings: Settings) -> httpx.AsyncClient:
+    """Process-wide pooled httpx client shared by every LLM provider."""
+    global _http_client
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = _build_http_client(settings)
+            _clients.clear()
+        return _http_client
+
+
+def get_openai_client(
+    settings: Settings,
+    *,
+    api_key: str,
+    base_url: Optional[str],
+    read_timeout: float,
+) -> AsyncOpenAI:
+    """`AsyncOpenAI` for one endpoint, reusing the shared connection pool."""
+    http_client = get_llm_http_client(settings)
+    key = (base_url, hashlib.sha256(api_key.encode("utf-8")).hexdigest(), float(read_timeout))
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                timeout=httpx.Timeout(read_timeout, connect=settings.LLM_CONNECT_TIMEOUT_SECONDS),
+                max_retries=settings.LLM_MAX_RETRIES,
+                http_client=http_client,
+            )
+            _clients[key] = client
+        return client
+
+
+async def close_llm_clients() -> None:
+    """Close the shared pool (application shutdown)."""
+    global _http_client
+    with _lock:
+        client, _http_client = _http_client, None
+        _clients.clear()
+    if client is not None and not client.is_closed:
+        await client.aclose()
@@ -1,17 +1,38 @@
 """
-Ollama LLM provider stub.
+Ollama LLM provider (on-prem fallback).
 
-This provider integrates with a local or remote Ollama server.  It
-assumes the model is specified via `settings.OLLAMA_MODEL`.  Actual
-network calls are not implemented here.
+Talks to Ollama's HTTP API at `settings.OLLAMA_BASE_URL` over the shared
+LLM connection pool (see `http_client`):
+
+- completions use `/api/chat`; `stream_sql` reads its NDJSON stream and
+  closing the iterator early closes the response, which stops generation;
+- every call sends `keep_alive` (OLLAMA_KEEP_ALIVE) so the model stays
+  loaded between requests instead of being unloaded after Ollama's
+  5 minute default;
+- `warm_up` loads the model without generating anything.  The application
+  runs it at startup (OLLAMA_WARMUP) so the first user request does not
+  pay the model load time;
+- `health_check` lists the local models (`/api/tags`) and reports the
+  round trip, and is unhealthy when OLLAMA_MODEL has not been pulled.
 """
 
-from typing import Dict, List
+from __future__ import annotations
+
+import json
+import logging
+import time
 from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List
+
+import httpx
 
 from app.core.config import Settings
 from app.core.exceptions import AppException
 from ..base import BaseLLMProvider
+from ..factory import llm_backend_names
+from .http_client import get_llm_http_client
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -21,12 +42,138 @@ class OllamaProvider(BaseLLMProvider):
     def __post_init__(self) -> None:
         if not self.settings.OLLAMA_MODEL:
             raise AppException("Ollama model name not configured")
-        # TODO: Connect to Ollama server and load model
+        if not self.settings.OLLAMA_BASE_URL:
+            raise AppException("Ollama base URL not configured")
+        self.model = self.settings.OLLAMA_MODEL
+        self.base_url = self.settings.OLLAMA_BASE_URL.rstrip("/")
+        self.client = get_llm_http_client(self.settings)
+        self.timeout = httpx.Timeout(
+            self.settings.OLLAMA_TIMEOUT,
+            connect=self.settings.LLM_CONNECT_TIMEOUT_SECONDS,
+        )
+
+    def _chat_payload(self, prompt: str, temperature: float, max_tokens: int, stream: bool) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": stream,
+            "keep_alive": self.settings.OLLAMA_KEEP_ALIVE,
+            "options": {"temperature": temperature, "num_predict": max_tokens},
+        }
+
+    async def _chat(self, prompt: str, temperature: float, max_tokens: int) -> str:
+        try:
+            response = await self.client.post(
+                f"{self.base_url}/api/chat",
+                json=self._chat_payload(prompt, temperature, max_tokens, stream=False),
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            return (response.json().get("message", {}).get("content") or "").strip()
+        except Exception as exc:
+            raise AppException(f"Ollama request failed: {exc}")
+
+    async def generate_sql(self, prompt: str, temperature: float = 0.0, max_tokens: int = 512) -> str:
+        return await self._chat(prompt, temperature, max_tokens)
+
+    async def stream_sql(
+        self, prompt: str, temperature: float = 0.0, max_tokens: int = 512
+    ) -> AsyncIterator[str]:
+        """Stream the completion as content deltas from Ollama's NDJSON stream."""
+        request = self.client.build_request(
+            "POST",
+            f"{self.base_url}/api/chat",
+            json=self._chat_payload(prompt, temperature, max_tokens, stream=True),
+            timeout=self.timeout,
+        )
+        try:
+            response = await self.client.send(request, stream=True)
+            response.raise_for_status()
+        except Exception as exc:
+            raise AppException(f"Ollama request failed: {exc}")
+
+        try:
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event.get("error"):
+                    raise AppException(f"Ollama stream failed: {event['error']}")
+                content = (event.get("message") or {}).get("content")
+                if content:
+                    yield content
+                if event.get("done"):
+                    break
+        except AppException:
+            raise
+        except Exception as exc:
+            raise AppException(f"Ollama stream failed: {exc}")
+        finally:
+            await response.aclose()
+
+    async def generate_summary(self, question: str, sql: str, results: List[Dict[str, str]]) -> str:
+        prompt = (
+            f"You are a data analyst. The user asked: '{question}'.\n"
+            f"The SQL executed was: {sql}.\n"
+            f"Here are some of the results: {results[:5]}.\n"
+            "Provide a concise, plain language summary of the findings."
+        )
+        return await self._chat(prompt, temperature=0.2, max_tokens=200)
+
+    async def warm_up(self) -> float:
+        """
+        Load the model into memory and keep it resident for OLLAMA_KEEP_ALIVE.
+        A generate request without a prompt only loads the model.  Returns
+        the seconds it took.
+        """
+        started = time.monotonic()
+        try:
+            response = await self.client.post(
+                f"{self.base_url}/api/generate",
+                json={"model": self.model, "keep_alive": self.settings.OLLAMA_KEEP_ALIVE},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+        except Exception as exc:
+            raise AppException(f"Ollama warm-up failed: {exc}")
+        return time.monotonic() - started
+
+    async def health_check(self) -> Dict[str, Any]:
+        start = time.monotonic()
+        try:
+            response = await self.client.get(f"{self.base_url}/api/tags", timeout=self.timeout)
+            response.raise_for_status()
+            latency = int((time.monotonic() - start) * 1000)
+            names = {m.get("name") for m in response.json().get("models", [])}
+            error = None
+            if self.model not in names and f"{self.model}:latest" not in names:
+                error = f"model {self.model} is not pulled"
+            return {
+                "status": "unhealthy" if error else "healthy",
+                "provider": "ollama",
+                "model": self.model,
+                "latency_ms": latency,
+                "error": error,
+            }
+        except Exception as exc:
+            return {
+                "status": "unhealthy",
+                "provider": "ollama",
+                "model": self.model,
+                "latency_ms": None,
+                "error": str(exc),
+            }
 
-    def generate_sql(self, prompt: str, temperature: float, max_tokens: int) -> str:
-        # TODO: Call Ollama model
-        raise AppException("Ollama LLM provider not implemented")
 
-    def generate_summary(self, question: str, sql: str, results: List[Dict[str, str]]) -> str:
-        # TODO: Call Ollama model for summarisation
-        raise AppException("Ollama LLM provider not implemented")
\ No newline at end of file
+async def warm_up_ollama(settings: Settings) -> None:
+    """
+    Startup hook: preload OLLAMA_MODEL when Ollama serves completions,
+    directly or as an LLM router backend.  Failures are logged only.
+    """
+    if not (settings.OLLAMA_WARMUP and "ollama" in llm_backend_names(settings)):
+        return
+    try:
+        seconds = await OllamaProvider(settings).warm_up()
+        logger.info("Ollama model %s loaded in %.1fs", settings.OLLAMA_MODEL, seconds)
+    except Exception as exc:
+        logger.warning("Ollama warm-up skipped: %s", exc)
@@ -1,16 +1,22 @@
+import time
 from dataclasses import dataclass
-from typing import Dict, List
-
-import openai  # type: ignore
+from typing import Any, AsyncIterator, Dict, List
 
 from app.core.config import Settings
 from app.core.exceptions import AppException
 from ..base import BaseLLMProvider
+from .http_client import get_openai_client
 
 
 @dataclass
 class OpenAICompatibleProvider(BaseLLMProvider):
-    """LLM provider for OpenAI-compatible HTTP endpoints (e.g., Groq)."""
+    """
+    LLM provider for OpenAI-compatible HTTP endpoints (e.g., Groq).
+
+    Calls go through a process-wide `AsyncOpenAI` client on the shared
+    keep-alive pool (see `http_client`), so they never block the event
+    loop and reuse warm connections across requests.
+    """
 
     settings: Settings
 
@@ -18,14 +24,15 @@ class OpenAICompatibleProvider(BaseLLMProvider):
         if not self.settings.OPENAI_API_KEY:
             raise AppException("OpenAI-compatible API key is not configured")
 
-        openai.api_key = self.settings.OPENAI_API_KEY
-
-        if getattr(self.settings, "OPENAI_BASE_URL", None):
-            openai.api_base = self.settings.OPENAI_BASE_URL
-
         self.model = self.settings.OPENAI_MODEL
-
-    def generate_sql(
+        self.client = get_openai_client(
+            self.settings,
+            api_key=self.settings.OPENAI_API_KEY,
+            base_url=getattr(self.settings, "OPENAI_BASE_URL", None) or None,
+            read_timeout=self.settings.OPENAI_TIMEOUT,
+        )
+
+    async def generate_sql(
         self,
         prompt: str,
         temperature: float = 0.0,
@@ -39,18 +46,48 @@ class OpenAICompatibleProvider(BaseLLMProvider):
         across services, streaming paths, and background jobs.
         """
         try:
-            response = openai.ChatCompletion.create(
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            return (response.choices[0].message.content or "").strip()
+
+        except Exception as exc:
+            raise AppException(str(exc))
+
+    async def stream_sql(
+        self,
+        prompt: str,
+        temperature: float = 0.0,
+        max_tokens: int = 512,
+    ) -> AsyncIterator[str]:
+        """
+        Stream the completion as content deltas.  Closing the iterator
+        early closes the HTTP response, which stops generation upstream.
+        """
+        try:
+            stream = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=temperature,
                 max_tokens=max_tokens,
+                stream=True,
             )
-            return response["choices"][0]["message"]["content"].strip()
+        except Exception as exc:
+            raise AppException(str(exc))
 
+        try:
+            async for event in stream:
+                if event.choices and event.choices[0].delta.content:
+                    yield event.choices[0].delta.content
         except Exception as exc:
             raise AppException(str(exc))
+        finally:
+            await stream.close()
 
-    def generate_summary(
+    async def generate_summary(
         self,
         question: str,
         sql: str,
@@ -65,16 +102,33 @@ class OpenAICompatibleProvider(BaseLLMProvider):
                 "Provide a concise, plain language summary of the findings."
             )
 
-            response = openai.ChatCompletion.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.2,
                 max_tokens=200,
             )
-            return response["choices"][0]["message"]["content"].strip()
+            return (response.choices[0].message.content or "").strip()
 
         except Exception as exc:
             raise AppException(str(exc))
 
-    async def health_check(self) -> bool:
-        return True
+    async def health_check(self) -> Dict[str, Any]:
+        start = time.monotonic()
+        try:
+            await self.client.models.list()
+            return {
+                "status": "healthy",
+                "provider": self.settings.LLM_PROVIDER,
+                "model": self.model,
+                "latency_ms": int((time.monotonic() - start) * 1000),
+                "error": None,
+            }
+        except Exception as exc:
+            return {
+                "status": "unhealthy",
+                "provider": self.settings.LLM_PROVIDER,
+                "model": self.model,
+                "latency_ms": None,
+                "error": str(exc),
+            }
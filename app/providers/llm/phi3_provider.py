@@ -1,6 +1,6 @@
 import time
-from openai import AsyncOpenAI
 from app.providers.base import BaseLLMProvider
+from app.providers.llm.http_client import get_openai_client
 from app.core.config import Settings
 
 
@@ -11,23 +11,30 @@ class Phi3Provider(BaseLLMProvider):
     """
 
     def __init__(self, settings: Settings):
-        self.client = AsyncOpenAI(
-            api_key=settings.PHI3_API_KEY,
+        self.client = get_openai_client(
+            settings,
+            api_key=settings.PHI3_API_KEY or "",
             base_url=settings.PHI3_BASE_URL,
+            read_timeout=settings.PHI3_TIMEOUT,
         )
         self.model = settings.PHI3_MODEL
         self.temperature = settings.LLM_TEMPERATURE
         self.max_tokens = settings.LLM_MAX_TOKENS
 
-    async def generate_sql(self, prompt: str) -> str:
+    async def generate_sql(
+        self,
+        prompt: str,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+    ) -> str:
         response = await self.client.chat.completions.create(
             model=self.model,
             messages=[
                 {"role": "system", "content": "You are a SQL expert."},
                 {"role": "user", "content": prompt},
             ],
-            temperature=self.temperature,
-            max_tokens=self.max_tokens,
+            temperature=self.temperature if temperature is None else temperature,
+            max_tokens=self.max_tokens if max_tokens is None else max_tokens,
         )
 
         return response.choices[0].message.content.strip()
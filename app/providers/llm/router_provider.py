@@ -0,0 +1,294 @@
+"""
+Latency-aware routing across several LLM providers.
+
+With LLM_PROVIDER=router, `create_llm_provider` builds every backend listed
+in LLM_ROUTER_PROVIDERS (e.g. groq, openai_compatible, phi3, ollama) and
+wraps them in `LLMRouterProvider`:
+
+- each backend keeps a rolling window (LLM_ROUTER_WINDOW) of call
+  latencies and outcomes, shared process-wide so the history survives
+  the per-request service instances;
+- calls go to the healthy backend with the lowest expected latency
+  (median latency inflated by its error rate); backends without history
+  rank first so they get measured;
+- a backend whose circuit is open (LLM_ROUTER_MAX_FAILURES consecutive
+  failures, for LLM_ROUTER_RESET_SECONDS) is skipped, for hedging and
+  failover alike; only when every circuit is open are all backends tried;
+- with LLM_ROUTER_HEDGE on, a second backend is started if the first has
+  not answered after its p95 latency (clamped to LLM_ROUTER_HEDGE_MIN_MS
+  .. LLM_ROUTER_HEDGE_MAX_MS); the first answer wins, the other call is
+  cancelled;
+- an attempt that fails or exceeds LLM_ROUTER_ATTEMPT_TIMEOUT_SECONDS fails
+  over to the next backend.
+
+Streaming (`stream_sql`) is not hedged; it fails over only until the
+first delta has been yielded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import Settings
+from app.core.exceptions import AppException, CircuitBreaker
+from app.providers.base import BaseLLMProvider
+
+logger = logging.getLogger(__name__)
+
+
+class BackendStats:
+    """Rolling latency/outcome window and circuit state for one backend."""
+
+    def __init__(self, name: str, *, window: int, max_failures: int, reset_seconds: int) -> None:
+        self.name = name
+        self.breaker = CircuitBreaker(max_failures=max_failures, timeout=reset_seconds)
+        self._latencies: deque = deque(maxlen=window)
+        self._outcomes: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.hedges = 0
+        self.wins = 0
+
+    def record(self, elapsed_ms: float, ok: Optional[bool]) -> None:
+        """
+        Record one call.  `ok=None` is a hedged call cancelled because the
+        other backend answered first: its elapsed time is a lower bound on
+        its latency and is kept, but it counts as neither success nor error.
+        """
+        with self._lock:
+            if ok is None:
+                self._latencies.append(elapsed_ms)
+                return
+            self.calls += 1
+            self._outcomes.append(ok)
+            if ok:
+                self._latencies.append(elapsed_ms)
+                self.breaker.record_success()
+            else:
+                self.errors += 1
+                self.breaker.record_failure()
+
+    def record_hedge(self) -> None:
+        """Count a hedged call started on this backend."""
+        with self._lock:
+            self.hedges += 1
+
+    def record_win(self) -> None:
+        """Count a call whose answer this backend supplied."""
+        with self._lock:
+            self.wins += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            outcomes = list(self._outcomes)
+        return outcomes.count(False) / len(outcomes) if outcomes else 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return not self.breaker.is_open
+
+    def expected_ms(self) -> float:
+        """Median latency divided by the success rate; 0 without history."""
+        p50 = self.percentile(0.5)
+        if p50 is None:
+            return 0.0
+        return p50 / max(1.0 - self.error_rate, 0.1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "healthy": self.healthy,
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "p50_ms": round(p50, 1) if p50 is not None else None,
+            "p95_ms": round(p95, 1) if p95 is not None else None,
+            "hedged_requests": self.hedges,
+            "wins": self.wins,
+        }
+
+
+_stats: Dict[str, BackendStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _backend_stats(name: str, settings: Settings) -> BackendStats:
+    with _stats_lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = BackendStats(
+                name,
+                window=settings.LLM_ROUTER_WINDOW,
+                max_failures=settings.LLM_ROUTER_MAX_FAILURES,
+                reset_seconds=settings.LLM_ROUTER_RESET_SECONDS,
+            )
+            _stats[name] = stats
+        return stats
+
+
+def llm_router_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        return {name: stats.snapshot() for name, stats in _stats.items()}
+
+
+def reset_llm_router_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+class LLMRouterProvider(BaseLLMProvider):
+    """Routes each completion to the fastest healthy backend, with hedging and failover."""
+
+    def __init__(self, settings: Settings, backends: Sequence[Tuple[str, BaseLLMProvider]]) -> None:
+        if not backends:
+            raise AppException("LLM router has no usable providers")
+        self.settings = settings
+        self.backends = list(backends)
+        self.model = ",".join(name for name, _ in self.backends)
+        self._stats = {name: _backend_stats(name, settings) for name, _ in self.backends}
+
+    def ranked(self) -> List[Tuple[str, BaseLLMProvider]]:
+        """
+        Backends with a closed circuit, fastest expected latency first.  When
+        every circuit is open all backends are returned, so a request still
+        gets a chance instead of failing outright.
+        """
+        candidates = [item for item in self.backends if self._stats[item[0]].healthy]
+        return sorted(candidates or self.backends, key=lambda item: self._stats[item[0]].expected_ms())
+
+    def hedge_delay(self, name: str) -> float:
+        settings = self.settings
+        p95 = self._stats[name].percentile(0.95)
+        delay_ms = settings.LLM_ROUTER_HEDGE_MAX_MS if p95 is None else p95
+        delay_ms = min(max(delay_ms, settings.LLM_ROUTER_HEDGE_MIN_MS), settings.LLM_ROUTER_HEDGE_MAX_MS)
+        return delay_ms / 1000
+
+    async def _attempt(self, name: str, provider: BaseLLMProvider, **kwargs: Any) -> str:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                provider.generate_sql(**kwargs),
+                timeout=self.settings.LLM_ROUTER_ATTEMPT_TIMEOUT_SECONDS,
+            )
+        except asyncio.CancelledError:
+            self._stats[name].record((time.perf_counter() - started) * 1000, ok=None)
+            raise
+        except Exception:
+            self._stats[name].record((time.perf_counter() - started) * 1000, ok=False)
+            raise
+        self._stats[name].record((time.perf_counter() - started) * 1000, ok=True)
+        return result
+
+    async def generate_sql(self, prompt: str, temperature: float = 0.0, max_tokens: int = 512) -> str:
+        kwargs = {"prompt": prompt, "temperature": temperature, "max_tokens": max_tokens}
+        pending_backends = self.ranked()
+        running: Dict[asyncio.Task, str] = {}
+        last_error: Optional[BaseException] = None
+
+        def launch() -> None:
+            name, provider = pending_backends.pop(0)
+            task = asyncio.ensure_future(self._attempt(name, provider, **kwargs))
+            running[task] = name
+
+        launch()
+        try:
+            while running:
+                timeout = None
+                if (
+                    self.settings.LLM_ROUTER_HEDGE
+                    and pending_backends
+                    and len(running) == 1
+                    and self._stats[pending_backends[0][0]].healthy
+                ):
+                    # Only hedge to a closed circuit; with every circuit open
+                    # the backends are tried one after another instead.
+                    timeout = self.hedge_delay(next(iter(running.values())))
+                done, _ = await asyncio.wait(
+                    set(running), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Slow primary: hedge with the next backend, keep both running.
+                    self._stats[pending_backends[0][0]].record_hedge()
+                    launch()
+                    continue
+                for task in done:
+                    name = running.pop(task)
+                    if task.exception() is None:
+                        self._stats[name].record_win()
+                        return task.result()
+                    last_error = task.exception()
+                    logger.warning("LLM backend %s failed: %s", name, last_error)
+                if not running and pending_backends:
+                    launch()
+        finally:
+            for task in running:
+                task.cancel()
+
+        raise AppException(f"All LLM providers failed: {last_error}")
+
+    async def stream_sql(
+        self, prompt: str, temperature: float = 0.0, max_tokens: int = 512
+    ) -> AsyncIterator[str]:
+        last_error: Optional[BaseException] = None
+        for name, provider in self.ranked():
+            started = time.perf_counter()
+            stream = provider.stream_sql(prompt=prompt, temperature=temperature, max_tokens=max_tokens)
+            try:
+                first = await asyncio.wait_for(
+                    stream.__anext__(), timeout=self.settings.LLM_ROUTER_ATTEMPT_TIMEOUT_SECONDS
+                )
+            except StopAsyncIteration:
+                self._stats[name].record((time.perf_counter() - started) * 1000, ok=True)
+                return
+            except Exception as exc:
+                self._stats[name].record((time.perf_counter() - started) * 1000, ok=False)
+                logger.warning("LLM backend %s failed: %s", name, exc)
+                last_error = exc
+                await stream.aclose()
+                continue
+
+            # Time to first delta is what routing optimises for streams.
+            self._stats[name].record((time.perf_counter() - started) * 1000, ok=True)
+            self._stats[name].record_win()
+            try:
+                yield first
+                async for delta in stream:
+                    yield delta
+            finally:
+                await stream.aclose()
+            return
+
+        raise AppException(f"All LLM providers failed: {last_error}")
+
+    async def health_check(self) -> Dict[str, Any]:
+        checks = await asyncio.gather(
+            *(provider.health_check() for _, provider in self.backends), return_exceptions=True
+        )
+        backends = {
+            name: check if isinstance(check, dict) else {"status": "unhealthy", "error": str(check)}
+            for (name, _), check in zip(self.backends, checks)
+        }
+        healthy = [name for name, check in backends.items() if check.get("status") == "healthy"]
+        latencies = [backends[name].get("latency_ms") for name in healthy]
+        return {
+            "status": "healthy" if healthy else "unhealthy",
+            "provider": "router",
+            "model": self.model,
+            "latency_ms": min((ms for ms in latencies if ms is not None), default=None),
+            "error": None if healthy else "no healthy LLM provider",
+            "backends": backends,
+        }
@@ -6,18 +6,64 @@ embeddings.  It assumes the client is installed via the
 `chromadb` package.  Only minimal functionality is implemented here.
 """
 
-from typing import Iterable, Tuple, Dict, List
+from typing import Any, Iterable, Tuple, Dict, List, Optional
 from dataclasses import dataclass
 from pathlib import Path
 import uuid
 import os
 import importlib.util
+import threading
 
 from app.core.config import Settings
 from app.core.exceptions import AppException
+from app.utils.embedding_cache import get_embedding_cache
 from ..base import BaseVectorStore
 
 
+_embedding_function = None
+_embedding_function_lock = threading.Lock()
+
+
+def get_embedding_function():
+    """
+    Process-wide Chroma embedding function: Chroma's default model
+    (all-MiniLM-L6-v2) behind the embedding memo cache.
+
+    Chroma's own default builds a new ONNX session on every call; this one
+    loads the model once.  It keeps the "default" name, so collections
+    created with Chroma's default function accept it unchanged.
+    """
+    global _embedding_function
+    if _embedding_function is None:
+        with _embedding_function_lock:
+            if _embedding_function is None:
+                from chromadb.utils.embedding_functions import DefaultEmbeddingFunction  # type: ignore
+
+                class CachedEmbeddingFunction(DefaultEmbeddingFunction):
+                    MODEL_ID = "all-MiniLM-L6-v2"
+
+                    def __init__(self) -> None:
+                        super().__init__()
+                        self._model = None
+                        self._model_lock = threading.Lock()
+
+                    def __call__(self, input):  # noqa: A002 - Chroma's signature
+                        return get_embedding_cache(self.MODEL_ID).embed(list(input), self._compute)
+
+                    def _compute(self, texts):
+                        if self._model is None:
+                            with self._model_lock:
+                                if self._model is None:
+                                    from chromadb.utils.embedding_functions.onnx_mini_lm_l6_v2 import (  # type: ignore
+                                        ONNXMiniLM_L6_V2,
+                                    )
+                                    self._model = ONNXMiniLM_L6_V2()
+                        return self._model(texts)
+
+                _embedding_function = CachedEmbeddingFunction()
+    return _embedding_function
+
+
 @dataclass
 class ChromaProvider(BaseVectorStore):
     settings: Settings
@@ -40,9 +86,20 @@ class ChromaProvider(BaseVectorStore):
             path = Path(self.settings.VECTOR_STORE_PATH)
             path.mkdir(parents=True, exist_ok=True)
             self.client = chromadb.PersistentClient(path=str(path))
-            # Using default collections
-            self.collection = self.client.get_or_create_collection("training_data")
-            self.training_collection = self.client.get_or_create_collection("training_context")
+            # One embedding function for every collection, so a vector
+            # computed by `embed` can be passed to any of them.
+            self.embedding_function = get_embedding_function()
+            self.collection = self.get_collection("training_data")
+            self.training_collection = self.get_collection("training_context")
+        except Exception as exc:
+            raise AppException(str(exc))
+
+    def get_collection(self, name: str):
+        return self.client.get_or_create_collection(name, embedding_function=self.embedding_function)
+
+    def embed(self, texts: List[str]) -> List[Any]:
+        try:
+            return list(self.embedding_function(list(texts)))
         except Exception as exc:
             raise AppException(str(exc))
 
@@ -55,12 +112,32 @@ class ChromaProvider(BaseVectorStore):
         except Exception as exc:
             raise AppException(str(exc))
 
-    def query(self, query_text: str, n_results: int) -> List[Tuple[str, Dict[str, any]]]:
+    def query(
+        self,
+        query_text: str,
+        n_results: int,
+        query_embedding: Optional[Any] = None,
+    ) -> List[Tuple[str, Dict[str, any]]]:
+        return [
+            (doc, meta)
+            for doc, meta, _ in self.query_scored(query_text, n_results, query_embedding)
+        ]
+
+    def query_scored(
+        self,
+        query_text: str,
+        n_results: int,
+        query_embedding: Optional[Any] = None,
+    ) -> List[Tuple[str, Dict[str, any], Optional[float]]]:
         try:
-            results = self.collection.query(query_texts=[query_text], n_results=n_results)
+            if query_embedding is not None:
+                results = self.collection.query(query_embeddings=[query_embedding], n_results=n_results)
+            else:
+                results = self.collection.query(query_texts=[query_text], n_results=n_results)
             docs = results.get("documents", [[]])[0]
             metas = results.get("metadatas", [[]])[0]
-            return list(zip(docs, metas))
+            distances = (results.get("distances") or [[]])[0] or [None] * len(docs)
+            return list(zip(docs, metas, distances))
         except Exception as exc:
             raise AppException(str(exc))
 
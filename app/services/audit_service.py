@@ -1,5 +1,8 @@
 """
 Audit service to record immutable audit logs.
+
+With AUDIT_WRITE_MODE=async (default) rows are handed to the write-behind
+AuditWriter and the returned AuditLog is transient (no id yet).
 """
 
 from __future__ import annotations
@@ -8,8 +11,10 @@ import json
 from typing import Any, Optional
 from datetime import datetime
 
+from app.core.config import get_settings
 from app.core.db import session_scope
 from app.models.internal import AuditLog
+from app.services.audit_writer import get_audit_writer
 
 
 class AuditService:
@@ -29,7 +34,7 @@ class AuditService:
         execution_time_ms: int | None = None,
         outcome: str = "success",
     ) -> AuditLog:
-        record = AuditLog(
+        row = dict(
             user_id=user_id or "anonymous",
             role=role or "guest",
             action=action,
@@ -44,6 +49,12 @@ class AuditService:
             timestamp=datetime.utcnow(),
             outcome=outcome,
         )
+        if get_settings().AUDIT_WRITE_MODE == "async":
+            # Write-behind: the background writer bulk-inserts the row.
+            get_audit_writer().submit(row)
+            return AuditLog(**row)
+
+        record = AuditLog(**row)
         with session_scope() as session:
             session.add(record)
             session.flush()
@@ -0,0 +1,402 @@
+"""
+Write-behind audit pipeline.
+
+`AuditService.log` used to open a session and commit once per event, on
+the caller's thread (the event loop for /ask and /chat/stream).  With
+SQLite that meant an fsync per call, at least twice per request.
+
+`AuditWriter` takes the database off the request path:
+
+- `submit()` puts the row on a bounded in-process queue;
+- a background thread drains the queue and bulk-inserts in batches,
+  triggered by AUDIT_BATCH_SIZE rows or AUDIT_FLUSH_INTERVAL_MS;
+- when the queue is full, AUDIT_QUEUE_OVERFLOW decides between blocking
+  the caller (`block`) and appending to AUDIT_SPILL_PATH (`spill`).  A
+  blocked caller waits at most AUDIT_QUEUE_BLOCK_TIMEOUT_MS and then
+  spills.  A caller on the event loop thread never waits and never
+  touches the disk: its row goes on an unbounded overflow list that the
+  writer thread appends to the spill file, since a stalled audit database
+  must not freeze every request (health checks included);
+- batches that fail to insert are also spilled, and spilled rows are
+  replayed once the queue has drained.  A replayed row the database
+  rejects as invalid (constraint violation, bad value) is moved to
+  AUDIT_SPILL_PATH + ".poison" so it cannot hold back the rows after it;
+- `shutdown()` (application lifespan, and atexit as a backstop) flushes
+  everything still queued.
+
+Audit records are never dropped: they are either in the queue, in the
+spill file, in the poison file or in the audit table.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError, StatementError
+
+from app.core.config import get_settings
+from app.core.db import session_scope
+from app.models.internal import AuditLog
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+_REPLAY_BACKOFF_SECONDS = 5.0
+
+
+def _to_spill(row: Dict[str, Any]) -> str:
+    data = dict(row)
+    if isinstance(data.get("timestamp"), datetime):
+        data["timestamp"] = data["timestamp"].isoformat()
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _from_spill(line: str) -> Dict[str, Any]:
+    data = json.loads(line)
+    if data.get("timestamp"):
+        data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+    return data
+
+
+def _is_row_error(exc: BaseException) -> bool:
+    """True when the database rejected the row itself rather than being unavailable."""
+    if isinstance(exc, (IntegrityError, DataError, TypeError, ValueError)):
+        return True
+    # StatementError without a DBAPI error: the row could not be bound.
+    return isinstance(exc, StatementError) and not isinstance(exc, DBAPIError)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class AuditWriter:
+    """Bounded queue + background bulk inserter for audit rows."""
+
+    def __init__(
+        self,
+        *,
+        batch_size: int,
+        flush_interval_ms: int,
+        max_queue: int,
+        overflow: str,
+        spill_path: str,
+        block_timeout_ms: int = 200,
+    ) -> None:
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_interval = max(int(flush_interval_ms), 1) / 1000
+        self.overflow = overflow
+        self.block_timeout = max(int(block_timeout_ms), 0) / 1000
+        self.spill_path = spill_path
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(int(max_queue), 1))
+        self._overflow: "deque[Dict[str, Any]]" = deque()
+        self._spill_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._settled = threading.Condition(self._stats_lock)
+        self._pending = 0
+        self._enqueued = 0
+        self._written = 0
+        self._batches = 0
+        self._spilled = 0
+        self._replayed = 0
+        self._quarantined = 0
+        self._failures = 0
+        self._last_lag_ms = 0.0
+        self._max_lag_ms = 0.0
+        self._last_flush_ms = 0.0
+        self._replay_after = 0.0
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------ #
+    # Producer side
+    # ------------------------------------------------------------------ #
+
+    def submit(self, row: Dict[str, Any]) -> None:
+        item = (time.monotonic(), row)
+        with self._stats_lock:
+            self._pending += 1
+        timeout = 0.0
+        on_loop = _on_event_loop()
+        if self.overflow == "block" and not on_loop:
+            timeout = self.block_timeout
+        try:
+            if timeout > 0:
+                self._queue.put(item, timeout=timeout)
+            else:
+                self._queue.put_nowait(item)
+        except queue.Full:
+            if on_loop:
+                # No file I/O or spill lock on the loop: the writer spills it.
+                self._overflow.append(row)
+                return
+            self._spill([row])
+            self._settle(1)
+            return
+        with self._stats_lock:
+            self._enqueued += 1
+
+    def _settle(self, count: int) -> None:
+        with self._settled:
+            self._pending -= count
+            if self._pending <= 0:
+                self._settled.notify_all()
+
+    # ------------------------------------------------------------------ #
+    # Drain loop
+    # ------------------------------------------------------------------ #
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Tuple[float, Dict[str, Any]]] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            if stopping:
+                batch.extend(self._drain_nowait())
+            if batch:
+                self._write(batch)
+            self._spill_overflow()
+            if stopping or self._queue.empty():
+                self._replay_spill()
+
+    def _spill_overflow(self) -> None:
+        rows = []
+        while True:
+            try:
+                rows.append(self._overflow.popleft())
+            except IndexError:
+                break
+        if rows:
+            self._spill(rows)
+            self._settle(len(rows))
+
+    def _drain_nowait(self) -> List[Tuple[float, Dict[str, Any]]]:
+        items = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return items
+            if item is not _STOP:
+                items.append(item)
+
+    def _write(self, batch: List[Tuple[float, Dict[str, Any]]]) -> None:
+        rows = [row for _, row in batch]
+        started = time.monotonic()
+        for offset in range(0, len(rows), self.batch_size):
+            chunk = rows[offset:offset + self.batch_size]
+            try:
+                self._insert(chunk)
+            except Exception:
+                logger.exception("Audit batch insert failed; spilling %d rows", len(chunk))
+                with self._stats_lock:
+                    self._failures += 1
+                self._spill(chunk)
+                continue
+            with self._stats_lock:
+                self._written += len(chunk)
+                self._batches += 1
+
+        finished = time.monotonic()
+        lag_ms = (finished - batch[0][0]) * 1000
+        with self._stats_lock:
+            self._last_lag_ms = lag_ms
+            self._max_lag_ms = max(self._max_lag_ms, lag_ms)
+            self._last_flush_ms = (finished - started) * 1000
+        self._settle(len(batch))
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        with session_scope() as session:
+            session.bulk_insert_mappings(AuditLog, rows)
+
+    # ------------------------------------------------------------------ #
+    # Spill file
+    # ------------------------------------------------------------------ #
+
+    def _spill(self, rows: List[Dict[str, Any]]) -> None:
+        self._append_spill(self.spill_path, rows)
+        with self._stats_lock:
+            self._spilled += len(rows)
+
+    def _append_spill(self, path: str, rows: List[Dict[str, Any]]) -> None:
+        with self._spill_lock:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as fh:
+                for row in rows:
+                    fh.write(_to_spill(row) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+
+    def _replay_spill(self) -> None:
+        # A leftover .replay file (crash mid-replay) is finished first;
+        # the live spill file is picked up on the next pass.
+        if time.monotonic() < self._replay_after:
+            return
+        pending = self.spill_path + ".replay"
+        with self._spill_lock:
+            if os.path.exists(self.spill_path) and not os.path.exists(pending):
+                os.replace(self.spill_path, pending)
+            if not os.path.exists(pending):
+                return
+        try:
+            with open(pending, encoding="utf-8") as fh:
+                rows = [_from_spill(line) for line in fh if line.strip()]
+        except (OSError, ValueError):
+            quarantined = pending + ".corrupt"
+            logger.exception("Unreadable audit spill file moved to %s", quarantined)
+            os.replace(pending, quarantined)
+            return
+
+        poisoned: List[Dict[str, Any]] = []
+        for offset in range(0, len(rows), self.batch_size):
+            chunk = rows[offset:offset + self.batch_size]
+            try:
+                self._insert(chunk)
+                inserted = len(chunk)
+            except Exception:
+                # Retry row by row, so one row the database rejects does not
+                # hold back every row spilled after it.
+                inserted = 0
+                for index, row in enumerate(chunk):
+                    try:
+                        self._insert([row])
+                    except Exception as exc:
+                        if _is_row_error(exc):
+                            logger.warning("Audit row rejected on replay; quarantined: %s", exc)
+                            poisoned.append(row)
+                            continue
+                        logger.exception(
+                            "Audit spill replay failed; keeping %d rows", len(rows) - offset - index
+                        )
+                        with self._stats_lock:
+                            self._failures += 1
+                        self._record_replayed(inserted)
+                        self._quarantine(poisoned)
+                        self._replay_after = time.monotonic() + _REPLAY_BACKOFF_SECONDS
+                        # Put the remainder back in front of anything spilled since.
+                        self._append_spill(pending + ".rest", rows[offset + index:])
+                        with self._spill_lock:
+                            os.replace(pending + ".rest", pending)
+                        return
+                    inserted += 1
+            self._record_replayed(inserted)
+        self._quarantine(poisoned)
+        os.remove(pending)
+
+    def _record_replayed(self, count: int) -> None:
+        if count:
+            with self._stats_lock:
+                self._written += count
+                self._batches += 1
+                self._replayed += count
+
+    def _quarantine(self, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            self._append_spill(self.spill_path + ".poison", rows)
+            with self._stats_lock:
+                self._quarantined += len(rows)
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle / metrics
+    # ------------------------------------------------------------------ #
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything submitted so far is written or spilled."""
+        with self._settled:
+            return self._settled.wait_for(lambda: self._pending <= 0, timeout)
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._queue.mutex:
+            depth = len(self._queue.queue)
+            head = self._queue.queue[0] if depth else None
+        oldest_ms = (time.monotonic() - head[0]) * 1000 if isinstance(head, tuple) else 0.0
+        with self._stats_lock:
+            return {
+                "queue_depth": depth,
+                "oldest_pending_ms": round(oldest_ms, 3),
+                "queue_capacity": self._queue.maxsize,
+                "overflow_pending": len(self._overflow),
+                "overflow_policy": self.overflow,
+                "enqueued": self._enqueued,
+                "written": self._written,
+                "batches": self._batches,
+                "spilled": self._spilled,
+                "replayed": self._replayed,
+                "quarantined": self._quarantined,
+                "failures": self._failures,
+                "last_lag_ms": round(self._last_lag_ms, 3),
+                "max_lag_ms": round(self._max_lag_ms, 3),
+                "last_flush_ms": round(self._last_flush_ms, 3),
+            }
+
+
+_writer: AuditWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditWriter:
+    """Return the per-process audit writer, starting it on first use."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                settings = get_settings()
+                _writer = AuditWriter(
+                    batch_size=settings.AUDIT_BATCH_SIZE,
+                    flush_interval_ms=settings.AUDIT_FLUSH_INTERVAL_MS,
+                    max_queue=settings.AUDIT_QUEUE_MAX,
+                    overflow=settings.AUDIT_QUEUE_OVERFLOW,
+                    spill_path=settings.AUDIT_SPILL_PATH,
+                    block_timeout_ms=settings.AUDIT_QUEUE_BLOCK_TIMEOUT_MS,
+                )
+    return _writer
+
+
+def audit_writer_stats() -> Optional[Dict[str, Any]]:
+    writer = _writer
+    return writer.stats() if writer is not None else None
+
+
+def shutdown_audit_writer() -> None:
+    """Flush queued audit rows and stop the writer (idempotent)."""
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.shutdown()
+            _writer = None
+
+
+atexit.register(shutdown_audit_writer)
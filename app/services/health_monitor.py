@@ -0,0 +1,259 @@
+"""
+Background dependency health probing.
+
+Load balancers poll the health endpoints every few seconds.  Those used
+to build a fresh LLM provider and call it on every hit, while Redis and
+Chroma were reported "ok" just because a URL or path was configured.
+
+`HealthMonitor` probes each dependency every HEALTH_CHECK_INTERVAL_SECONDS
+instead, each probe bounded by HEALTH_CHECK_TIMEOUT:
+
+- llm: the configured provider's `health_check` (the provider is built
+  once and reused);
+- database: `SELECT 1` against the target database (Oracle / MSSQL);
+- system_db: `SELECT 1` against the system database;
+- vector_store: a Chroma heartbeat;
+- redis: `PING` on the shared cache pool ("disabled" without REDIS_URL).
+
+The latest status, latency and error of every component are kept in
+memory.  Health endpoints read that snapshot, so serving them costs no
+I/O.  `aggregate` applies HEALTH_AGGREGATION_MODE to it: any unhealthy
+component makes the service "unhealthy" in strict mode and "degraded"
+otherwise.
+
+With HEALTH_CHECK_ENABLED off, no background task runs.  Endpoints then
+refresh the snapshot on demand, at most once per interval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import Settings, get_settings
+from app.core.db import session_scope
+
+logger = logging.getLogger(__name__)
+
+HEALTHY = "healthy"
+UNHEALTHY = "unhealthy"
+UNKNOWN = "unknown"
+DISABLED = "disabled"
+
+Probe = Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+
+
+@dataclass
+class ComponentHealth:
+    status: str = UNKNOWN
+    latency_ms: Optional[int] = None
+    error: Optional[str] = None
+    checked_at: Optional[float] = None
+    last_error: Optional[str] = None
+    last_error_at: Optional[float] = None
+    consecutive_failures: int = 0
+    details: Optional[Dict[str, Any]] = None
+
+
+class HealthMonitor:
+    """Periodic dependency probes with an in-memory snapshot of the results."""
+
+    def __init__(self, settings: Settings, probes: Optional[Dict[str, Probe]] = None) -> None:
+        self.settings = settings
+        self._probes: Dict[str, Probe] = probes if probes is not None else {
+            "llm": self._probe_llm,
+            "database": self._probe_database,
+            "system_db": self._probe_system_db,
+            "vector_store": self._probe_vector_store,
+            "redis": self._probe_redis,
+        }
+        self._state: Dict[str, ComponentHealth] = {name: ComponentHealth() for name in self._probes}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._refreshing: Optional[asyncio.Task] = None
+        self._last_run = 0.0
+        self._llm = None
+        self._db = None
+        self._vector = None
+
+    # ------------------------------------------------------------------
+    # Probes.  Each returns details for the snapshot, or None when the
+    # component is not configured; raising marks it unhealthy.
+    # ------------------------------------------------------------------
+    async def _probe_llm(self) -> Optional[Dict[str, Any]]:
+        if self._llm is None:
+            from app.providers.factory import create_llm_provider
+            self._llm = create_llm_provider(self.settings)
+        result = await self._llm.health_check()
+        if result.get("status") != HEALTHY:
+            raise RuntimeError(result.get("error") or "LLM provider unhealthy")
+        return result
+
+    async def _probe_database(self) -> Optional[Dict[str, Any]]:
+        from app.providers.factory import create_db_provider, provider_name
+
+        if self._db is None:
+            self._db = create_db_provider(self.settings)
+        provider = provider_name(self.settings.DB_PROVIDER)
+        sql = "SELECT 1 FROM dual" if provider == "oracle" else "SELECT 1"
+        await self._db.execute_async(sql)
+        return {"provider": provider}
+
+    async def _probe_system_db(self) -> Optional[Dict[str, Any]]:
+        def ping() -> None:
+            with session_scope() as session:
+                session.execute(text("SELECT 1"))
+
+        await asyncio.to_thread(ping)
+        return {}
+
+    async def _probe_vector_store(self) -> Optional[Dict[str, Any]]:
+        if self._vector is None:
+            from app.providers.factory import create_vector_provider
+            self._vector = await asyncio.to_thread(create_vector_provider, self.settings)
+        client = getattr(self._vector, "client", None)
+        if client is None:
+            raise RuntimeError(f"{self.settings.VECTOR_DB} vector store has no client")
+        await asyncio.to_thread(client.heartbeat)
+        return {"provider": self.settings.VECTOR_DB}
+
+    async def _probe_redis(self) -> Optional[Dict[str, Any]]:
+        from app.providers.cache.redis_provider import get_redis_cache
+        backend = get_redis_cache(self.settings)
+        if backend is None:
+            return None
+        await backend.client.ping()
+        return {}
+
+    # ------------------------------------------------------------------
+    async def probe(self, name: str) -> ComponentHealth:
+        """Run one probe and store its outcome."""
+        started = time.monotonic()
+        error: Optional[str] = None
+        details: Optional[Dict[str, Any]] = None
+        disabled = False
+        try:
+            details = await asyncio.wait_for(self._probes[name](), timeout=self.settings.HEALTH_CHECK_TIMEOUT)
+            disabled = details is None
+        except asyncio.TimeoutError:
+            error = f"timed out after {self.settings.HEALTH_CHECK_TIMEOUT}s"
+        except Exception as exc:
+            error = str(exc) or type(exc).__name__
+        now = time.time()
+        latency = int((time.monotonic() - started) * 1000)
+
+        with self._lock:
+            state = self._state[name]
+            state.checked_at = now
+            state.details = details
+            if disabled:
+                state.status, state.latency_ms, state.error = DISABLED, None, None
+                state.consecutive_failures = 0
+            elif error is None:
+                state.status, state.latency_ms, state.error = HEALTHY, latency, None
+                state.consecutive_failures = 0
+            else:
+                state.status, state.latency_ms, state.error = UNHEALTHY, latency, error
+                state.last_error, state.last_error_at = error, now
+                state.consecutive_failures += 1
+        if error is not None:
+            logger.warning("Health probe %s failed: %s", name, error)
+        return state
+
+    async def probe_all(self) -> None:
+        await asyncio.gather(*(self.probe(name) for name in self._probes))
+        self._last_run = time.monotonic()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as exc:  # pragma: no cover - probe() catches per component
+                logger.warning("Health monitor cycle failed: %s", exc)
+            await asyncio.sleep(self.settings.HEALTH_CHECK_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        """Start probing in the background (application startup)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def ensure_fresh(self) -> None:
+        """
+        Without the background task, refresh a snapshot older than one
+        interval.  Concurrent callers share the same refresh.
+        """
+        if self.running:
+            return
+        if self._last_run and time.monotonic() - self._last_run < self.settings.HEALTH_CHECK_INTERVAL_SECONDS:
+            return
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self.probe_all())
+        await asyncio.shield(self._refreshing)
+
+    # ------------------------------------------------------------------
+    def component(self, name: str) -> Dict[str, Any]:
+        with self._lock:
+            return asdict(self._state[name])
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: asdict(state) for name, state in self._state.items()}
+
+    def aggregate(self) -> Dict[str, Any]:
+        """Overall status under HEALTH_AGGREGATION_MODE, plus every component."""
+        components = self.snapshot()
+        failing = [name for name, state in components.items() if state["status"] == UNHEALTHY]
+        if not failing:
+            status = HEALTHY
+        elif self.settings.HEALTH_AGGREGATION_MODE == "strict":
+            status = UNHEALTHY
+        else:
+            status = "degraded"
+        return {
+            "status": status,
+            "mode": self.settings.HEALTH_AGGREGATION_MODE,
+            "failing": failing,
+            "components": components,
+        }
+
+
+_monitor: Optional[HealthMonitor] = None
+_monitor_lock = threading.Lock()
+
+
+def get_health_monitor() -> HealthMonitor:
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = HealthMonitor(get_settings())
+        return _monitor
+
+
+def start_health_monitor() -> None:
+    """Application startup: begin background probing when HEALTH_CHECK_ENABLED."""
+    if get_settings().HEALTH_CHECK_ENABLED:
+        get_health_monitor().start()
+
+
+async def stop_health_monitor() -> None:
+    global _monitor
+    with _monitor_lock:
+        monitor, _monitor = _monitor, None
+    if monitor is not None:
+        await monitor.stop()
@@ -1,10 +1,22 @@
-from app.providers.factory import create_llm_provider
-from app.core.config import settings
+from typing import Any, Dict
+
+from app.services.health_monitor import get_health_monitor
+from app.services.observability_service import ObservabilityService
 
 
 class HealthService:
+    """Health endpoints, served from the health monitor's snapshot."""
+
+    @staticmethod
+    async def llm_health() -> Dict[str, Any]:
+        monitor = get_health_monitor()
+        await monitor.ensure_fresh()
+        state = monitor.component("llm")
+        details = dict(state.pop("details") or {})
+        details.update(state)
+        return details
 
     @staticmethod
-    async def llm_health():
-        llm = create_llm_provider(settings)
-        return await llm.health_check()
+    async def system_health() -> Dict[str, Any]:
+        await get_health_monitor().ensure_fresh()
+        return ObservabilityService.system_health()
@@ -79,7 +79,9 @@ class NoOpOrchestrationService(OrchestrationService):
     def execute(self, request: AskRequest) -> Iterable[BaseChunk]:
         return []
 
-    async def prepare(self, *, question: str, user_context: Any, top_k: int = 5) -> Dict[str, Any]:
+    async def prepare(
+        self, *, question: str, user_context: Any, top_k: int = 5, on_progress: Any = None
+    ) -> Dict[str, Any]:
         return {}
 
     async def execute_sql(self, sql: str) -> Any:
@@ -4,8 +4,6 @@ import time
 from statistics import mean
 from typing import Dict, Any, List
 
-from sqlalchemy import text
-
 try:
     import psutil  # type: ignore
 except ImportError:  # pragma: no cover
@@ -19,36 +17,37 @@ from app.models.internal import AuditLog
 class ObservabilityService:
     @staticmethod
     def system_health() -> Dict[str, Any]:
+        """
+        Service health from the health monitor's last probes (no I/O; see
+        app.services.health_monitor), under HEALTH_AGGREGATION_MODE.
+        """
+        from app.services.health_monitor import get_health_monitor
+
         settings = get_settings()
-        db_status = "ok"
-        try:
-            with session_scope() as session:
-                session.execute(text("SELECT 1"))
-        except Exception as exc:  # pragma: no cover
-            db_status = f"error: {exc}"
-
-        chroma_status = "unknown"
-        try:
-            # Lazy check: path existence for persistent vector store
-            chroma_status = "ok" if settings.VECTOR_STORE_PATH else "unknown"
-        except Exception:
-            chroma_status = "unknown"
+        health = get_health_monitor().aggregate()
+        components = health["components"]
+
+        def legacy(name: str) -> str:
+            status = components[name]["status"]
+            return {"healthy": "ok", "unhealthy": "error"}.get(status, status)
 
+        system_db = components["system_db"]
         start_time = getattr(settings, "START_TIME", None) or getattr(settings, "_START_TIME", None)
         uptime_val = int(time.time() - start_time) if start_time else 0
 
         timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
-        redis_url = getattr(settings, "REDIS_URL", None)
-
         return {
-            "status": "healthy" if db_status == "ok" else "degraded",
-            "database": "ok" if db_status == "ok" else "error",
-            "cache": "ok" if redis_url else "error",
-            "postgres": db_status,
-            "redis": "ok" if redis_url else "error",
-            "chroma": chroma_status,
-            "vector_store": chroma_status,
+            "status": health["status"],
+            "aggregation_mode": health["mode"],
+            "failing": health["failing"],
+            "database": legacy("system_db"),
+            "cache": legacy("redis"),
+            "postgres": f"error: {system_db['error']}" if system_db["error"] else legacy("system_db"),
+            "redis": legacy("redis"),
+            "chroma": legacy("vector_store"),
+            "vector_store": legacy("vector_store"),
+            "components": components,
             "uptime": uptime_val,
             "timestamp": timestamp,
             "features": {
@@ -58,6 +57,102 @@ class ObservabilityService:
             },
         }
 
+    @staticmethod
+    def db_pool_stats() -> Dict[str, Any]:
+        settings = get_settings()
+        pools: List[Dict[str, Any]] = []
+        from app.providers.factory import provider_name
+
+        provider = provider_name(settings.DB_PROVIDER)
+        if provider == "oracle":
+            from app.providers.database.oracle_provider import get_pool_stats
+            pools = get_pool_stats()
+        from app.providers.database.executor import get_db_executor
+        return {
+            "provider": provider,
+            "pooling_enabled": bool(getattr(settings, "ORACLE_POOL_ENABLED", False)),
+            "pools": pools,
+            "executor": get_db_executor().stats(),
+        }
+
+    @staticmethod
+    def audit_writer_stats() -> Dict[str, Any]:
+        from app.services.audit_writer import audit_writer_stats
+        settings = get_settings()
+        return {
+            "mode": settings.AUDIT_WRITE_MODE,
+            "writer": audit_writer_stats(),
+        }
+
+    @staticmethod
+    def semantic_cache_stats() -> Dict[str, Any]:
+        from app.providers.cache.redis_provider import redis_cache_stats
+        from app.services.semantic_cache_service import local_cache_stats
+        settings = get_settings()
+        return {
+            "enabled": settings.ENABLE_SEMANTIC_CACHE,
+            "redis_configured": bool(settings.REDIS_URL),
+            "redis": redis_cache_stats(),
+            "near_cache_ttl_seconds": settings.SEMANTIC_CACHE_NEAR_CACHE_TTL_SECONDS,
+            "local_cache": local_cache_stats(),
+        }
+
+    @staticmethod
+    def embedding_cache_stats() -> Dict[str, Any]:
+        from app.utils.embedding_cache import embedding_cache_stats
+        settings = get_settings()
+        return {
+            "disk_enabled": bool(settings.EMBEDDING_CACHE_DIR),
+            "caches": embedding_cache_stats(),
+        }
+
+    @staticmethod
+    def result_cache_stats() -> Dict[str, Any]:
+        from app.services.result_cache import result_cache_stats
+        settings = get_settings()
+        return {
+            "enabled": bool(settings.ENABLE_SEMANTIC_CACHE and settings.SEMANTIC_CACHE_STORE_RESULTS),
+            "ttl_seconds": settings.SEMANTIC_CACHE_RESULT_TTL_SECONDS,
+            "cache": result_cache_stats(),
+        }
+
+    @staticmethod
+    def coalescing_stats() -> Dict[str, Any]:
+        from app.services.orchestration_service import coalescing_stats
+        return {
+            "enabled": get_settings().ENABLE_REQUEST_COALESCING,
+            **coalescing_stats(),
+        }
+
+    @staticmethod
+    def llm_router_stats() -> Dict[str, Any]:
+        from app.providers.factory import provider_name
+        from app.providers.llm.router_provider import llm_router_stats
+        settings = get_settings()
+        return {
+            "enabled": provider_name(settings.LLM_PROVIDER) == "router",
+            "providers": settings.LLM_ROUTER_PROVIDERS,
+            "hedging": settings.LLM_ROUTER_HEDGE,
+            "backends": llm_router_stats(),
+        }
+
+    @staticmethod
+    def rate_limit_stats() -> Dict[str, Any]:
+        from app.middleware.rate_limit import rate_limit_stats
+        settings = get_settings()
+        return {
+            "enabled": settings.ENABLE_RATE_LIMIT,
+            "backend": settings.RATE_LIMIT_BACKEND,
+            "scope": settings.RATE_LIMIT_SCOPE,
+            "requests_per_minute": settings.RATE_LIMIT_REQUESTS_PER_MINUTE,
+            "local": rate_limit_stats(),
+        }
+
+    @staticmethod
+    def sql_guard_stats() -> Dict[str, Any]:
+        from app.utils.sql_guard import verdict_cache_stats
+        return {"verdict_cache": verdict_cache_stats()}
+
     @staticmethod
     def metrics_json() -> Dict[str, Any]:
         agg = ObservabilityService.aggregates()
@@ -13,7 +13,11 @@ This service is stateless and streaming-safe.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 from datetime import date, datetime
 from decimal import Decimal
 
@@ -25,11 +29,26 @@ from app.services.vanna_service import VannaService
 from app.services.schema_policy_service import SchemaPolicyService
 from app.services.audit_service import AuditService
 from app.services.semantic_cache_service import SemanticCacheService
+from app.services.result_cache import get_result_cache, payload_size, result_cache_key
 from app.services.arabic_query_engine import ArabicQueryEngine
 from app.utils.sql_guard import SQLGuard
+from app.utils.column_types import infer_column_types
+from app.utils.compiled_policy import compile_policy
+from app.utils.single_flight import SingleFlight
+from app.utils.sql_analysis import try_analyse_sql
 from app.core.exceptions import InvalidQueryError
 from app.models.enums.confidence_tier import ConfidenceTier
 
+logger = logging.getLogger(__name__)
+
+# Process-wide: identical concurrent requests may reach different service instances.
+_prepare_flights = SingleFlight()
+_execution_flights = SingleFlight()
+
+
+def coalescing_stats() -> Dict[str, Any]:
+    return {"prepare": _prepare_flights.stats(), "execution": _execution_flights.stats()}
+
 
 class OrchestrationService:
     def __init__(self) -> None:
@@ -51,17 +70,21 @@ class OrchestrationService:
         question: str,
         user_context: UserContext,
         top_k: int = 5,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> Dict[str, Any]:
         """
         Prepare the technical_view payload and validated SQL.
 
+        `on_progress` receives non-authoritative SQL generation progress
+        (see `VannaService.generate_sql`); nothing is reported on a cache hit
+        or when the request joined an identical one already in flight.
+
         MUST NOT raise uncontrolled exceptions during streaming.
         """
 
         _ = top_k  # accepted for contract stability
 
         confidence_tier = ConfidenceTier.TIER_0_FORTRESS
-        assumptions: List[str] = []
 
         # Basic intent screening
         lowered = question.lower()
@@ -73,37 +96,184 @@ class OrchestrationService:
             return self._blocked("unsupported_confidence_tier", confidence_tier)
 
         original_question = question
+        timings: Dict[str, float] = {}
+
+        # Stage graph: policy || (arabic -> [embed -> rag] (speculative) || exact cache)
+        # -> semantic cache -> generate.  The policy fetch does not depend on
+        # the question; embedding and RAG retrieval run while the cache is
+        # consulted, and both are cancelled on a hit.  An exact-tier hit
+        # never waits for the embedding.
+        policy_task = asyncio.create_task(
+            self._stage("policy", timings, asyncio.to_thread(self.policy_service.get_active))
+        )
+        embed_task = None
+        rag_task = None
+        try:
+            # Arabic preprocessing (mandatory)
+            if self.arabic_engine._is_arabic(question):
+                started = time.perf_counter()
+                processed = self.arabic_engine.process(question)
+                question = processed["final_query"]
+                timings["arabic"] = round((time.perf_counter() - started) * 1000, 3)
+
+            # Embed the question once; the semantic cache lookup, RAG
+            # retrieval and cache store all reuse this vector.
+            embed_task = asyncio.create_task(
+                self._stage("embed", timings, self._embed_question(question))
+            )
+
+            async def retrieve() -> List[str]:
+                vector = await embed_task
+                return await self._stage(
+                    "rag", timings, self.vanna_service.retrieve_context(question, vector)
+                )
 
-        # Arabic preprocessing (mandatory)
-        if self.arabic_engine._is_arabic(question):
-            processed = self.arabic_engine.process(question)
-            question = processed["final_query"]
+            rag_task = asyncio.create_task(retrieve())
+
+            # Enforce active policy
+            policy = await policy_task
+            if not policy:
+                return self._blocked("no_active_policy", confidence_tier)
+
+            async def resolve() -> Dict[str, Any]:
+                return await self._resolve_sql(
+                    question=question,
+                    policy=policy,
+                    user_context=user_context,
+                    embed_task=embed_task,
+                    rag_task=rag_task,
+                    timings=timings,
+                    on_progress=on_progress,
+                )
 
-        # Enforce active policy
-        policy = self.policy_service.get_active()
-        if not policy:
-            return self._blocked("no_active_policy", confidence_tier)
+            # Concurrent identical requests share one lookup/generation/guard run.
+            flight_key = self._flight_key(question, policy, user_context)
+            coalesced = False
+            if flight_key is None:
+                result = await resolve()
+            else:
+                result, coalesced = await _prepare_flights.do(flight_key, resolve)
+                trace.get_current_span().set_attribute("prepare.coalesced", coalesced)
+        finally:
+            for task in (policy_task, embed_task, rag_task):
+                if task is not None and not task.done():
+                    task.cancel()
+            self._record_timings(timings)
+
+        if result.get("error") in ("table_scope_violation", "column_scope_violation"):
+            self._audit_block(user_context, question, result["error"])
+        if not result.get("is_safe"):
+            return result
+        return {
+            **result,
+            "assumptions": list(result["assumptions"]),
+            "original_question": original_question,
+            "coalesced": coalesced,
+        }
 
+    def _flight_key(
+        self, question: str, policy: Any, user_context: UserContext
+    ) -> Optional[tuple]:
+        """
+        Coalescing key: everything the prepared SQL depends on, i.e. the
+        canonical question, policy, RBAC scope, RLS data scope and model.
+        None when ENABLE_REQUEST_COALESCING is off.
+        """
+        settings = self.vanna_service.settings
+        if not settings.ENABLE_REQUEST_COALESCING:
+            return None
+        data_scope = user_context.get("data_scope", {}) if settings.RLS_ENABLED else {}
+        return (
+            SemanticCacheService._canonical_question(question),
+            policy.schema_name,
+            policy.version,
+            user_context.get("role", "guest"),
+            json.dumps(data_scope or {}, sort_keys=True, default=str),
+            settings.LLM_PROVIDER,
+            getattr(settings, "OPENAI_MODEL", ""),
+        )
+
+    async def _resolve_sql(
+        self,
+        *,
+        question: str,
+        policy: Any,
+        user_context: UserContext,
+        embed_task: "asyncio.Task[Any]",
+        rag_task: "asyncio.Task[List[str]]",
+        timings: Dict[str, float],
+        on_progress: Optional[Callable[[Dict[str, Any]], None]],
+    ) -> Dict[str, Any]:
+        """
+        Cache lookup or generation, RLS, policy checks, SQLGuard and cache
+        store for one (question, policy, scope).  May be shared by several
+        requests (see `_flight_key`), so it does not audit per caller.
+        """
+        confidence_tier = ConfidenceTier.TIER_0_FORTRESS
+        assumptions: List[str] = []
         sql = None
         cache_hit = False
         similarity = 0.0
         governance_status = "miss"
 
+        # Cached SQL carries its generator's RLS predicates: share it only
+        # within the same data scope.
+        data_scope = (
+            user_context.get("data_scope", {}) if self.vanna_service.settings.RLS_ENABLED else {}
+        )
+
+        vector: List[Any] = []
+
+        async def embedding() -> Any:
+            # Awaited lazily: an exact cache hit never needs the vector.
+            if not vector:
+                try:
+                    vector.append(await asyncio.shield(embed_task))
+                except asyncio.CancelledError:
+                    # Started by a request that went away (see rag_task below).
+                    if not embed_task.cancelled():
+                        raise
+                    vector.append(await self._embed_question(question))
+            return vector[0]
+
         if self.vanna_service.settings.ENABLE_SEMANTIC_CACHE:
-            hit, cached_sql, similarity, governance_status = self.cache_service.lookup(
-                question=question,
-                policy=policy,
-                llm_provider=self.vanna_service.settings.LLM_PROVIDER,
-                llm_model=getattr(self.vanna_service.settings, "OPENAI_MODEL", ""),
-                rbac_scope=user_context.get("role", "guest"),
+            hit, cached_sql, similarity, governance_status = await self._stage(
+                "cache",
+                timings,
+                self.cache_service.lookup(
+                    question=question,
+                    policy=policy,
+                    llm_provider=self.vanna_service.settings.LLM_PROVIDER,
+                    llm_model=getattr(self.vanna_service.settings, "OPENAI_MODEL", ""),
+                    rbac_scope=user_context.get("role", "guest"),
+                    embedding=embedding,
+                    data_scope=data_scope,
+                ),
             )
             if hit and cached_sql:
                 sql = cached_sql
                 cache_hit = True
 
         if not sql:
+            try:
+                context = await asyncio.shield(rag_task)
+            except asyncio.CancelledError:
+                # The request that started the retrieval went away while
+                # others still wait on this shared run: retrieve again.
+                if not rag_task.cancelled():
+                    raise
+                context = await self.vanna_service.retrieve_context(question, await embedding())
             with self.tracer.start_as_current_span("sql.generate"):
-                sql = await self.vanna_service.generate_sql(question)
+                sql = await self._stage(
+                    "generate",
+                    timings,
+                    self.vanna_service.generate_sql(
+                        question,
+                        embedding=await embedding(),
+                        context=context,
+                        on_progress=on_progress,
+                    ),
+                )
 
             if self.vanna_service.settings.RLS_ENABLED:
                 sql = self.vanna_service.inject_rls_filters(
@@ -120,11 +290,9 @@ class OrchestrationService:
             )
 
         if tables and not self._tables_in_policy(tables, policy):
-            self._audit_block(user_context, question, "table_scope_violation")
             return self._blocked("table_scope_violation", confidence_tier)
 
         if tables and not self._columns_in_policy(sql, tables, policy):
-            self._audit_block(user_context, question, "column_scope_violation")
             return self._blocked("column_scope_violation", confidence_tier)
 
         is_safe = True
@@ -143,7 +311,7 @@ class OrchestrationService:
             return self._blocked("sql_guard_violation", confidence_tier)
 
         if self.vanna_service.settings.ENABLE_SEMANTIC_CACHE and not cache_hit:
-            self.cache_service.store(
+            await self.cache_service.store(
                 question=question,
                 validated_sql=sql,
                 policy=policy,
@@ -151,6 +319,8 @@ class OrchestrationService:
                 llm_model=getattr(self.vanna_service.settings, "OPENAI_MODEL", ""),
                 rbac_scope=user_context.get("role", "guest"),
                 technical_view={"assumptions": assumptions},
+                embedding=await embedding(),
+                data_scope=data_scope,
             )
 
         return {
@@ -162,37 +332,181 @@ class OrchestrationService:
             "governance_status": governance_status,
             "policy_version": policy.version,
             "schema_version": policy.schema_name,
-            "original_question": original_question,
             "processed_question": question,
             "confidence_tier": confidence_tier.value,
         }
 
+    async def _embed_question(self, question: str) -> Any:
+        """Question vector from the vector store's model, or None to let each store embed."""
+        vector = getattr(self.vanna_service, "vector", None)
+        if vector is None:
+            return None
+        try:
+            vectors = await asyncio.to_thread(vector.embed, [question])
+        except Exception:
+            return None
+        return vectors[0] if vectors else None
+
+    async def _stage(self, name: str, timings: Dict[str, float], awaitable: Awaitable[Any]) -> Any:
+        """Await one prepare() stage inside its own span, recording its wall time."""
+        started = time.perf_counter()
+        with self.tracer.start_as_current_span(f"prepare.{name}"):
+            try:
+                return await awaitable
+            finally:
+                timings[name] = round((time.perf_counter() - started) * 1000, 3)
+
+    def _record_timings(self, timings: Dict[str, float]) -> None:
+        span = trace.get_current_span()
+        for name, elapsed_ms in timings.items():
+            span.set_attribute(f"prepare.{name}_ms", elapsed_ms)
+        if timings:
+            logger.debug("prepare stage timings (ms): %s", timings)
+
     # ------------------------------------------------------------------ #
     # Execution Phase
     # ------------------------------------------------------------------ #
 
-    async def execute_sql(self, sql: str) -> Any:
+    def result_cache_key(
+        self,
+        technical_view: Dict[str, Any],
+        user_context: UserContext,
+        shape: str,
+    ) -> Optional[str]:
+        """
+        Result-cache key for a prepared statement, or None when results
+        must not be cached (cache disabled, statement not validated).
+        """
+        settings = self.vanna_service.settings
+        if not (settings.ENABLE_SEMANTIC_CACHE and settings.SEMANTIC_CACHE_STORE_RESULTS):
+            return None
+        sql = technical_view.get("sql")
+        if not sql or not technical_view.get("is_safe"):
+            return None
+        data_scope = user_context.get("data_scope", {}) if settings.RLS_ENABLED else {}
+        return result_cache_key(
+            sql,
+            schema_version=technical_view.get("schema_version"),
+            policy_version=technical_view.get("policy_version"),
+            data_scope=data_scope,
+            shape=shape,
+        )
+
+    async def execute_sql(self, sql: str, cache_key: Optional[str] = None) -> Any:
         if not sql:
             return {"error": "execution_payload_missing_sql"}
-        return await self.vanna_service.execute(sql)
+        if cache_key is None:
+            return await self.vanna_service.execute(sql)
+
+        cache = get_result_cache()
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return {"rows": cached}
+        if self.vanna_service.settings.ENABLE_REQUEST_COALESCING:
+            # Same key, same rows: concurrent misses share one DB round trip.
+            raw_result, shared = await _execution_flights.do(
+                cache_key, lambda: self.vanna_service.execute(sql)
+            )
+            if shared:
+                return raw_result
+        else:
+            raw_result = await self.vanna_service.execute(sql)
+        if isinstance(raw_result, list) or (
+            isinstance(raw_result, dict) and isinstance(raw_result.get("rows"), list)
+        ):
+            rows = self._raw_rows(raw_result)
+            cache.put(cache_key, rows, rows=len(rows))
+        return raw_result
+
+    async def stream_rows(
+        self,
+        sql: str,
+        result_format: str = "rows",
+        cache_key: Optional[str] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Yield serialised batches of at most STREAM_CHUNK_ROWS rows.
+
+        `result_format="columnar"` yields `{"columns", "types", "data"}`
+        built directly from cursor batches; otherwise a list of row dicts.
+        Each batch is fetched only when the consumer pulls it, which keeps
+        per-request memory bounded by the batch size.
+
+        With a `cache_key`, a cached result is replayed batch by batch; on
+        a miss the batches are kept until the result outgrows the per-entry
+        caps and stored once the stream has been fully consumed.  Row
+        results are cached as one flat list of raw row dicts, the same entry
+        `execute_sql` reads and writes, and serialised on the way out;
+        columnar results as their serialised batches.
+        """
+        if not sql:
+            return
+        batch_size = self.vanna_service.settings.STREAM_CHUNK_ROWS
+        columnar = result_format == "columnar"
+        cache = get_result_cache() if cache_key is not None else None
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                if columnar:
+                    for batch in cached:
+                        yield batch
+                else:
+                    for offset in range(0, len(cached), batch_size):
+                        yield self._serialise_rows(cached[offset:offset + batch_size])
+                return
+
+        kept: Optional[List[Any]] = [] if cache is not None else None
+        kept_rows = 0
+        kept_bytes = 0
+        async for batch in self.vanna_service.stream(sql, batch_size, columnar=columnar):
+            out = self._serialise_columnar(batch) if columnar else self._serialise_rows(batch)
+            if kept is not None:
+                data = out.get("data") if columnar else out
+                kept_rows += (len(data[0]) if data else 0) if columnar else len(data)
+                kept_bytes += payload_size(out)
+                if not cache.admits(kept_rows, kept_bytes):
+                    kept = None
+                elif columnar:
+                    kept.append(out)
+                else:
+                    kept.extend(batch)
+            yield out
+        if kept is not None:
+            cache.put(cache_key, kept, rows=kept_rows, size=kept_bytes)
+
+    def to_columnar(self, raw_result: Any) -> Dict[str, Any]:
+        """
+        Convert an `execute_sql` result into the columnar payload shape.
+
+        Types are taken from the raw values, before dates and decimals are
+        serialised, so they match what the streaming path reports.
+        """
+        rows = self._raw_rows(raw_result)
+        columns = list(rows[0].keys()) if rows else []
+        raw_data = [[row.get(col) for row in rows] for col in columns]
+        data = [[self._serialise_value(v) for v in values] for values in raw_data]
+        return {"columns": columns, "types": infer_column_types(raw_data), "data": data}
 
     def normalise_rows(self, raw_result: Any) -> List[Dict[str, Any]]:
+        return self._serialise_rows(self._raw_rows(raw_result))
+
+    def _raw_rows(self, raw_result: Any) -> List[Dict[str, Any]]:
+        """Row dicts from an `execute_sql` result, values left as the driver returned them."""
         if isinstance(raw_result, dict) and raw_result.get("error"):
             return []
 
         if isinstance(raw_result, dict) and isinstance(raw_result.get("rows"), list):
-            return self._serialise_rows(raw_result["rows"])
-
-        if isinstance(raw_result, list):
-            return self._serialise_rows(raw_result)
-
-        if raw_result is None:
+            rows = raw_result["rows"]
+        elif isinstance(raw_result, list):
+            rows = raw_result
+        elif raw_result is None:
             return []
-
-        if isinstance(raw_result, dict):
+        elif isinstance(raw_result, dict):
             return [raw_result]
+        else:
+            return [{"value": raw_result}]
 
-        return [{"value": raw_result}]
+        return [r if isinstance(r, dict) else {"value": r} for r in rows]
 
     # ------------------------------------------------------------------ #
     # Business View
@@ -211,15 +525,25 @@ class OrchestrationService:
             rows = raw_result
 
         if rows is not None:
-            count = len(rows)
-            if count == 0:
-                return {"text": "No matching data found."}
-            if count == 1:
-                return {"text": "One row was returned."}
-            return {"text": f"{count} rows were returned."}
+            return self.row_count_summary(len(rows))
 
         return {"text": "Query processed successfully."}
 
+    def summary_text(self, raw_result: Any) -> str:
+        return self.business_view_payload(raw_result)["text"]
+
+    def chart_recommendation(self, columns: List[str]) -> Dict[str, Any]:
+        if not columns:
+            return {}
+        return {"type": "table", "columns": columns}
+
+    def row_count_summary(self, count: int) -> Dict[str, Any]:
+        if count == 0:
+            return {"text": "No matching data found."}
+        if count == 1:
+            return {"text": "One row was returned."}
+        return {"text": f"{count} rows were returned."}
+
     # ------------------------------------------------------------------ #
     # Helpers
     # ------------------------------------------------------------------ #
@@ -233,6 +557,14 @@ class OrchestrationService:
                 out.append({"value": self._serialise_value(r)})
         return out
 
+    def _serialise_columnar(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        data = []
+        for values in batch.get("data", []):
+            if any(isinstance(v, (datetime, date, Decimal)) for v in values):
+                values = [self._serialise_value(v) for v in values]
+            data.append(values)
+        return {"columns": batch.get("columns", []), "types": batch.get("types", []), "data": data}
+
     def _serialise_value(self, v: Any) -> Any:
         if isinstance(v, (datetime, date)):
             return v.isoformat()
@@ -265,6 +597,9 @@ class OrchestrationService:
         import re
         if not sql:
             return []
+        statement = try_analyse_sql(sql)
+        if statement is not None:
+            return list(statement.table_refs)
         matches = re.findall(r"(?:FROM|JOIN)\s+([\"A-Za-z0-9_\.]+)", sql, re.I)
         out = []
         for m in matches:
@@ -292,25 +627,18 @@ class OrchestrationService:
         return assumptions
 
     def _tables_in_policy(self, tables: List[tuple], policy) -> bool:
-        for _, tbl in tables:
-            if policy.denied_tables and tbl in policy.denied_tables:
-                return False
-            if policy.excluded_tables and tbl in policy.excluded_tables:
-                return False
-            if policy.allowed_tables and tbl not in policy.allowed_tables:
-                return False
-        return True
+        compiled = compile_policy(policy)
+        return all(compiled.table_allowed(tbl) for _, tbl in tables)
 
     def _columns_in_policy(self, sql: str, tables: List[tuple], policy) -> bool:
-        import re
-        allowed = policy.allowed_columns or {}
-        excluded = policy.excluded_columns or {}
-
-        tokens = re.findall(r"([A-Z0-9_]+)\.([A-Z0-9_]+)", sql.upper())
-        for tbl_owner, col in tokens:
-            tbl = tbl_owner.split(".")[-1]
-            if excluded.get(tbl) and col in [c.upper() for c in excluded[tbl]]:
-                return False
-            if allowed.get(tbl) and col not in [c.upper() for c in allowed[tbl]]:
-                return False
-        return True
+        compiled = compile_policy(policy)
+        if not compiled.allowed_columns and not compiled.excluded_columns:
+            return True
+
+        statement = try_analyse_sql(sql)
+        if statement is None:
+            # Unparseable SQL is rejected by SQLGuard with the same parser.
+            return True
+        return all(
+            compiled.column_allowed(tbl, col) for tbl, col in statement.columns if tbl
+        )
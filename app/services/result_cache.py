@@ -0,0 +1,135 @@
+"""
+Governed query-result cache.
+
+A semantic-cache hit still re-ran the validated SQL against Oracle, so a
+dashboard re-asking the same question paid for the same heavy query on
+every refresh.  `ResultCache` keeps the serialised result next to it:
+
+- the key is the validated-SQL hash, the policy (schema, version), the RLS
+  data scope of the caller and the payload shape, so a policy change or a
+  different tenant never sees another entry;
+- entries expire after SEMANTIC_CACHE_RESULT_TTL_SECONDS;
+- results over SEMANTIC_CACHE_RESULT_MAX_ROWS rows or
+  SEMANTIC_CACHE_RESULT_MAX_ENTRY_BYTES bytes are not cached;
+- the cache as a whole is bounded by SEMANTIC_CACHE_RESULT_MAX_BYTES and
+  evicts least-recently-used entries first.
+
+Results are kept in-process only; they are never written to Redis or the
+vector store.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import get_settings
+from app.utils.memory_cache import MemoryCache
+
+
+def result_cache_key(
+    sql: str,
+    *,
+    schema_version: Any,
+    policy_version: Any,
+    data_scope: Optional[Dict[str, Any]],
+    shape: str,
+) -> str:
+    sql_hash = hashlib.sha256(sql.encode("utf-8")).hexdigest()
+    scope = json.dumps(data_scope or {}, sort_keys=True, default=str)
+    scope_hash = hashlib.sha256(scope.encode("utf-8")).hexdigest()[:16]
+    return f"rcache:{schema_version}:{policy_version}:{scope_hash}:{shape}:{sql_hash}"
+
+
+def payload_size(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+class ResultCache:
+    """Per-entry row/byte admission in front of a byte-bounded `MemoryCache`."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int,
+        max_rows: int,
+        max_entry_bytes: int,
+        max_bytes: int,
+    ) -> None:
+        self.ttl_seconds = max(int(ttl_seconds), 0)
+        self.max_rows = max(int(max_rows), 0)
+        self.max_entry_bytes = max(int(max_entry_bytes), 0)
+        self.max_bytes = max(int(max_bytes), 0)
+        self._store = MemoryCache(max_bytes=self.max_bytes, default_ttl=self.ttl_seconds)
+        self._stores = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def admits(self, rows: int, size: int = 0) -> bool:
+        """True while a result of this many rows/bytes may still be cached."""
+        return rows <= self.max_rows and size <= min(self.max_entry_bytes, self.max_bytes)
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._store.get(key)
+
+    def put(self, key: str, value: Any, *, rows: int, size: Optional[int] = None) -> bool:
+        if self.ttl_seconds <= 0:
+            return False
+        size = payload_size(value) if size is None else size
+        stored = self.admits(rows, size) and self._store.set(key, value, size=size)
+        with self._lock:
+            if stored:
+                self._stores += 1
+            else:
+                self._rejected += 1
+        return stored
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._store.stats()
+        with self._lock:
+            stats.update(stores=self._stores, rejected=self._rejected)
+        return stats
+
+
+_cache: ResultCache | None = None
+_cache_config: Tuple[int, int, int, int] | None = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Return the per-process result cache, rebuilt when its limits change."""
+    global _cache, _cache_config
+    settings = get_settings()
+    config = (
+        settings.SEMANTIC_CACHE_RESULT_TTL_SECONDS,
+        settings.SEMANTIC_CACHE_RESULT_MAX_ROWS,
+        settings.SEMANTIC_CACHE_RESULT_MAX_ENTRY_BYTES,
+        settings.SEMANTIC_CACHE_RESULT_MAX_BYTES,
+    )
+    with _cache_lock:
+        if _cache is None or _cache_config != config:
+            ttl, max_rows, max_entry_bytes, max_bytes = config
+            _cache = ResultCache(
+                ttl_seconds=ttl,
+                max_rows=max_rows,
+                max_entry_bytes=max_entry_bytes,
+                max_bytes=max_bytes,
+            )
+            _cache_config = config
+        return _cache
+
+
+def clear_result_cache() -> None:
+    with _cache_lock:
+        if _cache is not None:
+            _cache.clear()
+
+
+def result_cache_stats() -> Optional[Dict[str, Any]]:
+    cache = _cache
+    return cache.stats() if cache is not None else None
@@ -1,13 +1,78 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
 import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from app.core.config import get_settings
 from app.core.db import session_scope
 from app.models.internal import SchemaAccessPolicy
 from app.services.audit_service import AuditService
+from app.services.result_cache import clear_result_cache
+from app.utils.compiled_policy import CompiledPolicy, compile_policy
+from app.utils.sql_guard import clear_verdict_cache
+
+
+class _ActivePolicyCache:
+    """
+    Process-wide cache of the active policy.
+
+    The hot path (prepare, training, feedback, semantic cache) only needs
+    the active row; loading it per request cost a system-DB round-trip.
+    Activation in this process invalidates immediately; activations in
+    other workers are picked up after POLICY_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._policy: Optional[SchemaAccessPolicy] = None
+        self._loaded_at = 0.0
+
+    def get(self, loader) -> Optional[SchemaAccessPolicy]:
+        ttl = get_settings().POLICY_CACHE_TTL_SECONDS
+        with self._lock:
+            fresh = self._loaded and (ttl <= 0 or time.monotonic() - self._loaded_at < ttl)
+            if fresh:
+                return self._policy
+            policy = loader()
+            self._policy = policy
+            self._loaded = True
+            self._loaded_at = time.monotonic()
+            return policy
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded = False
+            self._policy = None
+
+
+_active_policy_cache = _ActivePolicyCache()
+
+
+def invalidate_active_policy() -> None:
+    """Forget the cached active policy and every verdict/result derived from it."""
+    _active_policy_cache.invalidate()
+    clear_verdict_cache()
+    clear_result_cache()
+
+
+def get_active_policy() -> Optional[SchemaAccessPolicy]:
+    """Cached active policy (module-level entry point for the API layer)."""
+    return _active_policy_cache.get(_load_active_policy)
+
+
+def _load_active_policy() -> Optional[SchemaAccessPolicy]:
+    with session_scope() as session:
+        return (
+            session.query(SchemaAccessPolicy)
+            .filter(SchemaAccessPolicy.status == "active")
+            .order_by(SchemaAccessPolicy.created_at.desc())
+            .first()
+        )
 
 
 class SchemaPolicyService:
@@ -101,6 +166,8 @@ class SchemaPolicyService:
             session.flush()
             session.refresh(policy)
 
+        invalidate_active_policy()
+
         self.audit_service.log(
             user_id=approver or "anonymous",
             role="admin",
@@ -161,10 +228,8 @@ class SchemaPolicyService:
         return committed
 
     def get_active(self) -> Optional[SchemaAccessPolicy]:
-        with session_scope() as session:
-            return (
-                session.query(SchemaAccessPolicy)
-                .filter(SchemaAccessPolicy.status == "active")
-                .order_by(SchemaAccessPolicy.created_at.desc())
-                .first()
-            )
+        return get_active_policy()
+
+    def get_active_compiled(self) -> Optional[CompiledPolicy]:
+        policy = get_active_policy()
+        return compile_policy(policy) if policy is not None else None
@@ -1,37 +1,72 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
+import threading
 import time
-from typing import Any, Dict, Optional, Tuple
-
-try:
-    import redis  # type: ignore
-except Exception:  # pragma: no cover
-    redis = None
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 from opentelemetry import trace
 from opentelemetry.trace import Status, StatusCode
 
 from app.core.config import get_settings
 from app.core.exceptions import InvalidQueryError
+from app.providers.cache.redis_provider import get_redis_cache
 from app.providers.factory import create_vector_provider
+from app.utils.memory_cache import MemoryCache
 from app.utils.sql_guard import SQLGuard
 from app.services.schema_policy_service import SchemaPolicyService
 
 
+_local_cache: MemoryCache | None = None
+_local_cache_lock = threading.Lock()
+
+
+def get_local_cache() -> MemoryCache:
+    """
+    Process-wide in-memory store: the entry store when Redis is not
+    configured, and the near-cache in front of Redis otherwise.
+    """
+    global _local_cache
+    if _local_cache is None:
+        with _local_cache_lock:
+            if _local_cache is None:
+                settings = get_settings()
+                _local_cache = MemoryCache(
+                    max_bytes=settings.SEMANTIC_CACHE_MEMORY_MAX_BYTES,
+                    max_entries=settings.SEMANTIC_CACHE_MEMORY_MAX_ENTRIES,
+                )
+    return _local_cache
+
+
+def clear_local_cache() -> None:
+    if _local_cache is not None:
+        _local_cache.clear()
+
+
+def local_cache_stats() -> Optional[Dict[str, Any]]:
+    cache = _local_cache
+    return cache.stats() if cache is not None else None
+
+
 class SemanticCacheService:
     """
     Governed semantic cache using ChromaDB for similarity search and Redis for authoritative entries.
     Always re-validates cached SQL via SQLGuard against the active policy before reuse.
     """
 
+    _enabled: Optional[bool] = None
+
     def __init__(self, sql_guard: SQLGuard):
         self.settings = get_settings()
-        self.enabled = bool(getattr(self.settings, "ENABLE_SEMANTIC_CACHE", False))
         self.threshold = float(
             getattr(self.settings, "SEMANTIC_CACHE_SIMILARITY_THRESHOLD", 0.85) or 0.85
         )
+        self.max_candidates = max(
+            int(getattr(self.settings, "SEMANTIC_CACHE_MAX_RESULTS", 3) or 3), 1
+        )
         self.sql_guard = sql_guard
         self.policy_service = SchemaPolicyService()
         self.tracer = trace.get_tracer(__name__)
@@ -39,28 +74,44 @@ class SemanticCacheService:
         # Vector store for semantic search
         try:
             self.vector = create_vector_provider(self.settings)
-            self.collection = self.vector.client.get_or_create_collection("semantic_cache_questions")
+            get_collection = getattr(self.vector, "get_collection", None) or self.vector.client.get_or_create_collection
+            self.collection = get_collection("semantic_cache_questions")
         except Exception:
             self.vector = None
             self.collection = None
 
-        # Redis for authoritative cache
-        self.redis_client = None
-        if redis and self.settings.REDIS_URL:
-            try:
-                self.redis_client = redis.Redis.from_url(self.settings.REDIS_URL, decode_responses=True)
-            except Exception:
-                self.redis_client = None
+        # Redis for authoritative entries (shared asyncio pool, circuit breaker)
+        self.redis = get_redis_cache(self.settings)
+
+        # Bounded in-process store: fallback when Redis is unavailable and
+        # near-cache (SEMANTIC_CACHE_NEAR_CACHE_TTL_SECONDS, 0 = off) in front of it.
+        self._local = get_local_cache()
+        self.near_ttl = int(getattr(self.settings, "SEMANTIC_CACHE_NEAR_CACHE_TTL_SECONDS", 0) or 0)
 
-        # Fallback in-memory store if Redis unavailable (best-effort, non-persistent)
-        self._memory_store: Dict[str, str] = {}
+    @property
+    def enabled(self) -> bool:
+        """ENABLE_SEMANTIC_CACHE from the current snapshot, unless pinned by assignment."""
+        if self._enabled is not None:
+            return self._enabled
+        return bool(getattr(get_settings(), "ENABLE_SEMANTIC_CACHE", False))
 
-    def _redis_get(self, key: str) -> Optional[Dict[str, Any]]:
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        self._enabled = bool(value)
+
+    async def _redis_get(self, key: str) -> Optional[Dict[str, Any]]:
         raw = None
-        if self.redis_client:
-            raw = self.redis_client.get(key)
-        else:
-            raw = self._memory_store.get(key)
+        if self.redis is None or self.near_ttl:
+            raw = self._local.get(key)
+        if raw is None and self.redis is not None:
+            try:
+                raw = await self.redis.get(key)
+            except Exception:
+                # Degraded: entries written while Redis was down live locally.
+                raw = None if self.near_ttl else self._local.get(key)
+            else:
+                if raw and self.near_ttl:
+                    self._local.set(key, raw, ttl=self.near_ttl)
         if not raw:
             return None
         try:
@@ -68,28 +119,72 @@ class SemanticCacheService:
         except Exception:
             return None
 
-    def _redis_set(self, key: str, value: Dict[str, Any], ttl_seconds: int = 86400) -> None:
-        data = json.dumps(value, ensure_ascii=False)
-        if self.redis_client:
+    async def _redis_set(self, key: str, value: Dict[str, Any], ttl_seconds: int = 86400) -> None:
+        await self._redis_set_many([(key, value, ttl_seconds)])
+
+    async def _redis_set_many(self, entries: List[Tuple[str, Dict[str, Any], int]]) -> None:
+        items = [(key, json.dumps(value, ensure_ascii=False), ttl) for key, value, ttl in entries]
+        if self.redis is not None:
             try:
-                self.redis_client.set(key, data, ex=ttl_seconds)
-                return
+                await self.redis.set_many(items)
             except Exception:
                 pass
-        self._memory_store[key] = data
+            else:
+                if self.near_ttl:
+                    for key, data, ttl in items:
+                        self._local.set(key, data, ttl=min(self.near_ttl, ttl))
+                return
+        for key, data, ttl in items:
+            self._local.set(key, data, ttl=ttl)
 
-    def _redis_delete(self, key: str) -> None:
-        if self.redis_client:
+    async def _redis_delete(self, *keys: str) -> None:
+        for key in keys:
+            self._local.delete(key)
+        if self.redis is not None:
             try:
-                self.redis_client.delete(key)
-                return
+                await self.redis.delete(*keys)
             except Exception:
                 pass
-        self._memory_store.pop(key, None)
 
     def _hash_question(self, question: str) -> str:
         return hashlib.sha256(question.strip().encode("utf-8")).hexdigest()
 
+    @staticmethod
+    def _canonical_question(question: str) -> str:
+        """Case/whitespace/trailing-punctuation insensitive form of a question."""
+        text = unicodedata.normalize("NFKC", question or "").casefold()
+        text = " ".join(text.split())
+        return text.rstrip(" ?.!؟").strip()
+
+    @staticmethod
+    def _canonical_scope(data_scope: Optional[Dict[str, Any]]) -> str:
+        """
+        Stable digest of an RLS data scope.  Cached SQL already carries the
+        RLS predicates of the caller that generated it, so entries are only
+        shared between callers with the same data scope.
+        """
+        canonical = json.dumps(data_scope or {}, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+    def _exact_key(
+        self,
+        *,
+        question: str,
+        schema_version: str,
+        policy_version: int,
+        llm_provider: str,
+        llm_model: str,
+        rbac_scope: str,
+        data_scope: str,
+    ) -> str:
+        question_hash = hashlib.sha256(
+            self._canonical_question(question).encode("utf-8")
+        ).hexdigest()
+        return (
+            f"scache:exact:{schema_version}:{policy_version}:{llm_provider}:"
+            f"{llm_model}:{rbac_scope}:{data_scope}:{question_hash}"
+        )
+
     def _cache_key(
         self,
         *,
@@ -98,25 +193,46 @@ class SemanticCacheService:
         llm_provider: str,
         llm_model: str,
         rbac_scope: str,
+        data_scope: str,
         sql_hash: str,
     ) -> str:
-        return f"scache:{schema_version}:{policy_version}:{llm_provider}:{llm_model}:{rbac_scope}:{sql_hash}"
+        return (
+            f"scache:{schema_version}:{policy_version}:{llm_provider}:{llm_model}:"
+            f"{rbac_scope}:{data_scope}:{sql_hash}"
+        )
 
-    def lookup(
+    async def lookup(
         self,
         question: str,
         policy,
         llm_provider: str,
         llm_model: str,
         rbac_scope: str,
+        embedding: Union[None, Any, Callable[[], Awaitable[Any]]] = None,
+        data_scope: Optional[Dict[str, Any]] = None,
     ) -> Tuple[bool, Optional[str], float, str]:
         """
         Returns (hit, validated_sql, similarity_score, governance_status)
+        `embedding`, when given, is the precomputed question vector or a
+        zero-argument coroutine function returning it; the latter is only
+        awaited when the exact tier misses.
+        `data_scope` is the caller's RLS scope (see `_canonical_scope`).
         governance_status: "passed" | "failed_revalidation" | "miss"
         """
-        if not self.enabled or not self.collection:
+        if not self.enabled:
             return False, None, 0.0, "miss"
 
+        scope_hash = self._canonical_scope(data_scope)
+        exact_key = self._exact_key(
+            question=question,
+            schema_version=getattr(policy, "schema_name", "") or "unknown",
+            policy_version=getattr(policy, "version", None) or 0,
+            llm_provider=llm_provider,
+            llm_model=llm_model,
+            rbac_scope=rbac_scope or "guest",
+            data_scope=scope_hash,
+        )
+
         with self.tracer.start_as_current_span(
             "semantic_cache.lookup",
             attributes={
@@ -127,53 +243,110 @@ class SemanticCacheService:
                 "vector.store": "chromadb",
                 "cache.similarity.threshold": self.threshold,
             },
-        ):
+        ) as lookup_span:
             try:
-                res = self.collection.query(query_texts=[question], n_results=1)
-                docs = res.get("documents", [[]])[0]
+                # L1: exact canonical-question match, no embedding / ANN search.
+                pointer = await self._redis_get(exact_key)
+                cache_id = (pointer or {}).get("cache_id")
+                if cache_id:
+                    entry = await self._redis_get(cache_id)
+                    if entry:
+                        lookup_span.set_attribute("cache.tier", "exact")
+                        return await self._serve_entry(cache_id, entry, 1.0, policy, exact_key)
+                    await self._redis_delete(exact_key)
+
+                if not self.collection:
+                    return False, None, 0.0, "miss"
+
+                lookup_span.set_attribute("cache.tier", "semantic")
+                if callable(embedding):
+                    embedding = await embedding()
+                query = (
+                    {"query_embeddings": [embedding]}
+                    if embedding is not None
+                    else {"query_texts": [question]}
+                )
+                res = await asyncio.to_thread(
+                    self.collection.query,
+                    **query,
+                    n_results=self.max_candidates,
+                    where=self._scope_filter(
+                        schema_version=getattr(policy, "schema_name", "") or "unknown",
+                        policy_version=getattr(policy, "version", None) or 0,
+                        llm_provider=llm_provider,
+                        llm_model=llm_model,
+                        rbac_scope=rbac_scope or "guest",
+                        data_scope=scope_hash,
+                    ),
+                )
                 metas = res.get("metadatas", [[]])[0]
                 distances = res.get("distances", [[]])[0] if res.get("distances") else []
+                lookup_span.set_attribute("cache.candidates", len(metas))
                 if not metas:
                     self._emit_span(False, 0.0)
                     return False, None, 0.0, "miss"
-                meta = metas[0] or {}
-                similarity = 1 - distances[0] if distances else 0.0
-                cache_id = meta.get("cache_id")
-                if similarity < self.threshold or not cache_id:
-                    self._emit_span(False, similarity, status="miss")
-                    return False, None, similarity, "miss"
-
-                entry = self._redis_get(cache_id)
-                if not entry:
-                    self._emit_span(False, similarity, status="miss")
-                    return False, None, similarity, "miss"
-
-                cached_sql = entry.get("validated_sql") or ""
-                with self.tracer.start_as_current_span(
-                    "semantic_cache.revalidate",
-                    attributes={
-                        "sql.hash": entry.get("sql_hash"),
-                        "schema.version": getattr(policy, "schema_name", None),
-                        "policy.version": getattr(policy, "version", None),
-                        "governance.engine": "SQLGuard",
-                    },
-                ) as gov_span:
-                    try:
-                        self.sql_guard.validate_and_normalise(cached_sql, policy=policy)
-                        gov_span.set_attribute("governance.result", "passed")
-                    except InvalidQueryError:
-                        gov_span.set_attribute("governance.result", "failed")
-                        gov_span.set_status(Status(StatusCode.ERROR, "Policy revalidation failed"))
-                        self._redis_delete(cache_id)
-                        self._emit_span(False, similarity, status="failed_revalidation")
-                        return False, None, similarity, "failed_revalidation"
-
-                self._emit_span(True, similarity, status="hit")
-                return True, cached_sql, similarity, "passed"
+
+                # Candidates arrive nearest first; stop at the first one below threshold.
+                best_similarity = 1 - distances[0] if distances else 0.0
+                status = "miss"
+                for meta, distance in zip(metas, distances):
+                    similarity = 1 - distance
+                    if similarity < self.threshold:
+                        break
+                    cache_id = (meta or {}).get("cache_id")
+                    entry = await self._redis_get(cache_id) if cache_id else None
+                    # Entries written before data scoping carry no scope: never shared.
+                    if not entry or entry.get("governance", {}).get("data_scope") != scope_hash:
+                        continue
+                    served = await self._serve_entry(cache_id, entry, similarity, policy)
+                    if served[0]:
+                        return served
+                    status = served[3]
+
+                if status == "miss":
+                    self._emit_span(False, best_similarity, status="miss")
+                return False, None, best_similarity, status
             except Exception:
                 return False, None, 0.0, "miss"
 
-    def store(
+    @staticmethod
+    def _scope_filter(**scope: Any) -> Dict[str, Any]:
+        """Chroma `where` clause restricting candidates to the caller's scope."""
+        return {"$and": [{name: {"$eq": value}} for name, value in scope.items()]}
+
+    async def _serve_entry(
+        self,
+        cache_id: str,
+        entry: Dict[str, Any],
+        similarity: float,
+        policy,
+        exact_key: Optional[str] = None,
+    ) -> Tuple[bool, Optional[str], float, str]:
+        """Revalidate a cached entry against the active policy before reuse."""
+        cached_sql = entry.get("validated_sql") or ""
+        with self.tracer.start_as_current_span(
+            "semantic_cache.revalidate",
+            attributes={
+                "sql.hash": entry.get("sql_hash"),
+                "schema.version": getattr(policy, "schema_name", None),
+                "policy.version": getattr(policy, "version", None),
+                "governance.engine": "SQLGuard",
+            },
+        ) as gov_span:
+            try:
+                self.sql_guard.validate_and_normalise(cached_sql, policy=policy)
+                gov_span.set_attribute("governance.result", "passed")
+            except InvalidQueryError:
+                gov_span.set_attribute("governance.result", "failed")
+                gov_span.set_status(Status(StatusCode.ERROR, "Policy revalidation failed"))
+                await self._redis_delete(cache_id, *([exact_key] if exact_key else []))
+                self._emit_span(False, similarity, status="failed_revalidation")
+                return False, None, similarity, "failed_revalidation"
+
+        self._emit_span(True, similarity, status="hit")
+        return True, cached_sql, similarity, "passed"
+
+    async def store(
         self,
         question: str,
         validated_sql: str,
@@ -182,10 +355,14 @@ class SemanticCacheService:
         llm_model: str,
         rbac_scope: str,
         technical_view: Optional[Dict[str, Any]] = None,
+        embedding: Optional[Any] = None,
+        data_scope: Optional[Dict[str, Any]] = None,
     ) -> None:
-        if not self.enabled or not self.collection:
+        if not self.enabled:
             return
 
+        scope_hash = self._canonical_scope(data_scope)
+
         policy_version = getattr(policy, "version", None) or 0
         schema_version = getattr(policy, "schema_name", "") or "unknown"
         sql_hash = hashlib.sha256(validated_sql.encode("utf-8")).hexdigest()
@@ -195,6 +372,7 @@ class SemanticCacheService:
             llm_provider=llm_provider,
             llm_model=llm_model,
             rbac_scope=rbac_scope or "guest",
+            data_scope=scope_hash,
             sql_hash=sql_hash,
         )
 
@@ -208,18 +386,34 @@ class SemanticCacheService:
             "governance": {
                 "schema_version": schema_version,
                 "policy_version": policy_version,
+                "data_scope": scope_hash,
                 "validated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
             },
             "telemetry": {
                 "source": "cache",
             },
         }
-        self._redis_set(cache_key, entry, ttl_seconds=ttl)
+        exact_key = self._exact_key(
+            question=question,
+            schema_version=schema_version,
+            policy_version=policy_version,
+            llm_provider=llm_provider,
+            llm_model=llm_model,
+            rbac_scope=rbac_scope or "guest",
+            data_scope=scope_hash,
+        )
+        await self._redis_set_many(
+            [(cache_key, entry, ttl), (exact_key, {"cache_id": cache_key}, ttl)]
+        )
 
+        if not self.collection:
+            return
         try:
-            self.collection.add(
+            await asyncio.to_thread(
+                self.collection.add,
                 ids=[cache_key],
                 documents=[question],
+                **({"embeddings": [embedding]} if embedding is not None else {}),
                 metadatas=[
                     {
                         "cache_id": cache_key,
@@ -227,7 +421,8 @@ class SemanticCacheService:
                         "policy_version": policy_version,
                         "llm_provider": llm_provider,
                         "llm_model": llm_model,
-                        "rbac_scope": rbac_scope,
+                        "rbac_scope": rbac_scope or "guest",
+                        "data_scope": scope_hash,
                         "created_at": entry["governance"]["validated_at"],
                     }
                 ],
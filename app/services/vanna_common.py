@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import re
 from typing import Any, Dict, Optional
 
@@ -148,7 +147,7 @@ class GuardedSqlRunner(SqlRunner):
             default_limit=self.default_limit,
         )
 
-        rows = await asyncio.to_thread(self.db.execute, sanitized)
+        rows = await self.db.execute_async(sanitized)
         df = pd.DataFrame(rows)
 
         snapshot = {
@@ -189,7 +188,7 @@ class NativeSqlRunner(SqlRunner):
 
     async def run_sql(self, args: RunSqlToolArgs, context) -> pd.DataFrame:
         # Direct execution without format_sql/sanitization
-        rows = await asyncio.to_thread(self.db.execute, args.sql)
+        rows = await self.db.execute_async(args.sql)
         df = pd.DataFrame(rows)
 
         self._snapshots[context.request_id] = {
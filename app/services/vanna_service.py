@@ -1,11 +1,16 @@
-from typing import Any, List, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 import logging
 import re
 import asyncio
 
 import sqlparse
+from opentelemetry import trace
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.core.exceptions import AppException
+from app.utils.context_packer import ContextDocument, pack_context
+from app.utils.sql_analysis import try_analyse_sql, with_rls
+from app.utils.token_counter import get_token_counter
 from app.api.dependencies import UserContext
 from app.providers.factory import (
     create_llm_provider,
@@ -15,19 +20,74 @@ from app.providers.factory import (
 
 logger = logging.getLogger(__name__)
 
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+def complete_statement(text: str) -> Optional[str]:
+    """
+    Return the first complete statement in a partial completion, or None.
+
+    A statement is complete at a `;` outside string literals, quoted
+    identifiers and comments or, when the completion opened a markdown
+    fence, at the closing fence.  Everything after that point is never
+    needed.
+    """
+    fence = text.find("```")
+    start = fence + 3 if fence >= 0 else 0
+    quote = None
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if quote == "--":
+            if ch == "\n":
+                quote = None
+        elif quote == "/*":
+            if text.startswith("*/", i):
+                quote = None
+                i += 1
+        elif quote:
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+        elif text.startswith("--", i) or text.startswith("/*", i):
+            quote = text[i:i + 2]
+            i += 1
+        elif fence >= 0:
+            if text.startswith("```", i):
+                return text[:i + 3]
+        elif ch == ";":
+            return text[:i + 1]
+        i += 1
+    return None
+
 
 class VannaService:
+    _settings: Optional[Settings] = None
+
     def __init__(self):
-        self.settings = get_settings()
+        settings = get_settings()
         # Instantiate providers as per Governance Phase 4
-        self.llm = create_llm_provider(self.settings)
-        self.db = create_db_provider(self.settings)
+        self.llm = create_llm_provider(settings)
+        self.db = create_db_provider(settings)
 
         try:
-            self.vector = create_vector_provider(self.settings)
+            self.vector = create_vector_provider(settings)
         except Exception:
             self.vector = None
 
+    @property
+    def settings(self) -> Settings:
+        """
+        The current settings snapshot, so runtime toggles reach services
+        that live for the whole process.  Assigning pins a fixed snapshot.
+        """
+        return self._settings if self._settings is not None else get_settings()
+
+    @settings.setter
+    def settings(self, value: Settings) -> None:
+        self._settings = value
+
     async def ask(
         self,
         question: str,
@@ -51,57 +111,100 @@ class VannaService:
         # Execute validated SQL
         return await self.execute(sql)
 
-    async def generate_sql(self, question: str) -> str:
+    async def retrieve_context(self, question: str, embedding: Any = None) -> List[str]:
+        """
+        RAG retrieval for `question`: "<owner>.<name>: <document>" entries
+        packed into RAG_CONTEXT_TOKEN_BUDGET tokens (see
+        app.utils.context_packer).  The vector query runs off the event
+        loop; failures yield no context.
+        """
+        if self.vector is None:
+            return []
+
+        extra = {"query_embedding": embedding} if embedding is not None else {}
+        try:
+            results = await asyncio.to_thread(
+                self.vector.query_scored,
+                question,
+                n_results=self.settings.RAG_TOP_K,
+                **extra,
+            )
+        except Exception as exc:
+            logger.warning("Vector context retrieval failed: %s", exc)
+            return []
+
+        packed = pack_context(
+            question,
+            [ContextDocument(doc or "", meta or {}, distance) for doc, meta, distance in results or []],
+            budget_tokens=self.settings.RAG_CONTEXT_TOKEN_BUDGET,
+            count_tokens=self._count_tokens,
+            prune_min_columns=self.settings.RAG_PRUNE_MIN_COLUMNS,
+        )
+        span = trace.get_current_span()
+        span.set_attribute("rag.context_tokens", packed.tokens)
+        span.set_attribute("rag.context_documents", packed.documents)
+        span.set_attribute("rag.dropped_documents", packed.dropped)
+        span.set_attribute("rag.pruned_columns", packed.pruned_columns)
+        return packed.parts
+
+    def _count_tokens(self, text: str) -> int:
+        """Token count of `text` for the active model."""
+        return get_token_counter(getattr(self.llm, "model", None))(text)
+
+    async def generate_sql(
+        self,
+        question: str,
+        embedding: Any = None,
+        context: List[str] | None = None,
+        on_progress: ProgressCallback | None = None,
+    ) -> str:
         """
         Generate Oracle-compatible SQL using the LLM provider.
         Optimized for NDJSON streaming and high-security environments.
+
+        `embedding` is the question vector when the caller has already
+        computed it; `context` is RAG context the caller has already
+        retrieved (see `retrieve_context`).  With `on_progress` (and
+        LLM_STREAM_SQL on) the completion is streamed: see
+        `_stream_completion`.
         """
+        if context is None:
+            context = await self.retrieve_context(question, embedding)
+
         prompt = question
-        ctx_parts = []
-
-        if self.vector is not None:
-            try:
-                # Retrieve RAG context from the vector store
-                try:
-                    results = self.vector.query(
-                        question,
-                        n_results=self.settings.RAG_TOP_K,
-                    )
-                except Exception:
-                    results = []
-
-                for doc, meta in results or []:
-                    owner = (meta or {}).get("owner") or (meta or {}).get("OWNER") or ""
-                    name = (meta or {}).get("name") or (meta or {}).get("NAME") or ""
-                    excerpt = (doc or "")[:600]
-                    ident = f"{owner}.{name}" if owner or name else "training_doc"
-                    ctx_parts.append(f"{ident}: {excerpt}")
-
-                if ctx_parts:
-                    prompt = (
-                        "\n\n-- SCHEMA CONTEXT (Governance Enforced):\n"
-                        + "\n\n".join(ctx_parts)
-                        + f"\n\nQuestion: {question}\n\n"
-                        "Respond with a single Oracle-compatible SELECT statement only. "
-                        "Do not include semicolons, markdown fences, DESCRIBE/SHOW, or any DML/DDL."
-                    )
-            except Exception as exc:
-                logger.warning("Vector context retrieval failed: %s", exc)
+        if context:
+            prompt = (
+                "\n\n-- SCHEMA CONTEXT (Governance Enforced):\n"
+                + "\n\n".join(context)
+                + f"\n\nQuestion: {question}\n\n"
+                "Respond with a single Oracle-compatible SELECT statement only. "
+                "Do not include semicolons, markdown fences, DESCRIBE/SHOW, or any DML/DDL."
+            )
+
+        prompt_tokens = self._count_tokens(prompt)
+        trace.get_current_span().set_attribute("llm.prompt_tokens", prompt_tokens)
+        logger.debug("SQL prompt: %d tokens, %d context documents", prompt_tokens, len(context or []))
 
         try:
-            # ✅ CORRECTED CALL: Matches inspected signature (prompt, temperature, max_tokens)
-            sql = await asyncio.wait_for(
-                self.llm.generate_sql(
+            if on_progress is not None and self.settings.LLM_STREAM_SQL:
+                completion = self._stream_completion(prompt, on_progress)
+            else:
+                # ✅ CORRECTED CALL: Matches inspected signature (prompt, temperature, max_tokens)
+                completion = self.llm.generate_sql(
                     prompt=prompt,
-                    temperature=self.settings.LLM_TEMPERATURE, 
+                    temperature=self.settings.LLM_TEMPERATURE,
                     max_tokens=self.settings.LLM_MAX_TOKENS,
-                ),
-                timeout=self.settings.LLM_REQUEST_TIMEOUT,
-            )
+                )
+            sql = await asyncio.wait_for(completion, timeout=self.settings.LLM_REQUEST_TIMEOUT)
 
-            # Sanitize and Post-process
+            # Sanitize, then parse once; the analysed statement is memoised
+            # for RLS, policy checks and SQLGuard further down the pipeline.
             sql_clean = self._sanitize_sql(sql)
-            sql_clean = self._oracle_postprocess(sql_clean)
+            statement = try_analyse_sql(sql_clean)
+            if statement is not None:
+                sql_clean = statement.sql
+            else:
+                sql_clean = self._oracle_postprocess(self._format_unparsed(sql_clean))
 
             if not sql_clean:
                 return ""
@@ -115,10 +218,66 @@ class VannaService:
             logger.warning("LLM SQL generation failed: %s", exc)
             return ""
 
+    async def _stream_completion(self, prompt: str, on_progress: ProgressCallback) -> str:
+        """
+        Consume a streamed completion, reporting progress to `on_progress`.
+
+        Every LLM_STREAM_PROGRESS_EVERY_TOKENS tokens a non-authoritative
+        progress event (token count, plus the raw draft when
+        LLM_STREAM_SQL_DRAFTS is on) is reported.  The stream is closed as
+        soon as the first statement is complete, and aborted with an
+        error once it exceeds MAX_SQL_TOKENS tokens.
+
+        Tokens are counted per delta with the model's counter.  Splitting
+        text at delta boundaries can only add tokens, so the running total
+        is checked against the whole completion before aborting.
+        """
+        settings = self.settings
+        count = self._count_tokens
+        parts: List[str] = []
+        tokens = reported = 0
+
+        def report(status: str, draft: str) -> None:
+            event: Dict[str, Any] = {"status": status, "tokens": tokens, "authoritative": False}
+            if settings.LLM_STREAM_SQL_DRAFTS:
+                event["sql_draft"] = draft
+            on_progress(event)
+
+        stream = self.llm.stream_sql(
+            prompt=prompt,
+            temperature=settings.LLM_TEMPERATURE,
+            max_tokens=settings.LLM_MAX_TOKENS,
+        )
+        try:
+            async for delta in stream:
+                parts.append(delta)
+                tokens += count(delta)
+                if tokens > settings.MAX_SQL_TOKENS:
+                    tokens = count("".join(parts))
+                    if tokens > settings.MAX_SQL_TOKENS:
+                        raise AppException(
+                            f"SQL generation aborted after {settings.MAX_SQL_TOKENS} tokens"
+                        )
+                if ";" in delta or "`" in delta:
+                    statement = complete_statement("".join(parts))
+                    if statement is not None:
+                        report("generated", statement)
+                        return statement
+                if tokens - reported >= settings.LLM_STREAM_PROGRESS_EVERY_TOKENS:
+                    reported = tokens
+                    report("generating", "".join(parts))
+        finally:
+            await stream.aclose()
+
+        completion = "".join(parts)
+        report("generated", completion)
+        return completion
+
     def _sanitize_sql(self, sql: Any) -> str:
         """
-        Sanitize SQL using sqlparse==0.5.3.
-        Removes markdown, comments, and normalizes formatting.
+        Strip LLM wrapping (markdown fences, "SQL:" prefixes, trailing
+        semicolons).  Comments and keyword casing are normalised when the
+        statement is rendered from its AST (see app.utils.sql_analysis).
         """
         if not isinstance(sql, str):
             return ""
@@ -135,18 +294,24 @@ class VannaService:
         if sql_clean.lower().startswith("sql:"):
             sql_clean = sql_clean.split(":", 1)[1].strip()
 
+        return sql_clean.strip().rstrip(";")
+
+    def _format_unparsed(self, sql: str) -> str:
+        """
+        Fallback for statements sqlglot cannot parse: sqlparse formatting
+        only, so the text reaching SQLGuard (which will reject it) matches
+        what the model produced.
+        """
         try:
-            # Official sanitization using sqlparse
-            sql_clean = sqlparse.format(
-                sql_clean,
+            sql = sqlparse.format(
+                sql,
                 strip_comments=True,
                 reindent=True,
                 keyword_case="upper",
             )
         except Exception as exc:
             logger.warning("sqlparse formatting failed: %s", exc)
-
-        return sql_clean.strip().rstrip(";")
+        return sql.strip().rstrip(";")
 
     def _oracle_postprocess(self, sql: str) -> str:
         """
@@ -171,8 +336,11 @@ class VannaService:
 
     def inject_rls_filters(self, sql: str, data_scope: dict) -> str:
         """
-        Safely injects Row-Level Security filters.
-        Ensures the WHERE clause is placed correctly before structural SQL keywords.
+        Inject Row-Level Security filters into the statement's AST.
+
+        The tenant predicate is ANDed into every top-level SELECT (existing
+        conditions keep their precedence).  Unparseable SQL is returned
+        unchanged: SQLGuard rejects it with the same parser.
         """
         if not sql or not data_scope:
             return sql
@@ -181,81 +349,54 @@ class VannaService:
         if not tenant_id:
             return sql
 
-        condition = f"tenant_id = '{tenant_id}'"
-        upper_sql = sql.upper()
-
-        if " WHERE " in upper_sql:
-            return re.sub(
-                r"(\sWHERE\s)",
-                rf"\1{condition} AND ",
-                sql,
-                count=1,
-                flags=re.I,
-            )
-
-        # Inject WHERE before specific structural keywords
-        split_keywords = [" GROUP BY ", " ORDER BY ", " FETCH FIRST ", " LIMIT "]
-        split_index = len(sql)
-
-        for kw in split_keywords:
-            idx = upper_sql.find(kw)
-            if idx != -1 and idx < split_index:
-                split_index = idx
-
-        return sql[:split_index] + f" WHERE {condition} " + sql[split_index:]
+        statement = try_analyse_sql(sql)
+        if statement is None:
+            return sql
+        return with_rls(statement, tenant_id).sql
 
     async def execute(self, sql: str) -> Any:
         """
         Executes the final SQL through the database provider.
+
+        The blocking driver call runs on the bounded DB executor so the
+        event loop keeps serving concurrent streams.
         """
         try:
-            return self.db.execute(sql)
+            return await self.db.execute_async(sql)
         except Exception as exc:
             logger.exception("Database execution failed")
             return {"error": str(exc)}
 
+    async def stream(
+        self, sql: str, batch_size: int, columnar: bool = False
+    ) -> AsyncIterator[Any]:
+        """
+        Stream the final SQL result in row batches (fetchmany-backed).
+
+        Unlike `execute`, failures are logged and re-raised: once batches
+        have been emitted the caller must terminate the stream itself.
+        """
+        try:
+            async for batch in self.db.stream_async(
+                sql, batch_size=batch_size, columnar=columnar
+            ):
+                yield batch
+        except Exception:
+            logger.exception("Database streaming failed")
+            raise
+
     def referenced_tables(self, sql: str) -> List[Tuple[str, str]]:
         """
-        Extract referenced tables using sqlparse with a robust regex fallback.
+        Extract referenced tables from the analysed statement, with a
+        regex fallback for SQL that does not parse.
         """
         if not sql:
             return []
 
-        try:
-            parsed = sqlparse.parse(sql)[0]
-            tables = []
-
-            from sqlparse.sql import IdentifierList, Identifier
-            from sqlparse.tokens import Keyword
-
-            def extract(token):
-                if isinstance(token, IdentifierList):
-                    for ident in token.get_identifiers():
-                        extract(ident)
-                elif isinstance(token, Identifier):
-                    name = token.get_real_name()
-                    parent = token.get_parent_name()
-                    if name:
-                        tables.append((str(parent or "").upper(), str(name).upper()))
-
-            in_from = False
-            for tok in parsed.tokens:
-                if tok.ttype is Keyword and tok.value.upper() in ("FROM", "JOIN"):
-                    in_from = True
-                elif tok.ttype is Keyword and tok.value.upper() in (
-                    "WHERE",
-                    "GROUP BY",
-                    "ORDER BY",
-                    "HAVING",
-                ):
-                    in_from = False
-                elif in_from:
-                    extract(tok)
-
-            return list(set(tables))
-
-        except Exception:
-            return self._regex_referenced_tables(sql)
+        statement = try_analyse_sql(sql)
+        if statement is not None:
+            return list(statement.table_refs)
+        return self._regex_referenced_tables(sql)
 
     def _regex_referenced_tables(self, sql: str) -> List[Tuple[str, str]]:
         matches = re.findall(r"(?:FROM|JOIN)\s+([\"A-Za-z0-9_\.]+)", sql, re.I)
@@ -0,0 +1,82 @@
+"""
+Column type names for columnar data_chunk payloads.
+
+Every path that builds a columnar payload (Oracle cursor batches, the
+default provider transpose and the non-streaming `to_columnar`) reports
+types from one vocabulary, so a client sees the same type for the same
+column however the result reached it:
+
+    number, string, boolean, datetime, binary, json, unknown
+
+`unknown` covers columns whose type cannot be determined, including
+columns that hold only nulls.  Keep this list in sync with
+`ColumnType` in sdk/types.ts.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, List, Sequence
+
+COLUMN_TYPES = ("number", "string", "boolean", "datetime", "binary", "json", "unknown")
+
+# oracledb DbType names (without the DB_TYPE_ prefix).
+_DB_TYPES = {
+    "NUMBER": "number",
+    "BINARY_INTEGER": "number",
+    "BINARY_FLOAT": "number",
+    "BINARY_DOUBLE": "number",
+    "VARCHAR": "string",
+    "NVARCHAR": "string",
+    "CHAR": "string",
+    "NCHAR": "string",
+    "LONG": "string",
+    "LONG_NVARCHAR": "string",
+    "CLOB": "string",
+    "NCLOB": "string",
+    "ROWID": "string",
+    "UROWID": "string",
+    "BOOLEAN": "boolean",
+    "DATE": "datetime",
+    "TIMESTAMP": "datetime",
+    "TIMESTAMP_TZ": "datetime",
+    "TIMESTAMP_LTZ": "datetime",
+    "RAW": "binary",
+    "LONG_RAW": "binary",
+    "BLOB": "binary",
+    "JSON": "json",
+}
+
+
+def db_column_type(type_code: Any) -> str:
+    """Map a DB-API cursor type code (e.g. oracledb.DB_TYPE_NUMBER) to a column type."""
+    name = getattr(type_code, "name", None) or str(type_code or "")
+    return _DB_TYPES.get(name.upper().replace("DB_TYPE_", ""), "unknown")
+
+
+def value_column_type(value: Any) -> str:
+    """Map a raw (unserialised) Python value to a column type."""
+    if value is None:
+        return "unknown"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float, Decimal)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, date):
+        return "datetime"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "binary"
+    if isinstance(value, (dict, list)):
+        return "json"
+    return "unknown"
+
+
+def infer_column_types(data: Sequence[Sequence[Any]]) -> List[str]:
+    """Column types from column arrays, using each column's first non-null value."""
+    return [
+        next((value_column_type(v) for v in values if v is not None), "unknown")
+        for values in data
+    ]
@@ -0,0 +1,123 @@
+"""
+Compiled SchemaAccessPolicy for hot-path membership checks.
+
+A SchemaAccessPolicy row stores its scope as JSON lists/dicts with
+whatever casing the author used.  Checking a statement against it used to
+rebuild upper-cased sets on every call.  `compile_policy` does that work
+once per (policy id, version) and returns an immutable view with
+frozensets, so table/column checks are O(1).
+
+Activated policies never change in place (a new activation produces a new
+version), so the (id, version) key is safe to cache on.  Drafts are
+compiled on every call because `update_draft` mutates them.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, FrozenSet, Iterable, Mapping, Optional, Tuple
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+def _upper_set(values: Optional[Iterable[str]]) -> FrozenSet[str]:
+    return frozenset(str(v).upper() for v in (values or []) if v)
+
+
+def _upper_map(values: Optional[Mapping[str, Iterable[str]]]) -> Mapping[str, FrozenSet[str]]:
+    return MappingProxyType(
+        {str(k).upper(): _upper_set(v) for k, v in (values or {}).items()}
+    )
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    policy_id: Optional[str]
+    version: Optional[int]
+    status: Optional[str]
+    schema_name: str
+    allowed_tables: FrozenSet[str]
+    denied_tables: FrozenSet[str]
+    allowed_columns: Mapping[str, FrozenSet[str]]
+    excluded_columns: Mapping[str, FrozenSet[str]]
+
+    def table_allowed(self, table: str) -> bool:
+        tbl = table.upper()
+        if tbl in self.denied_tables:
+            return False
+        if self.allowed_tables and tbl not in self.allowed_tables:
+            return False
+        return True
+
+    def column_allowed(self, table: str, column: str) -> bool:
+        tbl, col = table.upper(), column.upper()
+        if col in self.excluded_columns.get(tbl, _EMPTY):
+            return False
+        allowed = self.allowed_columns.get(tbl)
+        if allowed and col not in allowed:
+            return False
+        return True
+
+
+_MAX_COMPILED = 16
+_compiled: "OrderedDict[Tuple[str, int], CompiledPolicy]" = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def _compile(policy: Any) -> CompiledPolicy:
+    return CompiledPolicy(
+        policy_id=getattr(policy, "id", None),
+        version=getattr(policy, "version", None),
+        status=getattr(policy, "status", None),
+        schema_name=(getattr(policy, "schema_name", None) or "").upper(),
+        allowed_tables=_upper_set(getattr(policy, "allowed_tables", None)),
+        denied_tables=_upper_set(getattr(policy, "denied_tables", None))
+        | _upper_set(getattr(policy, "excluded_tables", None)),
+        allowed_columns=_upper_map(getattr(policy, "allowed_columns", None)),
+        excluded_columns=_upper_map(getattr(policy, "excluded_columns", None)),
+    )
+
+
+def policy_cache_key(policy: Any) -> Optional[Tuple[str, int]]:
+    """(id, version) for policies whose scope can no longer change, else None."""
+    if isinstance(policy, CompiledPolicy):
+        policy_id, version, status = policy.policy_id, policy.version, policy.status
+    else:
+        policy_id = getattr(policy, "id", None)
+        version = getattr(policy, "version", None)
+        status = getattr(policy, "status", None)
+    if policy_id is None or version is None or status != "active":
+        return None
+    return (policy_id, version)
+
+
+def compile_policy(policy: Any) -> CompiledPolicy:
+    """Return the compiled form of `policy`, reusing it for active versions."""
+    if isinstance(policy, CompiledPolicy):
+        return policy
+
+    key = policy_cache_key(policy)
+    if key is None:
+        return _compile(policy)
+
+    with _compiled_lock:
+        hit = _compiled.get(key)
+        if hit is not None:
+            _compiled.move_to_end(key)
+            return hit
+
+    compiled = _compile(policy)
+    with _compiled_lock:
+        _compiled[key] = compiled
+        while len(_compiled) > _MAX_COMPILED:
+            _compiled.popitem(last=False)
+    return compiled
+
+
+def clear_compiled_policies() -> None:
+    with _compiled_lock:
+        _compiled.clear()
+
@@ -0,0 +1,247 @@
+"""
+Token-budgeted packing of RAG documents into the SQL prompt.
+
+The prompt used to concatenate RAG_TOP_K documents cut to 600 characters
+each.  Big tables lost most of their columns mid-definition, small ones
+padded the prompt with storage clauses, and the same table retrieved twice
+was sent twice.  `pack_context` instead:
+
+- orders documents by vector distance (closest first);
+- keeps one document per table (the closest) and drops repeated texts;
+- rewrites Oracle DDL compactly: columns with type and NOT NULL, primary
+  and foreign keys, and no storage/tablespace clauses;
+- for tables wider than RAG_PRUNE_MIN_COLUMNS, keeps only the key columns
+  and the columns whose names match words in the question, noting how
+  many were left out;
+- adds documents until RAG_CONTEXT_TOKEN_BUDGET tokens are used.  A
+  document that does not fit whole is cut at a column or line boundary,
+  never inside one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+_CREATE_TABLE = re.compile(
+    r"CREATE\s+(?:GLOBAL\s+TEMPORARY\s+)?TABLE\s+((?:\"[^\"]+\"|[\w$#]+)(?:\s*\.\s*(?:\"[^\"]+\"|[\w$#]+))?)\s*\(",
+    re.IGNORECASE,
+)
+_CONSTRAINT_START = re.compile(r"^(?:CONSTRAINT\b|PRIMARY\s+KEY|UNIQUE\b|FOREIGN\s+KEY|CHECK\b|SUPPLEMENTAL\b)", re.I)
+_KEY_CLAUSE = re.compile(
+    r"(PRIMARY\s+KEY\s*\([^)]*\)|FOREIGN\s+KEY\s*\([^)]*\)\s*REFERENCES\s+[\w$#\".]+\s*\([^)]*\))",
+    re.IGNORECASE,
+)
+_WORDS = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class ContextDocument:
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    distance: Optional[float] = None
+
+
+@dataclass
+class PackedContext:
+    parts: List[str]
+    tokens: int
+    documents: int
+    dropped: int
+    pruned_columns: int
+
+
+@dataclass
+class _Table:
+    name: str
+    columns: List[Tuple[str, str]]  # (column name, rendered definition)
+    keys: List[str]
+
+
+def _unquote(identifier: str) -> str:
+    return identifier.replace('"', "").replace(" ", "")
+
+
+def _split_top_level(body: str) -> List[str]:
+    items, depth, quote, start = [], 0, None, 0
+    for i, ch in enumerate(body):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            items.append(body[start:i])
+            start = i + 1
+    items.append(body[start:])
+    return [item.strip() for item in items if item.strip()]
+
+
+def parse_table_ddl(text: str) -> Optional[_Table]:
+    """Columns and key constraints of a CREATE TABLE statement, or None."""
+    match = _CREATE_TABLE.search(text or "")
+    if not match:
+        return None
+    depth, quote, end = 1, None, None
+    for i in range(match.end(), len(text)):
+        ch = text[i]
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                end = i
+                break
+    if end is None:
+        return None
+
+    columns: List[Tuple[str, str]] = []
+    keys: List[str] = []
+    for item in _split_top_level(text[match.end():end]):
+        item = " ".join(item.split())
+        if _CONSTRAINT_START.match(item):
+            keys.extend(_unquote_clause(clause) for clause in _KEY_CLAUSE.findall(item))
+            continue
+        name_match = re.match(r'("[^"]+"|[\w$#]+)\s*(.*)', item)
+        if not name_match:
+            continue
+        name = _unquote(name_match.group(1))
+        definition = re.sub(r"\s+ENABLE\b", "", name_match.group(2), flags=re.I)
+        definition = re.sub(r"\s+(?:USING\s+INDEX|CONSTRAINT)\b.*$", "", definition, flags=re.I)
+        columns.append((name, f"{name} {definition}".strip()))
+    return _Table(_unquote(match.group(1)), columns, keys)
+
+
+def _unquote_clause(clause: str) -> str:
+    return " ".join(clause.replace('"', "").split())
+
+
+def _question_terms(question: str) -> List[str]:
+    return [w for w in (t.casefold() for t in _WORDS.findall(question or "")) if len(w) >= 3]
+
+
+def _is_key_column(name: str, keys: Sequence[str]) -> bool:
+    upper = name.upper()
+    if upper == "ID" or upper.endswith("_ID"):
+        return True
+    return any(re.search(rf"\b{re.escape(upper)}\b", key.upper()) for key in keys)
+
+
+def _column_matches(name: str, terms: Sequence[str]) -> bool:
+    for part in (p.casefold() for p in name.split("_") if len(p) >= 2):
+        for term in terms:
+            if part == term or (len(part) >= 3 and (term.startswith(part) or part.startswith(term))):
+                return True
+    return False
+
+
+def _render_table(ident: str, table: _Table, columns: Sequence[str], omitted: int) -> str:
+    lines = [f"{ident}: CREATE TABLE {table.name} ("]
+    body = [f"  {c}" for c in columns] + [f"  {k}" for k in table.keys]
+    lines.append(",\n".join(body))
+    if omitted:
+        lines.append(f"  -- {omitted} more columns omitted")
+    lines.append(")")
+    return "\n".join(lines)
+
+
+def _identity(doc: ContextDocument, table: Optional[_Table]) -> Tuple[str, str]:
+    meta = doc.metadata or {}
+    owner = meta.get("owner") or meta.get("OWNER") or ""
+    name = meta.get("name") or meta.get("NAME") or ""
+    if owner or name:
+        ident = f"{owner}.{name}" if owner else name
+        return ident, f"table:{ident.upper()}"
+    if table is not None:
+        return table.name, f"table:{table.name.upper()}"
+    return "training_doc", "text:" + hashlib.sha256(doc.text.encode("utf-8")).hexdigest()
+
+
+def pack_context(
+    question: str,
+    documents: Iterable[ContextDocument],
+    *,
+    budget_tokens: int,
+    count_tokens: Callable[[str], int],
+    prune_min_columns: int = 12,
+) -> PackedContext:
+    """Pack `documents` for `question` into at most `budget_tokens` tokens."""
+    ranked = sorted(
+        enumerate(documents),
+        key=lambda item: (item[1].distance is None, item[1].distance or 0.0, item[0]),
+    )
+    terms = _question_terms(question)
+    parts: List[str] = []
+    seen = set()
+    used = dropped = pruned_total = 0
+
+    for _, doc in ranked:
+        if not doc.text:
+            continue
+        table = parse_table_ddl(doc.text)
+        ident, key = _identity(doc, table)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        remaining = budget_tokens - used
+        if remaining <= 0:
+            dropped += 1
+            continue
+
+        if table is not None and table.columns:
+            columns = [definition for _, definition in table.columns]
+            if prune_min_columns and len(table.columns) > prune_min_columns and terms:
+                relevant = [_column_matches(name, terms) for name, _ in table.columns]
+                if any(relevant):
+                    columns = [
+                        definition
+                        for (name, definition), hit in zip(table.columns, relevant)
+                        if hit or _is_key_column(name, table.keys)
+                    ]
+            omitted = len(table.columns) - len(columns)
+            text = _render_table(ident, table, columns, omitted)
+            tokens = count_tokens(text)
+            # Too big: keep the longest column prefix that fits.
+            while tokens > remaining and columns:
+                columns = columns[:-1]
+                omitted += 1
+                text = _render_table(ident, table, columns, omitted)
+                tokens = count_tokens(text)
+            if not columns:
+                dropped += 1
+                continue
+            pruned_total += omitted
+        else:
+            lines = f"{ident}: {doc.text.strip()}".splitlines()
+            text = "\n".join(lines)
+            tokens = count_tokens(text)
+            while tokens > remaining and len(lines) > 1:
+                lines = lines[:-1]
+                text = "\n".join(lines)
+                tokens = count_tokens(text)
+            if tokens > remaining:
+                dropped += 1
+                continue
+
+        parts.append(text)
+        used += tokens
+
+    return PackedContext(
+        parts=parts,
+        tokens=used,
+        documents=len(parts),
+        dropped=dropped,
+        pruned_columns=pruned_total,
+    )
@@ -0,0 +1,239 @@
+"""
+Process-wide memo cache for text embeddings.
+
+Embedding is the most expensive local step on CPU-only nodes, and the
+same strings (repeated questions, re-ingested DDL, training documents)
+were embedded again on every call.  `EmbeddingCache` is keyed by
+(model id, sha256 of the text) and has two tiers:
+
+- an in-memory LRU bounded by EMBEDDING_CACHE_MAX_BYTES (0 disables it);
+- an optional on-disk store under EMBEDDING_CACHE_DIR that survives
+  restarts: a float32 matrix (`<model>.f32`, read through a memory map)
+  plus an index file (`<model>.idx`, one `<sha256> <row>` line per
+  vector).  Appends take an advisory file lock where the platform has
+  one, so several workers can share the directory.
+
+Only texts missing from both tiers are passed to the model, in a single
+batch, and duplicates within a batch are embedded once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.utils.memory_cache import MemoryCache
+
+try:
+    import fcntl  # type: ignore
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _DiskStore:
+    """Append-only float32 matrix + index file for one embedding model."""
+
+    def __init__(self, directory: str, model_id: str) -> None:
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_id)
+        os.makedirs(directory, exist_ok=True)
+        self.model_id = model_id
+        self.matrix_path = os.path.join(directory, f"{slug}.f32")
+        self.index_path = os.path.join(directory, f"{slug}.idx")
+        self.dim: Optional[int] = None
+        self._rows: Dict[str, int] = {}
+        self._map: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _load(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, encoding="utf-8") as fh:
+            header = fh.readline().split()
+            fields = dict(part.split("=", 1) for part in header if "=" in part)
+            if fields.get("model") != self.model_id or not fields.get("dim", "").isdigit():
+                logger.warning("Ignoring embedding cache %s: header mismatch", self.index_path)
+                return
+            self.dim = int(fields["dim"])
+            rows: Dict[str, int] = {}
+            for line in fh:
+                parts = line.split()
+                if len(parts) == 2 and parts[1].isdigit():
+                    rows[parts[0]] = int(parts[1])
+        # Index lines for rows that never reached the matrix (torn append) are dropped.
+        available = self._matrix_rows()
+        self._rows = {key: row for key, row in rows.items() if row < available}
+
+    def _matrix_rows(self) -> int:
+        if self.dim is None or not os.path.exists(self.matrix_path):
+            return 0
+        return os.path.getsize(self.matrix_path) // (4 * self.dim)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                return None
+            if self._map is None or row >= self._map.shape[0]:
+                rows = self._matrix_rows()
+                self._map = np.memmap(self.matrix_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+            return np.array(self._map[row])
+
+    def append(self, items: Sequence[tuple]) -> None:
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(items[0][1].shape[0])
+            items = [(key, vec) for key, vec in items if vec.shape == (self.dim,)]
+            if not items:
+                return
+            row_bytes = 4 * self.dim
+            with open(self.index_path, "a+", encoding="utf-8") as index:
+                if fcntl is not None:
+                    fcntl.flock(index.fileno(), fcntl.LOCK_EX)
+                try:
+                    if index.tell() == 0:
+                        index.write(f"model={self.model_id} dim={self.dim}\n")
+                    with open(self.matrix_path, "ab") as matrix:
+                        size = os.fstat(matrix.fileno()).st_size
+                        first = size // row_bytes
+                        if size % row_bytes:
+                            matrix.truncate(first * row_bytes)
+                        matrix.write(np.stack([vec for _, vec in items]).astype(np.float32).tobytes())
+                        matrix.flush()
+                    for offset, (key, _) in enumerate(items):
+                        index.write(f"{key} {first + offset}\n")
+                        self._rows[key] = first + offset
+                    index.flush()
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(index.fileno(), fcntl.LOCK_UN)
+
+
+class EmbeddingCache:
+    """Memory LRU + optional disk store in front of one embedding model."""
+
+    def __init__(self, model_id: str, *, max_bytes: int, disk_dir: Optional[str] = None) -> None:
+        self.model_id = model_id
+        self._memory = (
+            MemoryCache(max_bytes=max_bytes, sizeof=lambda vec: int(vec.nbytes))
+            if max_bytes > 0
+            else None
+        )
+        self._disk: Optional[_DiskStore] = None
+        if disk_dir:
+            try:
+                self._disk = _DiskStore(disk_dir, model_id)
+            except OSError:
+                logger.exception("Embedding cache directory %s unusable; memory only", disk_dir)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    def embed(self, texts: Sequence[str], compute: Callable[[List[str]], Sequence[Any]]) -> List[np.ndarray]:
+        """Return one vector per text, calling `compute` only for cache misses."""
+        keys = [_text_key(text) for text in texts]
+        out: List[Optional[np.ndarray]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        hits = disk_hits = 0
+
+        for i, key in enumerate(keys):
+            vec = self._memory.get(key) if self._memory is not None else None
+            if vec is None and self._disk is not None:
+                vec = self._disk.get(key)
+                if vec is not None:
+                    disk_hits += 1
+                    if self._memory is not None:
+                        self._memory.set(key, vec)
+            elif vec is not None:
+                hits += 1
+            if vec is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                out[i] = vec
+
+        if missing:
+            todo = list(missing)
+            vectors = compute([texts[missing[key][0]] for key in todo])
+            computed = []
+            for key, vec in zip(todo, vectors):
+                vec = np.asarray(vec, dtype=np.float32)
+                computed.append((key, vec))
+                if self._memory is not None:
+                    self._memory.set(key, vec)
+                for i in missing[key]:
+                    out[i] = vec
+            if self._disk is not None and computed:
+                try:
+                    self._disk.append(computed)
+                except OSError:
+                    logger.exception("Could not persist %d embeddings", len(computed))
+
+        with self._lock:
+            self._hits += hits
+            self._disk_hits += disk_hits
+            self._misses += len(missing)
+        return out  # type: ignore[return-value]
+
+    def clear(self) -> None:
+        if self._memory is not None:
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                "model": self.model_id,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_ratio": round((self._hits + self._disk_hits) / lookups, 4) if lookups else 0.0,
+                "memory": self._memory.stats() if self._memory is not None else None,
+                "disk_entries": len(self._disk) if self._disk is not None else None,
+            }
+
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_id: str) -> EmbeddingCache:
+    """Process-wide cache for `model_id`, shared by every vector call site."""
+    with _caches_lock:
+        cache = _caches.get(model_id)
+        if cache is None:
+            settings = get_settings()
+            cache = EmbeddingCache(
+                model_id,
+                max_bytes=settings.EMBEDDING_CACHE_MAX_BYTES,
+                disk_dir=settings.EMBEDDING_CACHE_DIR or None,
+            )
+            _caches[model_id] = cache
+        return cache
+
+
+def embedding_cache_stats() -> List[Dict[str, Any]]:
+    with _caches_lock:
+        return [cache.stats() for cache in _caches.values()]
+
+
+def reset_embedding_caches() -> None:
+    """Drop every cache instance (tests, settings changes)."""
+    with _caches_lock:
+        _caches.clear()
@@ -0,0 +1,160 @@
+"""
+Bounded in-process cache: LRU order, per-entry TTL and a total byte budget.
+
+Used where a plain dict used to stand in for Redis (it grew forever and
+ignored TTLs) and as the near-cache in front of Redis.  Expired entries
+are dropped lazily when read and by a sweep that runs at most every
+`sweep_interval` seconds on writes, so memory held by keys nobody reads
+again is still reclaimed.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def default_sizeof(value: Any) -> int:
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+@dataclass
+class _Slot:
+    value: Any
+    size: int
+    expires_at: Optional[float]
+
+
+class MemoryCache:
+    """Thread-safe LRU with per-entry TTL, entry/byte limits and counters."""
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int,
+        max_entries: int = 0,
+        default_ttl: Optional[float] = None,
+        sweep_interval: float = 60.0,
+        sizeof: Callable[[Any], int] = default_sizeof,
+    ) -> None:
+        self.max_bytes = max(int(max_bytes), 0)
+        self.max_entries = max(int(max_entries), 0)
+        self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
+        self._sizeof = sizeof
+        self._slots: "OrderedDict[Hashable, _Slot]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + sweep_interval
+        self._hits = 0
+        self._misses = 0
+        self._sets = 0
+        self._rejected = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is not None and slot.expires_at is not None and slot.expires_at <= now:
+                self._drop(key)
+                self._expirations += 1
+                slot = None
+            if slot is None:
+                self._misses += 1
+                return default
+            self._slots.move_to_end(key)
+            self._hits += 1
+            return slot.value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        *,
+        ttl: Optional[float] = None,
+        size: Optional[int] = None,
+    ) -> bool:
+        """Store `value`; returns False when it alone exceeds the byte budget."""
+        ttl = self.default_ttl if ttl is None else ttl
+        size = self._sizeof(value) if size is None else size
+        now = time.monotonic()
+        with self._lock:
+            if key in self._slots:
+                self._drop(key)
+            if size > self.max_bytes:
+                self._rejected += 1
+                return False
+            expires_at = now + ttl if ttl is not None and ttl > 0 else None
+            self._slots[key] = _Slot(value, size, expires_at)
+            self._bytes += size
+            self._sets += 1
+            if now >= self._next_sweep:
+                self._sweep(now)
+            while self._slots and (
+                self._bytes > self.max_bytes
+                or (self.max_entries and len(self._slots) > self.max_entries)
+            ):
+                self._drop(next(iter(self._slots)))
+                self._evictions += 1
+        return True
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            if key not in self._slots:
+                return False
+            self._drop(key)
+            return True
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._sweep(time.monotonic())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slots.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _drop(self, key: Hashable) -> None:
+        slot = self._slots.pop(key)
+        self._bytes -= slot.size
+
+    def _sweep(self, now: float) -> int:
+        expired = [
+            key for key, slot in self._slots.items()
+            if slot.expires_at is not None and slot.expires_at <= now
+        ]
+        for key in expired:
+            self._drop(key)
+        self._expirations += len(expired)
+        self._next_sweep = now + self.sweep_interval
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._slots),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "sets": self._sets,
+                "rejected": self._rejected,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
@@ -0,0 +1,67 @@
+"""
+Single-flight coalescing for identical in-flight async work.
+
+The first caller for a key starts the work as a task; callers arriving
+while it runs await the same task instead of starting their own.  The
+entry is dropped as soon as the task finishes, so nothing is cached:
+later callers start a fresh call.
+
+The shared task is shielded from its waiters.  A client that disconnects
+cancels only its own wait, never the result other callers are waiting
+for.  Exceptions are delivered to every waiter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Per-key coalescing of concurrent coroutine calls, with counters."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._leaders = 0
+        self._followers = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Run `factory()` once for all concurrent callers of `key`.
+
+        Returns `(result, shared)`, where `shared` is True for callers that
+        joined a call another request started.
+        """
+        slot = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            task = self._calls.get(slot)
+            shared = task is not None
+            if shared:
+                self._followers += 1
+            else:
+                task = asyncio.ensure_future(factory())
+                self._calls[slot] = task
+                self._leaders += 1
+                task.add_done_callback(lambda done: self._finish(slot, done))
+        return await asyncio.shield(task), shared
+
+    def _finish(self, slot: Tuple[int, Hashable], task: asyncio.Task) -> None:
+        with self._lock:
+            if self._calls.get(slot) is task:
+                del self._calls[slot]
+        if not task.cancelled():
+            task.exception()  # retrieved here so abandoned failures are not logged as unhandled
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self._leaders + self._followers
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self._leaders,
+                "coalesced": self._followers,
+                "coalesced_ratio": round(self._followers / calls, 4) if calls else 0.0,
+            }
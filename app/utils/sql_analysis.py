@@ -0,0 +1,226 @@
+"""
+Single-parse SQL analysis shared by the generation pipeline.
+
+A generated statement used to be re-read five times per request:
+sqlparse formatting, LIMIT regexes, regex table extraction, regex column
+checks, string-spliced RLS and finally a full sqlglot parse in SQLGuard.
+The regex views and the AST view could disagree (aliases, literals that
+look like keywords), and each pass cost CPU.
+
+`analyse_sql` parses once with sqlglot and returns an `AnalysedStatement`
+carrying the AST, referenced tables, alias-resolved qualified columns,
+limit state and the normalised SQL rendered from the tree.  Statements are
+memoised by their source text *and* their normalised text, so each later
+stage that only has the SQL string (RLS, policy checks, SQLGuard,
+semantic-cache revalidation) resolves to the same object without parsing
+again.
+
+The AST is shared: consumers must treat `tree` as read-only and use
+`with_rls` (or copy the tree) to derive a new statement.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import FrozenSet, Optional, Tuple
+
+import sqlglot
+from sqlglot import exp
+from sqlglot.errors import SqlglotError
+from sqlglot.optimizer.scope import Scope, traverse_scope
+
+from app.core.exceptions import InvalidQueryError
+
+DEFAULT_DIALECT = "oracle"
+
+
+@dataclass(frozen=True)
+class AnalysedStatement:
+    tree: exp.Expression
+    dialect: str
+    sql: str
+    table_refs: Tuple[Tuple[str, str], ...]
+    tables: FrozenSet[str]
+    columns: FrozenSet[Tuple[str, str]]
+    has_limit: bool
+
+    @property
+    def statement_type(self) -> str:
+        return type(self.tree).__name__
+
+
+def _strip_comments(tree: exp.Expression) -> None:
+    for node in tree.walk():
+        if node.comments:
+            node.comments = None
+
+
+def _from_tree(tree: exp.Expression, dialect: str) -> AnalysedStatement:
+    cte_names = {cte.alias_or_name.upper() for cte in tree.find_all(exp.CTE)}
+
+    refs = []
+    aliases = {}
+    ambiguous = set()
+    for t in tree.find_all(exp.Table):
+        name = (t.name or "").upper()
+        if not name:
+            continue
+        owner = (t.db or "").upper()
+        if not owner and name in cte_names:
+            continue
+        refs.append((owner, name))
+        alias = t.alias_or_name.upper()
+        if aliases.get(alias, name) != name:
+            ambiguous.add(alias)
+        aliases[alias] = name
+
+    columns = _resolve_columns(tree, aliases, ambiguous)
+
+    has_limit = tree.args.get("limit") is not None or any(
+        (c.name or "").upper() == "ROWNUM" for c in tree.find_all(exp.Column)
+    )
+
+    return AnalysedStatement(
+        tree=tree,
+        dialect=dialect,
+        sql=tree.sql(dialect=dialect),
+        table_refs=tuple(dict.fromkeys(refs)),
+        tables=frozenset(name for _, name in refs),
+        columns=frozenset(columns),
+        has_limit=has_limit,
+    )
+
+
+def _scoped_table(scope: Scope, qualifier: str) -> str:
+    """Table behind `qualifier` as seen from `scope` (innermost source wins)."""
+    while scope is not None:
+        for alias, source in scope.sources.items():
+            if alias.upper() == qualifier:
+                # Derived tables and CTEs keep their alias.
+                return (source.name or "").upper() if isinstance(source, exp.Table) else qualifier
+        scope = scope.parent
+    return qualifier
+
+
+def _resolve_columns(tree: exp.Expression, aliases: dict, ambiguous: set) -> set:
+    """
+    (table, column) pairs, with each qualifier resolved in the scope the
+    column appears in, so a subquery alias cannot shadow an outer one.
+    Columns outside any SELECT scope (DML) fall back to the statement-wide
+    alias map and fail closed when that alias is ambiguous.
+    """
+    columns = set()
+    resolved = set()
+    try:
+        scopes = traverse_scope(tree)
+    except SqlglotError:
+        scopes = []
+    for scope in scopes:
+        for c in scope.columns:
+            col = (c.name or "").upper()
+            if not col:
+                continue
+            resolved.add(id(c))
+            qualifier = (c.table or "").upper()
+            columns.add((_scoped_table(scope, qualifier) if qualifier else "", col))
+
+    for c in tree.find_all(exp.Column):
+        col = (c.name or "").upper()
+        if not col or id(c) in resolved:
+            continue
+        qualifier = (c.table or "").upper()
+        if qualifier in ambiguous:
+            raise InvalidQueryError(f"SECURITY_VIOLATION: ambiguous table alias {qualifier}")
+        columns.add((aliases.get(qualifier, qualifier), col))
+    return columns
+
+
+_MAX_STATEMENTS = 512
+_statements: "OrderedDict[Tuple[str, str], AnalysedStatement]" = OrderedDict()
+_statements_lock = threading.Lock()
+
+
+def _remember(key: Tuple[str, str], statement: AnalysedStatement) -> None:
+    with _statements_lock:
+        _statements[key] = statement
+        _statements[(statement.dialect, statement.sql)] = statement
+        while len(_statements) > _MAX_STATEMENTS:
+            _statements.popitem(last=False)
+
+
+def analyse_sql(sql: str, dialect: str = DEFAULT_DIALECT) -> AnalysedStatement:
+    """
+    Parse `sql` once and return its analysis (memoised).
+
+    Raises:
+        InvalidQueryError: when the statement does not parse.
+    """
+    key = (dialect, sql)
+    with _statements_lock:
+        hit = _statements.get(key)
+        if hit is not None:
+            _statements.move_to_end(key)
+            return hit
+
+    try:
+        tree = sqlglot.parse_one(sql, read=dialect)
+    except SqlglotError as exc:
+        raise InvalidQueryError(f"SECURITY_VIOLATION: parse_error {exc}") from exc
+    if tree is None:
+        raise InvalidQueryError("SECURITY_VIOLATION: parse_error empty statement")
+
+    _strip_comments(tree)
+    statement = _from_tree(tree, dialect)
+    _remember(key, statement)
+    return statement
+
+
+def _scope_selects(node: exp.Expression):
+    if isinstance(node, exp.Select):
+        yield node
+    elif isinstance(node, exp.SetOperation):
+        yield from _scope_selects(node.this)
+        yield from _scope_selects(node.expression)
+    elif isinstance(node, exp.Subquery):
+        yield from _scope_selects(node.this)
+
+
+def with_rls(statement: AnalysedStatement, tenant_id: str) -> AnalysedStatement:
+    """
+    Return a new statement with `tenant_id = '<tenant>'` ANDed into the
+    WHERE clause of every top-level SELECT.
+
+    The predicate is built as an AST node (the tenant is a quoted literal,
+    never spliced text) and existing conditions keep their precedence.
+    """
+    tree = statement.tree.copy()
+    predicate = exp.EQ(
+        this=exp.column("tenant_id"),
+        expression=exp.Literal.string(str(tenant_id)),
+    )
+    selects = list(_scope_selects(tree))
+    if not selects:
+        return statement
+    for select in selects:
+        select.where(predicate.copy(), copy=False)
+
+    result = _from_tree(tree, statement.dialect)
+    _remember((result.dialect, result.sql), result)
+    return result
+
+
+def clear_analysis_cache() -> None:
+    with _statements_lock:
+        _statements.clear()
+
+
+def try_analyse_sql(sql: Optional[str], dialect: str = DEFAULT_DIALECT) -> Optional[AnalysedStatement]:
+    """`analyse_sql` for callers that fall back gracefully on bad SQL."""
+    if not sql:
+        return None
+    try:
+        return analyse_sql(sql, dialect)
+    except InvalidQueryError:
+        return None
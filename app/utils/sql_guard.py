@@ -5,15 +5,19 @@ Final, governance-locked version.
 
 from __future__ import annotations
 
+import hashlib
 import re
-from typing import Any, Dict, List, Set, Tuple
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional, Set, Tuple, Type
 
-import sqlglot
 from sqlglot import exp
-from sqlglot.errors import ParseError
 
-from app.core.config import Settings
+from app.core.config import Settings, get_settings
 from app.core.exceptions import InvalidQueryError
+from app.utils.compiled_policy import compile_policy, policy_cache_key
+from app.utils.sql_analysis import analyse_sql
 
 
 class SQLGuardViolation(InvalidQueryError):
@@ -28,12 +32,78 @@ class SQLGuardViolation(InvalidQueryError):
     pass
 
 
+@dataclass(frozen=True)
+class _Verdict:
+    sql: Optional[str]
+    error: Optional[Tuple[Type[InvalidQueryError], str]]
+    tables: FrozenSet[str]
+    columns: FrozenSet[Tuple[str, str]]
+
+
+class _VerdictCache:
+    """Process-wide bounded LRU of SQLGuard verdicts."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[Any, ...], _Verdict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def capacity(self) -> int:
+        return get_settings().SQLGUARD_VERDICT_CACHE_SIZE
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[_Verdict]:
+        with self._lock:
+            verdict = self._entries.get(key)
+            if verdict is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return verdict
+
+    def put(self, key: Tuple[Any, ...], verdict: _Verdict) -> None:
+        capacity = self.capacity
+        with self._lock:
+            self._entries[key] = verdict
+            while len(self._entries) > capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_verdicts = _VerdictCache()
+
+
+def clear_verdict_cache() -> None:
+    """Drop cached verdicts (called when a new policy version activates)."""
+    _verdicts.clear()
+
+
+def verdict_cache_stats() -> Dict[str, Any]:
+    return _verdicts.stats()
+
+
 class SQLGuard:
     """
     Final gatekeeper before SQL execution.
 
     Responsibilities:
-    - Parse SQL into AST (sqlglot)
+    - Parse SQL into AST (sqlglot, shared via sql_analysis)
     - Enforce statement-type restrictions (SELECT-only by default)
     - Block forbidden DDL/DML unless explicitly allowed
     - Enforce SchemaAccessPolicy (tables / columns)
@@ -76,42 +146,90 @@ class SQLGuard:
         Validate SQL against governance and policy rules
         and return a normalised, safe SQL string.
 
+        Verdicts (normalised SQL or the violation) are cached per statement
+        hash, policy id/version, dialect and DDL/DML flags; statements
+        checked against a mutable (draft/ad-hoc) policy are not cached.
+
         Raises:
             SQLGuardViolation: on any security / policy violation
             InvalidQueryError: on malformed SQL
         """
+        key = self._verdict_key(sql, policy)
+        cached = _verdicts.get(key) if key is not None else None
+        if cached is not None:
+            self.last_tables = set(cached.tables)
+            self.last_columns = set(cached.columns)
+            if cached.error is not None:
+                error_type, message = cached.error
+                raise error_type(message)
+            return cached.sql
+
+        try:
+            normalised = self._validate(sql, policy)
+        except InvalidQueryError as exc:
+            if key is not None:
+                _verdicts.put(key, _Verdict(
+                    sql=None,
+                    error=(type(exc), exc.message),
+                    tables=frozenset(self.last_tables),
+                    columns=frozenset(self.last_columns),
+                ))
+            raise
+        if key is not None:
+            _verdicts.put(key, _Verdict(
+                sql=normalised,
+                error=None,
+                tables=frozenset(self.last_tables),
+                columns=frozenset(self.last_columns),
+            ))
+        return normalised
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers
+    # ------------------------------------------------------------------ #
+
+    def _verdict_key(self, sql: str, policy: Any) -> Optional[Tuple[Any, ...]]:
+        if _verdicts.capacity <= 0:
+            return None
+        if policy:
+            policy_key = policy_cache_key(policy)
+            if policy_key is None:
+                return None
+        else:
+            policy_key = None
+        return (
+            hashlib.sha256(sql.encode("utf-8")).hexdigest(),
+            policy_key,
+            self.dialect,
+            self.allow_ddl,
+            self.allow_dml,
+            getattr(self.settings, "DB_TYPE", "oracle"),
+            getattr(self.settings, "DEFAULT_ROW_LIMIT", 100),
+        )
+
+    def _validate(self, sql: str, policy: Any) -> str:
+        self.last_tables = set()
+        self.last_columns = set()
+
         if ";" in sql.strip().rstrip(";"):
             raise SQLGuardViolation(
                 "SECURITY_VIOLATION: multiple SQL statements are not allowed"
             )
 
-        tree = self._parse(sql)
+        statement = analyse_sql(sql, self.dialect)
+        tree = statement.tree
         self._enforce_statement_type(tree)
         self._block_forbidden(tree)
 
-        tables, columns = self._extract_entities(tree)
+        tables = set(statement.tables)
+        columns = set(statement.columns)
         self.last_tables = tables
         self.last_columns = columns
 
         if policy:
             self._enforce_policy(tables, columns, policy)
 
-        normalised = tree.sql(dialect=self.dialect)
-        normalised = self._apply_limit(normalised)
-
-        return normalised
-
-    # ------------------------------------------------------------------ #
-    # Internal helpers
-    # ------------------------------------------------------------------ #
-
-    def _parse(self, sql: str) -> exp.Expression:
-        try:
-            return sqlglot.parse_one(sql, read=self.dialect)
-        except ParseError as exc:
-            raise InvalidQueryError(
-                f"SECURITY_VIOLATION: parse_error {exc}"
-            ) from exc
+        return self._apply_limit(statement.sql, has_limit=statement.has_limit)
 
     def _enforce_statement_type(self, tree: exp.Expression) -> None:
         root = tree
@@ -147,76 +265,33 @@ class SQLGuard:
             return True
         return False
 
-    def _extract_entities(
-        self,
-        tree: exp.Expression,
-    ) -> Tuple[Set[str], Set[Tuple[str, str]]]:
-        tables: Set[str] = set()
-        columns: Set[Tuple[str, str]] = set()
-
-        for t in tree.find_all(exp.Table):
-            table_name = ".".join(
-                part for part in [t.db, t.name] if part
-            ).upper()
-            if table_name:
-                tables.add(table_name.split(".")[-1])
-
-        for c in tree.find_all(exp.Column):
-            tbl = (c.table or "").upper()
-            col = c.name.upper()
-            if col:
-                columns.add((tbl, col))
-
-        return tables, columns
-
     def _enforce_policy(
         self,
         tables: Set[str],
         columns: Set[Tuple[str, str]],
         policy: Any,
     ) -> None:
-        allowed_tables = set(policy.allowed_tables or [])
-        denied_tables = set(policy.denied_tables or []) | set(
-            policy.excluded_tables or []
-        )
-
-        allowed_columns: Dict[str, List[str]] = {
-            k.upper(): [c.upper() for c in v]
-            for k, v in (policy.allowed_columns or {}).items()
-        }
-        excluded_columns: Dict[str, List[str]] = {
-            k.upper(): [c.upper() for c in v]
-            for k, v in (policy.excluded_columns or {}).items()
-        }
+        compiled = compile_policy(policy)
 
         for tbl in tables:
-            if denied_tables and tbl in denied_tables:
+            if not compiled.table_allowed(tbl):
                 raise SQLGuardViolation(
                     "SECURITY_VIOLATION: table not allowed by policy"
                 )
-            if allowed_tables and tbl not in {t.upper() for t in allowed_tables}:
+
+        for tbl, col in columns:
+            if tbl and not compiled.column_allowed(tbl, col):
                 raise SQLGuardViolation(
-                    "SECURITY_VIOLATION: table not allowed by policy"
+                    "SECURITY_VIOLATION: column not allowed by policy"
                 )
 
-        for tbl, col in columns:
-            if tbl:
-                if tbl in excluded_columns and col in excluded_columns[tbl]:
-                    raise SQLGuardViolation(
-                        "SECURITY_VIOLATION: column not allowed by policy"
-                    )
-                if allowed_columns.get(tbl) and col not in allowed_columns[tbl]:
-                    raise SQLGuardViolation(
-                        "SECURITY_VIOLATION: column not allowed by policy"
-                    )
-
-    def _apply_limit(self, sql: str, limit: int = 100) -> str:
+    def _apply_limit(self, sql: str, limit: int = 100, has_limit: bool = False) -> str:
         sql_upper = sql.upper()
         limit_val = getattr(self.settings, "DEFAULT_ROW_LIMIT", limit)
         db_type = getattr(self.settings, "DB_TYPE", "oracle").lower()
 
         if db_type == "oracle":
-            if "FETCH FIRST" not in sql_upper and "ROWNUM" not in sql_upper:
+            if not has_limit:
                 return f"{sql.rstrip()} FETCH FIRST {limit_val} ROWS ONLY"
 
         elif db_type == "mssql":
@@ -0,0 +1,49 @@
+"""
+Prompt token counting for the active LLM.
+
+`tiktoken` is used when it is installed and has an encoding for the
+model (OpenAI-family models, and cl100k_base for OpenAI-compatible
+endpoints).  Otherwise, or when the encoding cannot be loaded (no network
+to fetch the BPE file), counts fall back to `estimate_tokens`, a
+word-piece/punctuation heuristic.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import math
+import re
+from typing import Callable, Optional
+
+try:
+    import tiktoken  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]", re.UNICODE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Heuristic token count: ~4 characters per word piece, 1 per symbol."""
+    count = 0
+    for piece in _PIECES.findall(text or ""):
+        count += math.ceil(len(piece) / 4) if piece[0].isalnum() else 1
+    return count
+
+
+@functools.lru_cache(maxsize=16)
+def get_token_counter(model: Optional[str] = None) -> Callable[[str], int]:
+    """Token counter for `model`, cached per model name."""
+    if tiktoken is not None:
+        try:
+            try:
+                encoding = tiktoken.encoding_for_model(model or "")
+            except KeyError:
+                encoding = tiktoken.get_encoding("cl100k_base")
+            return lambda text: len(encoding.encode(text or "", disallowed_special=()))
+        except Exception as exc:
+            logger.warning("tiktoken unavailable for %s, estimating tokens: %s", model, exc)
+    return estimate_tokens
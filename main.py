@@ -10,7 +10,9 @@ in the `app` package.  Configuration values come from `.env` via
 details.
 """
 
+import asyncio
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 from fastapi import FastAPI
@@ -53,6 +55,34 @@ from app.telemetry import setup_tracing
 tags_metadata = [{"name": "health", "description": "Health endpoints"}]
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start the health monitor and preload the Ollama model in the background
+    on startup; flush the audit writer and release DB executor / session /
+    Redis / LLM pools on shutdown.
+    """
+    from app.services.health_monitor import start_health_monitor, stop_health_monitor
+    start_health_monitor()
+    from app.providers.llm.ollama_provider import warm_up_ollama
+    warm_up = asyncio.create_task(warm_up_ollama(settings))
+    yield
+    warm_up.cancel()
+    await stop_health_monitor()
+    from app.services.audit_writer import shutdown_audit_writer
+    shutdown_audit_writer()
+    from app.providers.cache.redis_provider import close_redis_caches
+    await close_redis_caches()
+    from app.providers.llm.http_client import close_llm_clients
+    await close_llm_clients()
+    from app.providers.database.executor import shutdown_db_executor
+    shutdown_db_executor()
+    from app.providers.factory import provider_name
+    if provider_name(settings.DB_PROVIDER) == "oracle":
+        from app.providers.database.oracle_provider import close_pools
+        close_pools()
+
+
 def create_app() -> FastAPI:
     """Factory function to create the FastAPI application."""
     # GOVERNANCE LOCK: These calls enforce security policies
@@ -65,6 +95,7 @@ def create_app() -> FastAPI:
         version="0.1.0",
         description="Self‑hosted backend for natural language to SQL queries using Vanna.",
         openapi_tags=tags_metadata,
+        lifespan=lifespan,
     )
 
     # Global exception handler
@@ -98,9 +129,9 @@ def create_app() -> FastAPI:
         from app.middleware.logging import LoggingMiddleware
         app.add_middleware(LoggingMiddleware)
 
-    if settings.ENABLE_RATE_LIMIT:
-        from app.middleware.rate_limit import RateLimitMiddleware
-        app.add_middleware(RateLimitMiddleware)
+    # Always installed: ENABLE_RATE_LIMIT is a runtime toggle checked per request.
+    from app.middleware.rate_limit import RateLimitMiddleware
+    app.add_middleware(RateLimitMiddleware)
 
     if settings.ENABLE_PERFORMANCE:
         from app.middleware.performance import PerformanceMiddleware
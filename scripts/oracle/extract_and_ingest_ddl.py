@@ -206,10 +206,19 @@ def ingest_into_chromadb(entries: List[Dict], overwrite: bool = False):
         # Fallback to default client (in-memory) if all else fails
         client = chromadb.Client()
 
+    # Share the application's embedding function (ONNX model loaded once,
+    # memo cache) so unchanged DDL is not re-embedded on every run.
     try:
-        collection = client.get_collection("ddl")
+        from app.providers.vector.chroma_provider import get_embedding_function
+
+        ef_kwargs = {"embedding_function": get_embedding_function()}
+    except Exception:
+        ef_kwargs = {}
+
+    try:
+        collection = client.get_collection("ddl", **ef_kwargs)
     except Exception:
-        collection = client.create_collection("ddl")
+        collection = client.create_collection("ddl", **ef_kwargs)
 
     ids = []
     docs = []
@@ -1,3 +1,5 @@
+import { ColumnarDataPayload, DataChunk } from "./types";
+
 export async function* parseNDJSONStream(
   response: Response
 ): AsyncGenerator<any> {
@@ -26,3 +28,34 @@ export async function* parseNDJSONStream(
     yield JSON.parse(buffer);
   }
 }
+
+/**
+ * Expand a columnar data_chunk payload into row objects.
+ */
+export function columnarToRows(
+  payload: ColumnarDataPayload
+): Record<string, any>[] {
+  const { columns, data } = payload;
+  const count = data.length ? data[0].length : 0;
+  const rows: Record<string, any>[] = new Array(count);
+
+  for (let r = 0; r < count; r++) {
+    const row: Record<string, any> = {};
+    for (let c = 0; c < columns.length; c++) {
+      row[columns[c]] = data[c][r];
+    }
+    rows[r] = row;
+  }
+  return rows;
+}
+
+/**
+ * Return the rows of a data_chunk regardless of its negotiated encoding.
+ */
+export function dataChunkRows(chunk: DataChunk): Record<string, any>[] {
+  const payload = chunk.payload;
+  if (payload.format === "columnar") {
+    return columnarToRows(payload);
+  }
+  return payload.rows;
+}
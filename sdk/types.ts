@@ -17,11 +17,28 @@ export type DeliveryChannel =
   | "email"
   | "dashboard";
 
+export type ResultFormat =
+  | "rows"
+  | "columnar";
+
+// Column types reported by columnar data_chunks.  Fixed for the whole
+// stream; "datetime" values arrive as ISO-8601 strings, "unknown" covers
+// columns whose type could not be determined (e.g. only nulls).
+export type ColumnType =
+  | "number"
+  | "string"
+  | "boolean"
+  | "datetime"
+  | "binary"
+  | "json"
+  | "unknown";
+
 // Core Requests
 export interface AskRequest {
   question: string;
   stream: boolean;
   context?: Record<string, any>;
+  result_format?: ResultFormat;
 }
 
 export interface TrainingItemRequest {
@@ -72,11 +89,27 @@ export interface TechnicalViewChunk extends BaseChunk {
   policy_hash: string;
 }
 
-export interface DataChunk extends BaseChunk {
-  type: "data_chunk";
+export interface RowsDataPayload {
+  format?: "rows";
+  rows: Record<string, any>[];
+  row_count: number;
+  chunk_index: number;
+  rows_so_far: number;
+}
+
+export interface ColumnarDataPayload {
+  format: "columnar";
   columns: string[];
-  rows: any[][];
+  types: ColumnType[];
+  data: any[][]; // one array per column
   row_count: number;
+  chunk_index: number;
+  rows_so_far: number;
+}
+
+export interface DataChunk extends BaseChunk {
+  type: "data_chunk";
+  payload: RowsDataPayload | ColumnarDataPayload;
 }
 
 export interface BusinessViewChunk extends BaseChunk {
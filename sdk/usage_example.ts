@@ -1,4 +1,5 @@
 import { EasyDataClient } from "./client";
+import { dataChunkRows } from "./ndjson";
 import { NDJSONChunk } from "./types";
 
 export async function exampleUsage(jwtToken: string) {
@@ -10,6 +11,7 @@ export async function exampleUsage(jwtToken: string) {
   for await (const chunk of client.ask({
     question: "Total revenue by region last quarter",
     stream: true,
+    result_format: "columnar",
   })) {
     switch (chunk.type) {
       case "thinking":
@@ -19,8 +21,8 @@ export async function exampleUsage(jwtToken: string) {
         console.log("SQL:", chunk.sql);
         break;
       case "data_chunk":
-        // renderTable(chunk.columns, chunk.rows);
-        console.log("Data chunk:", chunk.columns.length, "cols", chunk.row_count, "rows");
+        // renderTable(dataChunkRows(chunk));
+        console.log("Data chunk:", chunk.payload.chunk_index, dataChunkRows(chunk).length, "rows");
         break;
       case "business_view":
         // renderChart(chunk.chart_config);
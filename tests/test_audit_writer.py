@@ -0,0 +1,173 @@
+import asyncio
+import json
+import threading
+import time
+
+from sqlalchemy.exc import IntegrityError
+
+from app.services import audit_service as audit_service_module
+from app.services import audit_writer as audit_writer_module
+from app.services.audit_service import AuditService
+from app.services.audit_writer import AuditWriter
+
+
+class RecordingWriter(AuditWriter):
+    def __init__(self, fail_first: int = 0, gate: threading.Event | None = None, reject=(), **kwargs):
+        self.inserted = []
+        self.fail_first = fail_first
+        self.gate = gate
+        self.reject = set(reject)
+        options = {
+            "batch_size": 2,
+            "flush_interval_ms": 20,
+            "max_queue": 100,
+            "overflow": "block",
+        }
+        options.update(kwargs)
+        super().__init__(**options)
+
+    def _insert(self, rows):
+        if self.gate is not None:
+            self.gate.wait(2)
+        if self.fail_first:
+            self.fail_first -= 1
+            raise RuntimeError("database unavailable")
+        if any(row["action"] in self.reject for row in rows):
+            raise IntegrityError("INSERT INTO audit_logs", {}, Exception("ORA-01400"))
+        self.inserted.append([row["action"] for row in rows])
+
+
+def _row(i):
+    return {"user_id": "u", "role": "r", "action": f"a{i}", "question": "", "sql": "", "status": "ok"}
+
+
+def test_rows_are_bulk_inserted_in_batches(tmp_path):
+    writer = RecordingWriter(spill_path=str(tmp_path / "spill.jsonl"))
+    for i in range(5):
+        writer.submit(_row(i))
+
+    assert writer.flush(timeout=2)
+    writer.shutdown()
+
+    assert [a for batch in writer.inserted for a in batch] == [f"a{i}" for i in range(5)]
+    assert max(len(b) for b in writer.inserted) <= 2
+    stats = writer.stats()
+    assert stats["written"] == 5
+    assert stats["queue_depth"] == 0
+
+
+def test_failed_batches_spill_and_replay(tmp_path, monkeypatch):
+    monkeypatch.setattr(audit_writer_module, "_REPLAY_BACKOFF_SECONDS", 0.0)
+    spill = tmp_path / "spill.jsonl"
+    writer = RecordingWriter(fail_first=1, spill_path=str(spill))
+    writer.submit(_row(0))
+    assert writer.flush(timeout=2)
+    writer.shutdown()
+
+    assert writer.inserted == [["a0"]]
+    stats = writer.stats()
+    assert stats["spilled"] == 1
+    assert stats["replayed"] == 1
+    assert not spill.exists()
+
+
+def test_rejected_row_is_quarantined_and_replay_continues(tmp_path, monkeypatch):
+    monkeypatch.setattr(audit_writer_module, "_REPLAY_BACKOFF_SECONDS", 0.0)
+    spill = tmp_path / "spill.jsonl"
+    spill.write_text("".join(json.dumps(_row(i)) + "\n" for i in range(5)), encoding="utf-8")
+    writer = RecordingWriter(reject={"a2"}, spill_path=str(spill))
+
+    writer.shutdown()
+
+    assert sorted(a for batch in writer.inserted for a in batch) == ["a0", "a1", "a3", "a4"]
+    poison = (tmp_path / "spill.jsonl.poison").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["action"] for line in poison] == ["a2"]
+    assert not spill.exists() and not (tmp_path / "spill.jsonl.replay").exists()
+    assert writer.stats()["quarantined"] == 1
+
+
+def test_replay_keeps_rows_while_database_is_down(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    spill.write_text("".join(json.dumps(_row(i)) + "\n" for i in range(3)), encoding="utf-8")
+    writer = RecordingWriter(fail_first=100, spill_path=str(spill))
+
+    writer.shutdown()
+
+    assert writer.inserted == []
+    assert not (tmp_path / "spill.jsonl.poison").exists()
+    kept = (tmp_path / "spill.jsonl.replay").read_text(encoding="utf-8").splitlines()
+    assert len(kept) == 3
+
+
+def test_full_queue_spills_to_disk_when_configured(tmp_path):
+    gate = threading.Event()
+    spill = tmp_path / "spill.jsonl"
+    writer = RecordingWriter(
+        gate=gate, max_queue=1, batch_size=1, overflow="spill", spill_path=str(spill)
+    )
+    for i in range(4):
+        writer.submit(_row(i))
+
+    assert writer.stats()["spilled"] >= 1
+    assert spill.exists()
+    gate.set()
+    writer.shutdown()
+
+    assert sorted(a for batch in writer.inserted for a in batch) == [f"a{i}" for i in range(4)]
+
+
+def test_blocked_caller_spills_after_timeout(tmp_path):
+    gate = threading.Event()
+    writer = RecordingWriter(
+        gate=gate, max_queue=1, batch_size=1, block_timeout_ms=20, spill_path=str(tmp_path / "spill.jsonl")
+    )
+    started = time.monotonic()
+    for i in range(4):
+        writer.submit(_row(i))
+
+    assert time.monotonic() - started < 1.0
+    assert writer.stats()["spilled"] >= 1
+    gate.set()
+    writer.shutdown()
+
+    assert sorted(a for batch in writer.inserted for a in batch) == [f"a{i}" for i in range(4)]
+
+
+def test_event_loop_caller_never_blocks_or_touches_disk(tmp_path):
+    gate = threading.Event()
+    spill = tmp_path / "spill.jsonl"
+    writer = RecordingWriter(
+        gate=gate, max_queue=1, batch_size=1, block_timeout_ms=5000, spill_path=str(spill)
+    )
+
+    async def burst():
+        for i in range(4):
+            writer.submit(_row(i))
+
+    started = time.monotonic()
+    asyncio.run(burst())
+
+    assert time.monotonic() - started < 1.0
+    # The writer is stuck on the gated insert, so nobody has spilled yet.
+    assert writer.stats()["overflow_pending"] >= 1
+    assert not spill.exists()
+    gate.set()
+    writer.shutdown()
+
+    assert sorted(a for batch in writer.inserted for a in batch) == [f"a{i}" for i in range(4)]
+    assert writer.stats()["overflow_pending"] == 0
+
+
+def test_audit_service_hands_rows_to_writer(monkeypatch):
+    submitted = []
+
+    class StubWriter:
+        def submit(self, row):
+            submitted.append(row)
+
+    monkeypatch.setattr(audit_service_module, "get_audit_writer", lambda: StubWriter())
+    record = AuditService().log(user_id="u1", role="admin", action="ask", payload={"q": 1})
+
+    assert submitted[0]["action"] == "ask"
+    assert submitted[0]["payload"] == '{"q": 1}'
+    assert record.id is None
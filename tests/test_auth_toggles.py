@@ -6,6 +6,7 @@ if not os.environ.get("RUN_INTEGRATION_TESTS"):
 
 pytest.importorskip("fastapi")
 from fastapi.testclient import TestClient
+from app.core.config import refresh_settings
 app_main = pytest.importorskip("app.main")
 try:
     client = TestClient(app_main.app)
@@ -13,6 +14,12 @@ except TypeError:
     pytest.skip("TestClient incompatible with installed httpx/starlette", allow_module_level=True)
 
 
+@pytest.fixture(autouse=True)
+def _restore_settings_snapshot():
+    yield
+    refresh_settings()
+
+
 class TestAuthToggle:
     """Test AUTH_ENABLED toggle."""
     
@@ -24,6 +31,7 @@ class TestAuthToggle:
         - user_context is anonymous
         """
         monkeypatch.setenv("AUTH_ENABLED", "false")
+        refresh_settings()
         
         response = client.post("/api/v1/ask", params={"question": "test"})
         
@@ -37,6 +45,7 @@ class TestAuthToggle:
         """
         monkeypatch.setenv("AUTH_ENABLED", "true")
         monkeypatch.setenv("JWT_SECRET_KEY", "test")
+        refresh_settings()
         
         response = client.post("/api/v1/ask", params={"question": "test"})
         
@@ -51,6 +60,7 @@ class TestAuthToggle:
         """
         monkeypatch.setenv("AUTH_ENABLED", "true")
         monkeypatch.setenv("JWT_SECRET_KEY", "test")
+        refresh_settings()
         
         # First, login
         login_response = client.post(
@@ -81,6 +91,7 @@ class TestRBACToggle:
         monkeypatch.setenv("AUTH_ENABLED", "true")
         monkeypatch.setenv("RBAC_ENABLED", "false")
         monkeypatch.setenv("JWT_SECRET_KEY", "test")
+        refresh_settings()
 
         from app.core.security import create_access_token
         token = create_access_token(
@@ -106,6 +117,7 @@ class TestRBACToggle:
         monkeypatch.setenv("RBAC_ENABLED", "true")
         monkeypatch.setenv("AUTH_ENABLED", "true")
         monkeypatch.setenv("JWT_SECRET_KEY", "test")
+        refresh_settings()
         
         # Create token with no permissions
         from app.core.security import create_access_token
@@ -139,6 +151,7 @@ class TestUserContextContract:
         - is_authenticated
         """
         monkeypatch.setenv("AUTH_ENABLED", "false")
+        refresh_settings()
         
         response = client.get("/api/v1/auth/me")
         user_context = response.json()
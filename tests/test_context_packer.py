@@ -0,0 +1,127 @@
+import asyncio
+
+from app.core.config import get_settings
+from app.services.vanna_service import VannaService
+from app.utils.context_packer import ContextDocument, pack_context, parse_table_ddl
+from app.utils.token_counter import estimate_tokens
+
+_WIDE_DDL = """
+  CREATE TABLE "HR"."EMPLOYEES"
+   (\t"EMPLOYEE_ID" NUMBER(6,0) NOT NULL ENABLE,
+\t"FIRST_NAME" VARCHAR2(20),
+\t"LAST_NAME" VARCHAR2(25) NOT NULL ENABLE,
+\t"EMAIL" VARCHAR2(25) NOT NULL ENABLE,
+\t"PHONE_NUMBER" VARCHAR2(20),
+\t"HIRE_DATE" DATE NOT NULL ENABLE,
+\t"JOB_ID" VARCHAR2(10) NOT NULL ENABLE,
+\t"SALARY" NUMBER(8,2),
+\t"COMMISSION_PCT" NUMBER(2,2),
+\t"MANAGER_ID" NUMBER(6,0),
+\t"DEPARTMENT_ID" NUMBER(4,0),
+\t CONSTRAINT "EMP_EMP_ID_PK" PRIMARY KEY ("EMPLOYEE_ID")
+  USING INDEX PCTFREE 10 INITRANS 2 MAXTRANS 255 TABLESPACE "USERS"  ENABLE,
+\t CONSTRAINT "EMP_DEPT_FK" FOREIGN KEY ("DEPARTMENT_ID")
+\t  REFERENCES "HR"."DEPARTMENTS" ("DEPARTMENT_ID") ENABLE
+   ) SEGMENT CREATION IMMEDIATE
+  PCTFREE 10 PCTUSED 40 INITRANS 1 MAXTRANS 255 TABLESPACE "USERS"
+"""
+
+_DEPT_DDL = 'CREATE TABLE "HR"."DEPARTMENTS" ("DEPARTMENT_ID" NUMBER(4,0), "DEPARTMENT_NAME" VARCHAR2(30))'
+
+
+def _pack(question, docs, budget=1000, prune_min_columns=5):
+    return pack_context(
+        question,
+        docs,
+        budget_tokens=budget,
+        count_tokens=estimate_tokens,
+        prune_min_columns=prune_min_columns,
+    )
+
+
+def test_parse_table_ddl_drops_storage_clauses():
+    table = parse_table_ddl(_WIDE_DDL)
+
+    assert table.name == "HR.EMPLOYEES"
+    assert table.columns[0] == ("EMPLOYEE_ID", "EMPLOYEE_ID NUMBER(6,0) NOT NULL")
+    assert len(table.columns) == 11
+    assert table.keys == [
+        "PRIMARY KEY (EMPLOYEE_ID)",
+        "FOREIGN KEY (DEPARTMENT_ID) REFERENCES HR.DEPARTMENTS (DEPARTMENT_ID)",
+    ]
+
+
+def test_orders_by_distance_and_dedupes_tables():
+    docs = [
+        ContextDocument(_WIDE_DDL, {"owner": "HR", "name": "EMPLOYEES"}, 0.7),
+        ContextDocument(_DEPT_DDL, {"owner": "HR", "name": "DEPARTMENTS"}, 0.2),
+        ContextDocument(_WIDE_DDL + " ", {"owner": "HR", "name": "EMPLOYEES"}, 0.9),
+        ContextDocument("Revenue means SUM(amount).", {}, 0.5),
+        ContextDocument("Revenue means SUM(amount).", {}, 0.6),
+    ]
+
+    packed = _pack("list departments", docs, prune_min_columns=0)
+
+    assert [part.split(":", 1)[0] for part in packed.parts] == ["HR.DEPARTMENTS", "training_doc", "HR.EMPLOYEES"]
+    assert packed.documents == 3 and packed.dropped == 0
+    assert "TABLESPACE" not in packed.parts[2] and "ENABLE" not in packed.parts[2]
+
+
+def test_wide_tables_keep_relevant_and_key_columns():
+    packed = _pack("average salary by hire year", [ContextDocument(_WIDE_DDL, {}, 0.1)])
+
+    part = packed.parts[0]
+    for column in ("EMPLOYEE_ID", "SALARY", "HIRE_DATE", "DEPARTMENT_ID", "JOB_ID"):
+        assert column in part
+    for column in ("FIRST_NAME", "EMAIL", "PHONE_NUMBER"):
+        assert column not in part
+    assert "-- 5 more columns" in part
+    assert packed.pruned_columns == 5
+
+
+def test_no_pruning_without_matching_columns():
+    packed = _pack("how many rows", [ContextDocument(_WIDE_DDL, {}, 0.1)])
+
+    assert "PHONE_NUMBER" in packed.parts[0]
+    assert packed.pruned_columns == 0
+
+
+def test_budget_is_respected_without_cutting_columns():
+    docs = [ContextDocument(_WIDE_DDL, {}, 0.1), ContextDocument(_DEPT_DDL, {}, 0.2)]
+    budget = 100
+
+    packed = _pack("how many rows", docs, budget=budget)
+
+    assert packed.tokens == sum(estimate_tokens(p) for p in packed.parts) <= budget
+    assert packed.dropped == 1
+    definitions = [d for _, d in parse_table_ddl(_WIDE_DDL).columns]
+    *body, note, _ = packed.parts[0].splitlines()[1:]
+    columns = [line.strip().rstrip(",") for line in body if "KEY" not in line]
+    assert columns and columns == definitions[: len(columns)]
+    assert note == f"  -- {len(definitions) - len(columns)} more columns omitted"
+
+
+def test_retrieve_context_packs_scored_results():
+    class _Vector:
+        def query_scored(self, query_text, n_results, query_embedding=None):
+            return [(_DEPT_DDL, {"owner": "HR", "name": "DEPARTMENTS"}, 0.3)] * 2
+
+    service = VannaService.__new__(VannaService)
+    service.settings = get_settings()
+    service.llm = None
+    service.vector = _Vector()
+
+    parts = asyncio.run(service.retrieve_context("departments"))
+
+    assert parts == [
+        "HR.DEPARTMENTS: CREATE TABLE HR.DEPARTMENTS (\n"
+        "  DEPARTMENT_ID NUMBER(4,0),\n"
+        "  DEPARTMENT_NAME VARCHAR2(30)\n"
+        ")"
+    ]
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("SELECT id FROM t") == 5
+    assert estimate_tokens("DEPARTMENT_ID") == 5
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+
+from app.providers.base import BaseDatabaseProvider
+from app.providers.database.executor import DatabaseExecutor
+from app.providers.database import executor as executor_module
+
+
+class SlowProvider(BaseDatabaseProvider):
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def connect(self):
+        return None
+
+    def execute(self, sql, parameters=None):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return [{"SQL": sql}]
+
+
+def test_execute_async_respects_concurrency_cap(monkeypatch):
+    monkeypatch.setattr(executor_module, "_executor", DatabaseExecutor(max_workers=2))
+    provider = SlowProvider()
+
+    async def scenario():
+        return await asyncio.gather(
+            *(provider.execute_async(f"SELECT {i} FROM DUAL") for i in range(6))
+        )
+
+    results = asyncio.run(scenario())
+
+    assert [r[0]["SQL"] for r in results] == [f"SELECT {i} FROM DUAL" for i in range(6)]
+    assert provider.peak == 2
+    stats = executor_module.get_db_executor().stats()
+    assert stats["completed"] == 6
+    assert stats["in_flight"] == 0
+    assert stats["queued"] == 0
+
+
+def test_execute_async_does_not_block_event_loop(monkeypatch):
+    monkeypatch.setattr(executor_module, "_executor", DatabaseExecutor(max_workers=1))
+    provider = SlowProvider(delay=0.2)
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        await asyncio.gather(provider.execute_async("SELECT 1 FROM DUAL"), ticker())
+
+    asyncio.run(scenario())
+
+    assert len(ticks) == 5
+    assert ticks[-1] - ticks[0] < 0.15
+
+
+def test_cancelled_waiter_leaves_queue():
+    executor = DatabaseExecutor(max_workers=1)
+    gate = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(gate.wait, 2))
+        await asyncio.sleep(0.05)
+        waiting = asyncio.ensure_future(executor.run(time.sleep, 0))
+        await asyncio.sleep(0.01)
+        assert executor.stats()["queued"] == 1
+        waiting.cancel()
+        await asyncio.sleep(0.01)
+        gate.set()
+        await running
+
+    asyncio.run(scenario())
+    executor.shutdown()
+
+    stats = executor.stats()
+    assert stats["queued"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["completed"] == 1
@@ -0,0 +1,62 @@
+import numpy as np
+
+from app.utils.embedding_cache import EmbeddingCache
+
+
+class _Model:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [np.full(4, len(text), dtype=np.float32) for text in texts]
+
+
+def test_repeated_texts_are_embedded_once():
+    model = _Model()
+    cache = EmbeddingCache("m", max_bytes=1024)
+
+    first = cache.embed(["a", "bb", "a"], model)
+    second = cache.embed(["bb", "ccc"], model)
+
+    assert model.calls == [["a", "bb"], ["ccc"]]
+    assert np.array_equal(first[0], first[2])
+    assert np.array_equal(second[0], first[1])
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+
+
+def test_disk_store_survives_restart(tmp_path):
+    model = _Model()
+    EmbeddingCache("all-MiniLM", max_bytes=1024, disk_dir=str(tmp_path)).embed(["a", "bb"], model)
+
+    restarted = EmbeddingCache("all-MiniLM", max_bytes=1024, disk_dir=str(tmp_path))
+    vectors = restarted.embed(["bb", "a", "new"], model)
+
+    assert model.calls == [["a", "bb"], ["new"]]
+    assert vectors[0].tolist() == [2.0] * 4
+    assert restarted.stats()["disk_hits"] == 2
+    assert restarted.stats()["disk_entries"] == 3
+
+
+def test_torn_append_is_ignored(tmp_path):
+    model = _Model()
+    EmbeddingCache("m", max_bytes=0, disk_dir=str(tmp_path)).embed(["a", "bb"], model)
+    matrix = tmp_path / "m.f32"
+    matrix.write_bytes(matrix.read_bytes()[:-6])
+
+    restarted = EmbeddingCache("m", max_bytes=0, disk_dir=str(tmp_path))
+    restarted.embed(["a", "bb"], model)
+    assert model.calls[-1] == ["bb"]
+
+    again = EmbeddingCache("m", max_bytes=0, disk_dir=str(tmp_path))
+    assert [v.tolist() for v in again.embed(["a", "bb"], model)] == [[1.0] * 4, [2.0] * 4]
+    assert len(model.calls) == 2
+
+
+def test_other_model_files_are_not_reused(tmp_path):
+    model = _Model()
+    EmbeddingCache("m1", max_bytes=0, disk_dir=str(tmp_path)).embed(["a"], model)
+    EmbeddingCache("m2", max_bytes=0, disk_dir=str(tmp_path)).embed(["a"], model)
+    assert len(model.calls) == 2
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from app.core.config import get_settings
+from app.services import health_monitor
+from app.services.health_monitor import HealthMonitor
+from app.services.health_service import HealthService
+
+
+class _Probes:
+    def __init__(self):
+        self.calls = 0
+        self.db_down = False
+        self.llm_delay = 0.0
+
+    async def llm(self):
+        self.calls += 1
+        await asyncio.sleep(self.llm_delay)
+        return {"status": "healthy", "provider": "groq", "model": "m"}
+
+    async def database(self):
+        if self.db_down:
+            raise ConnectionError("ORA-12541: no listener")
+        return {"provider": "oracle"}
+
+    async def redis(self):
+        return None
+
+
+def _monitor(probes, **overrides):
+    settings = get_settings().model_copy(
+        update={"HEALTH_CHECK_TIMEOUT": 1, "HEALTH_CHECK_INTERVAL_SECONDS": 60, **overrides}
+    )
+    return HealthMonitor(
+        settings, {"llm": probes.llm, "database": probes.database, "redis": probes.redis}
+    )
+
+
+def test_snapshot_records_status_latency_and_errors():
+    probes = _Probes()
+    monitor = _monitor(probes)
+    asyncio.run(monitor.probe_all())
+
+    snapshot = monitor.snapshot()
+    assert snapshot["llm"]["status"] == "healthy" and snapshot["llm"]["latency_ms"] is not None
+    assert snapshot["redis"]["status"] == "disabled"
+
+    probes.db_down = True
+    asyncio.run(monitor.probe_all())
+    probes.db_down = False
+    asyncio.run(monitor.probe_all())
+
+    database = monitor.component("database")
+    assert database["status"] == "healthy" and database["error"] is None
+    assert "ORA-12541" in database["last_error"] and database["consecutive_failures"] == 0
+
+
+def test_database_probe_normalises_provider_name():
+    executed = []
+
+    class _Db:
+        async def execute_async(self, sql):
+            executed.append(sql)
+
+    monitor = HealthMonitor(get_settings().model_copy(update={"DB_PROVIDER": "Oracle"}))
+    monitor._db = _Db()
+
+    assert asyncio.run(monitor._probe_database()) == {"provider": "oracle"}
+    assert executed == ["SELECT 1 FROM dual"]
+
+
+def test_probe_timeout_marks_component_unhealthy():
+    probes = _Probes()
+    probes.llm_delay = 5
+    monitor = _monitor(probes, HEALTH_CHECK_TIMEOUT=0.05)
+
+    state = asyncio.run(monitor.probe("llm"))
+
+    assert state.status == "unhealthy" and "timed out" in state.error
+
+
+@pytest.mark.parametrize("mode, expected", [("strict", "unhealthy"), ("degraded", "degraded")])
+def test_aggregation_mode_applies_to_cached_state(mode, expected):
+    probes = _Probes()
+    probes.db_down = True
+    monitor = _monitor(probes, HEALTH_AGGREGATION_MODE=mode)
+    asyncio.run(monitor.probe_all())
+
+    health = monitor.aggregate()
+
+    assert health["status"] == expected and health["failing"] == ["database"]
+
+
+def test_endpoints_serve_snapshot_without_reprobing(monkeypatch):
+    probes = _Probes()
+    monitor = _monitor(probes)
+    monkeypatch.setattr(health_monitor, "_monitor", monitor)
+
+    async def poll():
+        return [await HealthService.llm_health() for _ in range(5)]
+
+    results = asyncio.run(poll())
+
+    assert probes.calls == 1
+    assert results[-1]["status"] == "healthy" and results[-1]["provider"] == "groq"
+
+
+def test_background_task_probes_until_stopped():
+    probes = _Probes()
+    monitor = _monitor(probes, HEALTH_CHECK_INTERVAL_SECONDS=1)
+
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.05)
+        assert monitor.running
+        await monitor.ensure_fresh()  # no-op while the task runs
+        await monitor.stop()
+
+    asyncio.run(run())
+
+    assert probes.calls == 1 and not monitor.running
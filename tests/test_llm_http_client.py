@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.core.config import get_settings
+from app.providers.factory import create_llm_provider
+from app.providers.llm import http_client
+from app.providers.llm.openai_compatible_provider import OpenAICompatibleProvider
+
+
+def _completion(content):
+    return {
+        "id": "cmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "test-model",
+        "choices": [
+            {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}
+        ],
+    }
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    calls = []
+    failures = {"left": 0}
+
+    def handler(request):
+        calls.append(request)
+        if failures["left"]:
+            failures["left"] -= 1
+            return httpx.Response(503, json={"error": {"message": "busy"}})
+        return httpx.Response(200, json=_completion("```sql\nSELECT 1 FROM dual\n```"))
+
+    def build(settings):
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    monkeypatch.setattr(http_client, "_build_http_client", build)
+    asyncio.run(http_client.close_llm_clients())
+    yield calls, failures
+    asyncio.run(http_client.close_llm_clients())
+
+
+def _settings(**overrides):
+    base = {
+        "LLM_PROVIDER": "openai_compatible",
+        "OPENAI_API_KEY": "sk-test",
+        "OPENAI_MODEL": "test-model",
+        "OPENAI_BASE_URL": "https://llm.example/v1",
+        "LLM_MAX_RETRIES": 2,
+    }
+    base.update(overrides)
+    return get_settings().model_copy(update=base)
+
+
+def test_providers_share_one_pooled_client(transport):
+    calls, _ = transport
+    first = OpenAICompatibleProvider(_settings())
+    second = OpenAICompatibleProvider(_settings())
+
+    assert first.client is second.client
+    sql = asyncio.run(first.generate_sql("How many rows?", temperature=0.0, max_tokens=64))
+
+    assert "SELECT 1 FROM dual" in sql
+    assert calls[0].url == "https://llm.example/v1/chat/completions"
+    body = json.loads(calls[0].content)
+    assert body["model"] == "test-model" and body["max_tokens"] == 64
+
+
+def test_transient_errors_are_retried(transport):
+    calls, failures = transport
+    failures["left"] = 1
+    provider = OpenAICompatibleProvider(_settings())
+
+    asyncio.run(provider.generate_sql("How many rows?"))
+
+    assert len(calls) == 2
+
+
+def test_groq_uses_its_own_endpoint_and_timeout(transport):
+    settings = _settings(
+        LLM_PROVIDER="groq",
+        OPENAI_API_KEY=None,
+        OPENAI_MODEL=None,
+        OPENAI_BASE_URL=None,
+        GROQ_API_KEY="gsk-test",
+        GROQ_TIMEOUT=7,
+    )
+    provider = create_llm_provider(settings)
+
+    assert str(provider.client.base_url).startswith(settings.GROQ_BASE_URL)
+    assert provider.client.timeout.read == 7
+    assert provider.client.max_retries == 2
@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+
+from app.core.config import get_settings
+from app.core.exceptions import AppException
+from app.providers.base import BaseLLMProvider
+from app.providers.factory import create_llm_provider
+from app.providers.llm import router_provider
+from app.providers.llm.router_provider import LLMRouterProvider, llm_router_stats
+
+
+class _Backend(BaseLLMProvider):
+    def __init__(self, name, delay=0.0, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate_sql(self, prompt, temperature=0.0, max_tokens=512):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise AppException(f"{self.name} down")
+        return f"SELECT '{self.name}' FROM dual"
+
+    async def health_check(self):
+        return {"status": "unhealthy" if self.fail else "healthy", "latency_ms": 5}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats():
+    router_provider.reset_llm_router_stats()
+    yield
+    router_provider.reset_llm_router_stats()
+
+
+def _router(*backends, **overrides):
+    settings = get_settings().model_copy(
+        update={
+            "LLM_ROUTER_HEDGE": True,
+            "LLM_ROUTER_HEDGE_MIN_MS": 20,
+            "LLM_ROUTER_HEDGE_MAX_MS": 50,
+            "LLM_ROUTER_ATTEMPT_TIMEOUT_SECONDS": 1.0,
+            "LLM_ROUTER_MAX_FAILURES": 2,
+            **overrides,
+        }
+    )
+    return LLMRouterProvider(settings, [(b.name, b) for b in backends])
+
+
+def test_fails_over_to_next_backend():
+    down, up = _Backend("groq", fail=True), _Backend("phi3")
+    router = _router(down, up, LLM_ROUTER_HEDGE=False)
+
+    assert asyncio.run(router.generate_sql("q")) == "SELECT 'phi3' FROM dual"
+    stats = llm_router_stats()
+    assert stats["groq"]["errors"] == 1 and stats["phi3"]["wins"] == 1
+
+
+def test_attempt_timeout_fails_over():
+    stuck, up = _Backend("groq", delay=5), _Backend("phi3")
+    router = _router(stuck, up, LLM_ROUTER_HEDGE=False, LLM_ROUTER_ATTEMPT_TIMEOUT_SECONDS=0.05)
+
+    assert asyncio.run(router.generate_sql("q")) == "SELECT 'phi3' FROM dual"
+    assert llm_router_stats()["groq"]["errors"] == 1
+
+
+def test_slow_primary_is_hedged_and_loser_cancelled():
+    slow, fast = _Backend("groq", delay=0.5), _Backend("phi3", delay=0.01)
+    router = _router(slow, fast)
+
+    assert asyncio.run(router.generate_sql("q")) == "SELECT 'phi3' FROM dual"
+    assert slow.cancelled == 1
+    stats = llm_router_stats()
+    assert stats["phi3"]["hedged_requests"] == 1
+    assert stats["groq"]["errors"] == 0
+
+
+def test_routes_to_fastest_and_skips_open_circuit():
+    slow, fast = _Backend("groq", delay=0.03), _Backend("phi3", delay=0.0)
+    router = _router(slow, fast, LLM_ROUTER_HEDGE=False)
+    for _ in range(3):
+        asyncio.run(router._attempt("groq", slow, prompt="q"))
+        asyncio.run(router._attempt("phi3", fast, prompt="q"))
+
+    assert [name for name, _ in router.ranked()] == ["phi3", "groq"]
+
+    fast.fail = True
+    for _ in range(2):
+        with pytest.raises(AppException):
+            asyncio.run(router._attempt("phi3", fast, prompt="q"))
+
+    assert not llm_router_stats()["phi3"]["healthy"]
+    assert [name for name, _ in router.ranked()] == ["groq"]
+
+    slow.fail = True
+    for _ in range(2):
+        with pytest.raises(AppException):
+            asyncio.run(router._attempt("groq", slow, prompt="q"))
+
+    # Every circuit open: fall back to trying them all.
+    assert {name for name, _ in router.ranked()} == {"groq", "phi3"}
+
+
+def test_never_hedges_to_open_circuit():
+    slow, broken = _Backend("groq", delay=0.1), _Backend("phi3", fail=True)
+    router = _router(slow, broken)
+    for _ in range(2):
+        with pytest.raises(AppException):
+            asyncio.run(router._attempt("phi3", broken, prompt="q"))
+    broken.calls = 0
+
+    assert asyncio.run(router.generate_sql("q")) == "SELECT 'groq' FROM dual"
+    assert broken.calls == 0
+    assert llm_router_stats()["phi3"]["hedged_requests"] == 0
+
+
+def test_all_backends_failing_raises():
+    router = _router(_Backend("groq", fail=True), _Backend("phi3", fail=True))
+
+    with pytest.raises(AppException):
+        asyncio.run(router.generate_sql("q"))
+
+
+def test_factory_skips_unconfigured_backends():
+    settings = get_settings().model_copy(
+        update={
+            "LLM_PROVIDER": "router",
+            "LLM_ROUTER_PROVIDERS": ["openai_compatible", "google"],
+            "OPENAI_API_KEY": "sk-test",
+            "OPENAI_MODEL": "m",
+            "GOOGLE_API_KEY": None,
+        }
+    )
+
+    router = create_llm_provider(settings)
+
+    assert isinstance(router, LLMRouterProvider)
+    assert [name for name, _ in router.backends] == ["openai_compatible"]
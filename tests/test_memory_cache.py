@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from app.services import semantic_cache_service
+from app.services.semantic_cache_service import SemanticCacheService, clear_local_cache
+from app.utils import memory_cache
+from app.utils.memory_cache import MemoryCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(memory_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_ttl_is_honoured_lazily(clock):
+    cache = MemoryCache(max_bytes=1000)
+    cache.set("a", "1", ttl=5)
+    cache.set("b", "2")
+
+    clock[0] += 6
+    assert cache.get("a") is None
+    assert cache.get("b") == "2"
+    assert cache.stats()["expirations"] == 1
+
+
+def test_periodic_sweep_reclaims_unread_entries(clock):
+    cache = MemoryCache(max_bytes=1000, sweep_interval=10)
+    for i in range(5):
+        cache.set(f"k{i}", "x" * 10, ttl=5)
+
+    clock[0] += 11
+    cache.set("fresh", "y")
+
+    assert len(cache) == 1
+    assert cache.stats()["bytes"] == 1
+
+
+def test_lru_eviction_by_bytes_and_entries():
+    cache = MemoryCache(max_bytes=30, max_entries=2)
+    cache.set("a", "x" * 10)
+    cache.set("b", "x" * 10)
+    cache.get("a")
+    cache.set("c", "x" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+
+    assert not cache.set("huge", "x" * 31)
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["rejected"] == 1
+    assert stats["entries"] == 2
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(semantic_cache_service, "create_vector_provider", lambda settings: None)
+    monkeypatch.setattr(semantic_cache_service, "get_redis_cache", lambda settings: None)
+    clear_local_cache()
+    svc = SemanticCacheService(sql_guard=None)
+    yield svc
+    clear_local_cache()
+
+
+def test_memory_fallback_respects_ttl(service, clock):
+    asyncio.run(service._redis_set("k", {"v": 1}, ttl_seconds=5))
+    assert asyncio.run(service._redis_get("k")) == {"v": 1}
+
+    clock[0] += 6
+    assert asyncio.run(service._redis_get("k")) is None
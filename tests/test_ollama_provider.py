@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.core.config import get_settings
+from app.core.exceptions import AppException
+from app.providers.factory import create_llm_provider
+from app.providers.llm import http_client
+from app.providers.llm.ollama_provider import OllamaProvider, warm_up_ollama
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    """Local stand-in for the Ollama HTTP API."""
+    calls = []
+    state = {"models": ["llama3:latest"], "chunks": ["SELECT ", "1 ", "FROM dual"]}
+
+    def handler(request):
+        calls.append(request)
+        body = json.loads(request.content) if request.content else {}
+        if request.url.path == "/api/tags":
+            return httpx.Response(200, json={"models": [{"name": n} for n in state["models"]]})
+        if request.url.path == "/api/generate":
+            return httpx.Response(200, json={"model": body["model"], "response": "", "done": True})
+        if request.url.path == "/api/chat" and body.get("stream"):
+            lines = [
+                json.dumps({"message": {"role": "assistant", "content": c}, "done": False})
+                for c in state["chunks"]
+            ]
+            lines.append(json.dumps({"message": {"role": "assistant", "content": ""}, "done": True}))
+            return httpx.Response(200, content="\n".join(lines).encode())
+        if request.url.path == "/api/chat":
+            content = "".join(state["chunks"])
+            return httpx.Response(200, json={"message": {"role": "assistant", "content": content}, "done": True})
+        return httpx.Response(404, json={"error": "not found"})
+
+    monkeypatch.setattr(
+        http_client, "_build_http_client", lambda settings: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    asyncio.run(http_client.close_llm_clients())
+    yield calls, state
+    asyncio.run(http_client.close_llm_clients())
+
+
+def _settings(**overrides):
+    return get_settings().model_copy(
+        update={
+            "LLM_PROVIDER": "ollama",
+            "OLLAMA_BASE_URL": "http://ollama.local:11434/",
+            "OLLAMA_MODEL": "llama3",
+            "OLLAMA_KEEP_ALIVE": "30m",
+            "OLLAMA_WARMUP": True,
+            **overrides,
+        }
+    )
+
+
+def test_generate_sql_keeps_model_loaded(ollama):
+    calls, _ = ollama
+    provider = create_llm_provider(_settings())
+
+    assert isinstance(provider, OllamaProvider)
+    assert asyncio.run(provider.generate_sql("How many rows?", max_tokens=64)) == "SELECT 1 FROM dual"
+    assert str(calls[0].url) == "http://ollama.local:11434/api/chat"
+    body = json.loads(calls[0].content)
+    assert body["keep_alive"] == "30m" and body["stream"] is False
+    assert body["options"] == {"temperature": 0.0, "num_predict": 64}
+
+
+def test_stream_sql_yields_deltas(ollama):
+    provider = OllamaProvider(_settings())
+
+    async def collect():
+        return [delta async for delta in provider.stream_sql("How many rows?")]
+
+    assert asyncio.run(collect()) == ["SELECT ", "1 ", "FROM dual"]
+
+
+def test_warm_up_runs_only_when_ollama_is_used(ollama):
+    calls, _ = ollama
+
+    asyncio.run(warm_up_ollama(_settings(LLM_PROVIDER="groq")))
+    assert calls == []
+
+    asyncio.run(warm_up_ollama(_settings(LLM_PROVIDER="router", LLM_ROUTER_PROVIDERS=["groq", "ollama"])))
+    assert [c.url.path for c in calls] == ["/api/generate"]
+    assert json.loads(calls[0].content) == {"model": "llama3", "keep_alive": "30m"}
+
+
+def test_warm_up_normalises_provider_names(ollama):
+    calls, _ = ollama
+
+    asyncio.run(warm_up_ollama(_settings(LLM_PROVIDER="Ollama")))
+    asyncio.run(warm_up_ollama(_settings(LLM_PROVIDER=" Router", LLM_ROUTER_PROVIDERS=[" OLLAMA"])))
+
+    assert [c.url.path for c in calls] == ["/api/generate", "/api/generate"]
+
+
+def test_health_check_reports_latency_and_missing_model(ollama):
+    _, state = ollama
+    provider = OllamaProvider(_settings())
+
+    health = asyncio.run(provider.health_check())
+    assert health["status"] == "healthy" and isinstance(health["latency_ms"], int)
+
+    state["models"] = ["mistral:latest"]
+    health = asyncio.run(provider.health_check())
+    assert health["status"] == "unhealthy" and "not pulled" in health["error"]
+
+
+def test_errors_surface_as_app_exceptions(ollama):
+    provider = OllamaProvider(_settings(OLLAMA_MODEL="missing"))
+    provider.base_url += "/nope"
+
+    with pytest.raises(AppException):
+        asyncio.run(provider.generate_sql("q"))
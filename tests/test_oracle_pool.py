@@ -0,0 +1,184 @@
+import threading
+import time
+
+import pytest
+
+oracledb = pytest.importorskip("oracledb", reason="Oracle driver required")
+from app.core.config import Settings
+from app.core.exceptions import AppException
+from app.providers.database import oracle_provider
+from app.providers.database.oracle_provider import (
+    OracleProvider,
+    close_pools,
+    get_pool_stats,
+)
+
+
+class FakeCursor:
+    description = [("ID",), ("NAME",)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        self.sql = sql
+
+    def fetchall(self):
+        return [(1, "a"), (2, "b")]
+
+
+class FakeConnection:
+    def cursor(self):
+        return FakeCursor()
+
+    def close(self):
+        pass
+
+
+class FakePool:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.min = kwargs["min"]
+        self.max = kwargs["max"]
+        self.increment = kwargs["increment"]
+        self.opened = 0
+        self.busy = 0
+        self.released = 0
+
+    def acquire(self):
+        self.opened = max(self.opened, 1)
+        self.busy += 1
+        return FakeConnection()
+
+    def release(self, conn):
+        self.busy -= 1
+        self.released += 1
+
+    def close(self, force=False):
+        pass
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    created = []
+
+    def create_pool(**kwargs):
+        pool = FakePool(**kwargs)
+        created.append(pool)
+        return pool
+
+    monkeypatch.setattr(oracle_provider.oracledb, "create_pool", create_pool)
+    close_pools()
+    yield created
+    close_pools()
+
+
+def _settings(**overrides):
+    values = {
+        "ORACLE_CONNECTION_STRING": "scott/tiger@db.local:1521/XEPDB1",
+        "ORACLE_POOL_ENABLED": True,
+        "ORACLE_POOL_MIN": 2,
+        "ORACLE_POOL_MAX": 4,
+    }
+    values.update(overrides)
+    return Settings(**values)
+
+
+def test_providers_share_one_pool(fake_pool):
+    first = OracleProvider(_settings())
+    second = OracleProvider(_settings())
+
+    assert first.execute("SELECT 1 FROM DUAL") == [
+        {"ID": 1, "NAME": "a"},
+        {"ID": 2, "NAME": "b"},
+    ]
+    second.execute("SELECT 1 FROM DUAL")
+
+    assert len(fake_pool) == 1
+    pool = fake_pool[0]
+    assert pool.kwargs["min"] == 2
+    assert pool.kwargs["max"] == 4
+    assert pool.kwargs["getmode"] == oracledb.POOL_GETMODE_TIMEDWAIT
+    assert pool.released == 2
+    assert pool.busy == 0
+
+
+def test_pool_stats_report_usage(fake_pool):
+    provider = OracleProvider(_settings())
+    provider.execute("SELECT 1 FROM DUAL")
+
+    stats = get_pool_stats()
+    assert len(stats) == 1
+    assert stats[0]["acquires"] == 1
+    assert stats[0]["busy"] == 0
+    assert stats[0]["max"] == 4
+    assert "tiger" not in stats[0]["pool"]
+    assert provider.pool_stats()["acquires"] == 1
+
+
+def test_pooling_disabled_uses_dedicated_connection(fake_pool, monkeypatch):
+    opened = []
+
+    def connect(**kwargs):
+        opened.append(kwargs)
+        return FakeConnection()
+
+    monkeypatch.setattr(oracle_provider.oracledb, "connect", connect)
+    provider = OracleProvider(_settings(ORACLE_POOL_ENABLED=False))
+    provider.execute("SELECT 1 FROM DUAL")
+
+    assert len(opened) == 1
+    assert fake_pool == []
+    assert provider.pool_stats() is None
+
+
+def _pool_error(code):
+    from oracledb import errors
+
+    return oracledb.DatabaseError(errors._create_err(code))
+
+
+def test_only_timed_wait_expiry_counts_as_timeout(fake_pool):
+    from oracledb import errors
+
+    provider = OracleProvider(_settings())
+    provider.execute("SELECT 1 FROM DUAL")
+    pool = fake_pool[0]
+
+    for code in (errors.ERR_POOL_NO_CONNECTION_AVAILABLE, errors.ERR_POOL_NOT_OPEN):
+        def acquire(code=code):
+            raise _pool_error(code)
+
+        pool.acquire = acquire
+        with pytest.raises(AppException):
+            provider.execute("SELECT 1 FROM DUAL")
+
+    assert provider.pool_stats()["acquire_timeouts"] == 1
+
+
+def test_pool_creation_does_not_hold_global_lock(fake_pool, monkeypatch):
+    fast = OracleProvider(_settings())
+    fast.execute("SELECT 1 FROM DUAL")
+    slow = OracleProvider(_settings(ORACLE_CONNECTION_STRING="hr/hr@other.local:1521/XEPDB1"))
+    started = threading.Event()
+
+    def create_pool(**kwargs):
+        started.set()
+        time.sleep(0.5)
+        return FakePool(**kwargs)
+
+    monkeypatch.setattr(oracle_provider.oracledb, "create_pool", create_pool)
+    creator = threading.Thread(target=slow.execute, args=("SELECT 1 FROM DUAL",))
+    creator.start()
+    assert started.wait(1)
+
+    began = time.monotonic()
+    assert len(get_pool_stats()) == 1
+    fast.execute("SELECT 1 FROM DUAL")
+    assert time.monotonic() - began < 0.25
+
+    creator.join()
+    assert len(get_pool_stats()) == 2
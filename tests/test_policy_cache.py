@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import Settings
+from app.services import schema_policy_service
+from app.utils.compiled_policy import clear_compiled_policies, compile_policy
+from app.utils.sql_guard import SQLGuard, SQLGuardViolation
+
+
+def _policy(**overrides):
+    values = {
+        "id": "p-1",
+        "version": 3,
+        "status": "active",
+        "schema_name": "hr",
+        "allowed_tables": ["employees", "DEPARTMENTS"],
+        "allowed_columns": {"employees": ["id", "Name"]},
+        "denied_tables": ["payroll"],
+        "excluded_tables": ["AUDIT"],
+        "excluded_columns": {"DEPARTMENTS": ["budget"]},
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture(autouse=True)
+def _reset_caches():
+    clear_compiled_policies()
+    schema_policy_service.invalidate_active_policy()
+    yield
+    clear_compiled_policies()
+    schema_policy_service.invalidate_active_policy()
+
+
+def test_compiled_policy_is_case_insensitive():
+    compiled = compile_policy(_policy())
+
+    assert compiled.allowed_tables == frozenset({"EMPLOYEES", "DEPARTMENTS"})
+    assert compiled.denied_tables == frozenset({"PAYROLL", "AUDIT"})
+    assert compiled.table_allowed("employees")
+    assert not compiled.table_allowed("PAYROLL")
+    assert not compiled.table_allowed("LOCATIONS")
+    assert compiled.column_allowed("EMPLOYEES", "NAME")
+    assert not compiled.column_allowed("EMPLOYEES", "SALARY")
+    assert not compiled.column_allowed("DEPARTMENTS", "BUDGET")
+    assert compiled.column_allowed("DEPARTMENTS", "NAME")
+
+
+def test_active_policy_compiled_once_per_version():
+    first = compile_policy(_policy())
+    assert compile_policy(_policy()) is first
+    assert compile_policy(_policy(version=4)) is not first
+    assert compile_policy(_policy(status="draft")) is not compile_policy(_policy(status="draft"))
+
+
+def test_sql_guard_uses_compiled_policy():
+    guard = SQLGuard(Settings())
+    policy = _policy()
+
+    guard.validate_and_normalise("SELECT e.id FROM employees e", policy=policy)
+    with pytest.raises(SQLGuardViolation):
+        guard.validate_and_normalise("SELECT p.amount FROM payroll p", policy=policy)
+    with pytest.raises(SQLGuardViolation):
+        guard.validate_and_normalise("SELECT employees.salary FROM employees", policy=policy)
+
+
+def test_active_policy_cached_until_invalidated(monkeypatch):
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return _policy(version=len(loads))
+
+    monkeypatch.setattr(schema_policy_service, "_load_active_policy", loader)
+    service = schema_policy_service.SchemaPolicyService()
+
+    assert service.get_active().version == 1
+    assert service.get_active().version == 1
+    assert service.get_active_compiled().version == 1
+    assert len(loads) == 1
+
+    schema_policy_service.invalidate_active_policy()
+    assert service.get_active().version == 2
+    assert len(loads) == 2
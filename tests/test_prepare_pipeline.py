@@ -0,0 +1,244 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from opentelemetry import trace
+
+from app.services.orchestration_service import OrchestrationService
+
+POLICY = SimpleNamespace(
+    id="p-1",
+    version=1,
+    status="active",
+    schema_name="HR",
+    allowed_tables=["EMPLOYEES"],
+    allowed_columns={},
+    denied_tables=[],
+    excluded_tables=[],
+    excluded_columns={},
+)
+
+
+class _Vector:
+    def __init__(self):
+        self.embedded = []
+        self.delay = 0.0
+
+    def embed(self, texts):
+        time.sleep(self.delay)
+        self.embedded.extend(texts)
+        return [[0.1, 0.2, 0.3] for _ in texts]
+
+
+class _Vanna:
+    def __init__(self):
+        self.vector = _Vector()
+        self.settings = SimpleNamespace(
+            ENABLE_SEMANTIC_CACHE=True,
+            RLS_ENABLED=False,
+            LLM_PROVIDER="openai",
+            OPENAI_MODEL="gpt",
+            ENABLE_REQUEST_COALESCING=True,
+        )
+        self.embeddings = []
+        self.contexts = []
+        self.rag_delay = 0.0
+        self.rag_cancelled = False
+        self.generate_delay = 0.0
+
+    async def retrieve_context(self, question, embedding=None):
+        self.embeddings.append(embedding)
+        try:
+            await asyncio.sleep(self.rag_delay)
+        except asyncio.CancelledError:
+            self.rag_cancelled = True
+            raise
+        return ["HR.EMPLOYEES: CREATE TABLE employees (id NUMBER)"]
+
+    async def generate_sql(self, question, embedding=None, context=None, on_progress=None):
+        self.contexts.append(context)
+        await asyncio.sleep(self.generate_delay)
+        return "SELECT id FROM employees"
+
+    def referenced_tables(self, sql):
+        return [("", "EMPLOYEES")]
+
+
+class _Cache:
+    def __init__(self):
+        self.embeddings = []
+        self.hit_sql = None
+        self.exact_hit = False
+
+    async def lookup(self, **kwargs):
+        if self.exact_hit:
+            return True, self.hit_sql, 1.0, "passed"
+        self.embeddings.append(await kwargs["embedding"]())
+        if self.hit_sql:
+            return True, self.hit_sql, 1.0, "passed"
+        return False, None, 0.0, "miss"
+
+    async def store(self, **kwargs):
+        self.embeddings.append(kwargs["embedding"])
+
+
+def _service():
+    service = OrchestrationService.__new__(OrchestrationService)
+    service.vanna_service = _Vanna()
+    service.cache_service = _Cache()
+    service.policy_service = SimpleNamespace(get_active=lambda: POLICY)
+    service.arabic_engine = SimpleNamespace(_is_arabic=lambda text: False)
+    service.sql_guard = SimpleNamespace(validate_and_normalise=lambda sql, policy=None: sql)
+    service.tracer = trace.get_tracer(__name__)
+    return service
+
+
+def test_question_embedded_once_and_shared():
+    service = _service()
+
+    result = asyncio.run(service.prepare(question="How many employees?", user_context={"role": "admin"}))
+
+    assert result["is_safe"]
+    assert service.vanna_service.vector.embedded == ["How many employees?"]
+    expected = [0.1, 0.2, 0.3]
+    assert service.cache_service.embeddings == [expected, expected]
+    assert service.vanna_service.embeddings == [expected]
+    assert service.vanna_service.contexts == [["HR.EMPLOYEES: CREATE TABLE employees (id NUMBER)"]]
+
+
+def test_embedding_failure_falls_back_to_text_queries():
+    service = _service()
+
+    def broken(texts):
+        raise RuntimeError("model unavailable")
+
+    service.vanna_service.vector.embed = broken
+    result = asyncio.run(service.prepare(question="How many employees?", user_context={"role": "admin"}))
+
+    assert result["is_safe"]
+    assert service.vanna_service.embeddings == [None]
+
+
+def test_policy_fetch_overlaps_rag_retrieval():
+    service = _service()
+    service.vanna_service.rag_delay = 0.2
+
+    def slow_policy():
+        time.sleep(0.2)
+        return POLICY
+
+    service.policy_service = SimpleNamespace(get_active=slow_policy)
+    started = time.perf_counter()
+    result = asyncio.run(service.prepare(question="How many employees?", user_context={"role": "admin"}))
+    elapsed = time.perf_counter() - started
+
+    assert result["is_safe"]
+    assert elapsed < 0.35
+
+
+def test_cache_hit_cancels_speculative_rag():
+    service = _service()
+    service.vanna_service.rag_delay = 5
+    service.cache_service.hit_sql = "SELECT id FROM employees"
+
+    result = asyncio.run(service.prepare(question="How many employees?", user_context={"role": "admin"}))
+
+    assert result["cache_hit"]
+    assert service.vanna_service.rag_cancelled
+    assert service.vanna_service.contexts == []
+
+
+def test_exact_hit_does_not_wait_for_embedding():
+    service = _service()
+    service.vanna_service.vector.delay = 0.3
+    service.cache_service.hit_sql = "SELECT id FROM employees"
+    service.cache_service.exact_hit = True
+
+    async def run():
+        started = time.perf_counter()
+        result = await service.prepare(question="How many employees?", user_context={"role": "admin"})
+        return result, time.perf_counter() - started
+
+    result, elapsed = asyncio.run(run())
+
+    assert result["cache_hit"]
+    assert elapsed < 0.2
+    assert service.vanna_service.embeddings == []
+    assert service.vanna_service.contexts == []
+
+
+def test_stage_timings_recorded(monkeypatch):
+    service = _service()
+    recorded = {}
+    monkeypatch.setattr(service, "_record_timings", recorded.update)
+
+    asyncio.run(service.prepare(question="How many employees?", user_context={"role": "admin"}))
+
+    assert {"policy", "embed", "rag", "cache", "generate"} <= set(recorded)
+
+
+def _gather(service, *requests):
+    async def run():
+        tasks = [
+            asyncio.create_task(service.prepare(question=question, user_context=user))
+            for question, user in requests
+        ]
+        return await asyncio.gather(*tasks)
+
+    return asyncio.run(run())
+
+
+def test_concurrent_duplicates_share_one_generation():
+    service = _service()
+    service.vanna_service.generate_delay = 0.05
+    admin = {"role": "admin"}
+
+    results = _gather(
+        service,
+        ("How many employees?", admin),
+        ("how many  employees", admin),
+        ("HOW MANY EMPLOYEES?", admin),
+    )
+
+    assert len(service.vanna_service.contexts) == 1
+    assert [r["coalesced"] for r in results] == [False, True, True]
+    assert {r["sql"] for r in results} == {"SELECT id FROM employees"}
+    assert [r["original_question"] for r in results] == [
+        "How many employees?",
+        "how many  employees",
+        "HOW MANY EMPLOYEES?",
+    ]
+
+
+def test_different_scopes_are_not_coalesced():
+    service = _service()
+    service.vanna_service.generate_delay = 0.05
+
+    results = _gather(
+        service,
+        ("How many employees?", {"role": "admin"}),
+        ("How many employees?", {"role": "analyst"}),
+    )
+
+    assert len(service.vanna_service.contexts) == 2
+    assert not any(r["coalesced"] for r in results)
+
+
+def test_cancelled_leader_does_not_fail_followers():
+    service = _service()
+    service.vanna_service.rag_delay = 0.05
+    service.vanna_service.generate_delay = 0.05
+    admin = {"role": "admin"}
+
+    async def run():
+        leader = asyncio.create_task(service.prepare(question="How many employees?", user_context=admin))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(service.prepare(question="How many employees?", user_context=admin))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    result = asyncio.run(run())
+
+    assert result["is_safe"] and result["coalesced"]
+    assert service.vanna_service.contexts == [["HR.EMPLOYEES: CREATE TABLE employees (id NUMBER)"]]
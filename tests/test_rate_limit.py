@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import apply_runtime_toggle, clear_runtime_toggles, get_settings
+from app.middleware import rate_limit
+from app.middleware.rate_limit import InMemoryRateLimiter, RateLimitMiddleware, RedisRateLimiter
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiter():
+    yield
+    rate_limit.reset_rate_limiters()
+
+
+def test_sliding_window_counts_previous_window_by_overlap():
+    limiter = InMemoryRateLimiter(limit=4, window_seconds=60)
+    for _ in range(4):
+        assert limiter.hit("k", now=10).allowed
+
+    denied = limiter.hit("k", now=20)
+    assert not denied.allowed
+    assert denied.retry_after == 40 + 60 * (1 - 3 / 4)
+
+    # 30s into the next window half of the previous 4 requests still count.
+    decision = limiter.hit("k", now=90)
+    assert decision.allowed and decision.remaining == 1
+    assert limiter.hit("k", now=90).allowed
+    assert not limiter.hit("k", now=90).allowed
+    assert limiter.hit("k", now=200).allowed
+
+
+def test_idle_keys_are_evicted_and_key_count_is_bounded():
+    limiter = InMemoryRateLimiter(limit=10, window_seconds=60, max_keys=3)
+    for i in range(3):
+        limiter.hit(f"ip:{i}", now=0)
+    limiter.hit("ip:3", now=1)
+    assert limiter.stats()["keys"] == 3
+
+    limiter.hit("ip:4", now=200)
+    assert limiter.stats()["keys"] == 1
+
+
+def _app(**overrides):
+    settings = get_settings().model_copy(
+        update={
+            "RATE_LIMIT_REQUESTS_PER_MINUTE": 2,
+            "RATE_LIMIT_SCOPE": "user",
+            "RATE_LIMIT_BACKEND": "memory",
+            **overrides,
+        }
+    )
+    rate_limit.reset_rate_limiters()
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, settings=settings)
+
+    @app.get("/api/v1/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/api/v1/health")
+    async def health():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_middleware_returns_429_with_retry_after():
+    client = _app()
+
+    first = client.get("/api/v1/ping")
+    assert first.status_code == 200
+    assert first.headers["X-RateLimit-Limit"] == "2" and first.headers["X-RateLimit-Remaining"] == "1"
+    client.get("/api/v1/ping")
+
+    denied = client.get("/api/v1/ping")
+    assert denied.status_code == 429
+    assert int(denied.headers["Retry-After"]) >= 1
+    assert all(client.get("/api/v1/health").status_code == 200 for _ in range(5))
+
+
+def test_user_scope_keys_by_token_subject(monkeypatch):
+    monkeypatch.setattr("app.core.security.decode_access_token", lambda token: {"sub": token})
+    client = _app()
+    alice = {"Authorization": "Bearer alice"}
+    bob = {"Authorization": "Bearer bob"}
+
+    assert [client.get("/api/v1/ping", headers=alice).status_code for _ in range(3)] == [200, 200, 429]
+    assert client.get("/api/v1/ping", headers=bob).status_code == 200
+
+
+def test_enable_rate_limit_is_read_per_request():
+    rate_limit.reset_rate_limiters()
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware)
+
+    @app.get("/api/v1/ping")
+    async def ping():
+        return {"ok": True}
+
+    client = TestClient(app)
+    try:
+        apply_runtime_toggle("ENABLE_RATE_LIMIT", False)
+        assert "X-RateLimit-Limit" not in client.get("/api/v1/ping").headers
+        apply_runtime_toggle("ENABLE_RATE_LIMIT", True)
+        assert "X-RateLimit-Limit" in client.get("/api/v1/ping").headers
+    finally:
+        clear_runtime_toggles()
+
+
+class _FakeScriptRedis:
+    def __init__(self, result=None, down=False):
+        self.result = result
+        self.down = down
+        self.calls = []
+
+    def register_script(self, source):
+        async def script(keys, args, client):
+            if self.down:
+                raise ConnectionError("redis down")
+            self.calls.append((keys, args))
+            return self.result
+
+        return script
+
+
+def test_redis_backend_runs_script_and_falls_back_locally():
+    from app.providers.cache.redis_provider import AsyncRedisCache
+
+    redis = _FakeScriptRedis(result=[0, 0, 1500])
+    limiter = RedisRateLimiter(AsyncRedisCache(redis, timeout=1), 5, InMemoryRateLimiter(5))
+
+    decision = asyncio.run(limiter.hit("user:alice"))
+    assert not decision.allowed and decision.retry_after == 1.5
+    assert redis.calls == [(["ratelimit:{user:alice}"], [5, 60000])]
+
+    redis.down = True
+    assert asyncio.run(limiter.hit("user:alice")).allowed
@@ -0,0 +1,151 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.exceptions import ServiceUnavailableError
+from app.providers.cache.redis_provider import AsyncRedisCache
+from app.services import semantic_cache_service
+from app.services.semantic_cache_service import SemanticCacheService, clear_local_cache
+
+
+class FakeRedis:
+    """In-memory stand-in for `redis.asyncio.Redis`."""
+
+    def __init__(self):
+        self.data = {}
+        self.calls = []
+        self.down = False
+
+    async def get(self, key):
+        self._call("get")
+        return self.data.get(key)
+
+    async def delete(self, *keys):
+        self._call("delete")
+        for key in keys:
+            self.data.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def _call(self, name):
+        if self.down:
+            raise ConnectionError("redis down")
+        self.calls.append(name)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def set(self, key, value, ex=None):
+        self.ops.append((key, value))
+
+    async def execute(self):
+        self.redis._call("pipeline")
+        self.redis.data.update(self.ops)
+        return [True] * len(self.ops)
+
+
+class _Collection:
+    def query(self, query_texts, n_results, where=None):
+        return {"metadatas": [[]], "distances": [[]]}
+
+    def add(self, **kwargs):
+        pass
+
+
+class _Guard:
+    def validate_and_normalise(self, sql, policy=None):
+        return sql
+
+
+@pytest.fixture
+def fake():
+    return FakeRedis()
+
+
+@pytest.fixture
+def service(monkeypatch, fake):
+    backend = AsyncRedisCache(fake, timeout=0.5, max_failures=2, reset_seconds=60)
+    vector = SimpleNamespace(client=SimpleNamespace(get_or_create_collection=lambda name: _Collection()))
+    monkeypatch.setattr(semantic_cache_service, "create_vector_provider", lambda settings: vector)
+    monkeypatch.setattr(semantic_cache_service, "get_redis_cache", lambda settings: backend)
+    clear_local_cache()
+    svc = SemanticCacheService(_Guard())
+    svc.enabled = True
+    svc.near_ttl = 0
+    yield svc
+    clear_local_cache()
+
+
+POLICY = SimpleNamespace(id="p", version=1, status="active", schema_name="HR")
+
+
+def test_store_pipelines_entry_and_index(service, fake):
+    asyncio.run(service.store("How many employees?", "SELECT 1 FROM dual", POLICY, "openai", "gpt", "admin"))
+
+    assert fake.calls == ["pipeline"]
+    assert len(fake.data) == 2
+    hit = asyncio.run(service.lookup("how many employees", POLICY, "openai", "gpt", "admin"))
+    assert hit[:2] == (True, "SELECT 1 FROM dual")
+
+
+def test_near_cache_avoids_redis_round_trip(service, fake):
+    service.near_ttl = 10
+    fake.data["k"] = '{"v": 1}'
+
+    assert asyncio.run(service._redis_get("k")) == {"v": 1}
+    assert asyncio.run(service._redis_get("k")) == {"v": 1}
+    assert fake.calls == ["get"]
+
+    asyncio.run(service._redis_delete("k"))
+    assert asyncio.run(service._redis_get("k")) is None
+
+
+def test_outage_degrades_to_local_cache_and_opens_circuit(service, fake):
+    fake.down = True
+
+    asyncio.run(service._redis_set("k", {"v": 1}))
+    assert asyncio.run(service._redis_get("k")) == {"v": 1}
+    assert service.redis.stats()["circuit_open"]
+
+    fake.down = False
+    with pytest.raises(ServiceUnavailableError):
+        asyncio.run(service.redis.get("k"))
+    assert asyncio.run(service._redis_get("k")) == {"v": 1}
+    assert fake.calls == []
+
+
+def test_slow_redis_times_out():
+    class Slow(FakeRedis):
+        async def get(self, key):
+            await asyncio.sleep(1)
+
+    backend = AsyncRedisCache(Slow(), timeout=0.01)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(backend.get("k"))
+    assert backend.breaker.failure_count == 1
+
+
+def test_pool_exhaustion_does_not_open_circuit():
+    from redis.exceptions import MaxConnectionsError
+
+    from app.providers.cache.redis_provider import _BlockingPool
+
+    pool = _BlockingPool(max_connections=1, timeout=0.01)
+    pool._in_use_connections.add(object())
+    with pytest.raises(MaxConnectionsError):
+        asyncio.run(pool.get_connection())
+
+    class Exhausted(FakeRedis):
+        async def get(self, key):
+            raise MaxConnectionsError("Redis connection pool exhausted")
+
+    backend = AsyncRedisCache(Exhausted(), timeout=0.5, max_failures=1)
+    for _ in range(3):
+        with pytest.raises(MaxConnectionsError):
+            asyncio.run(backend.get("k"))
+    assert backend.breaker.failure_count == 0 and not backend.stats()["circuit_open"]
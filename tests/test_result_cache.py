@@ -0,0 +1,177 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import memory_cache
+from app.services.orchestration_service import OrchestrationService
+from app.services.result_cache import ResultCache, clear_result_cache, result_cache_key
+
+
+class _FakeVanna:
+    def __init__(self, rows, batch_size=2):
+        self.rows = rows
+        self.settings = SimpleNamespace(
+            ENABLE_SEMANTIC_CACHE=True,
+            SEMANTIC_CACHE_STORE_RESULTS=True,
+            RLS_ENABLED=True,
+            STREAM_CHUNK_ROWS=batch_size,
+            ENABLE_REQUEST_COALESCING=True,
+        )
+        self.executions = 0
+        self.delay = 0.0
+
+    async def execute(self, sql):
+        self.executions += 1
+        await asyncio.sleep(self.delay)
+        return list(self.rows)
+
+    async def stream(self, sql, batch_size, columnar=False):
+        self.executions += 1
+        for offset in range(0, len(self.rows), batch_size):
+            yield self.rows[offset:offset + batch_size]
+
+
+def _orchestrator(rows):
+    service = OrchestrationService.__new__(OrchestrationService)
+    service.vanna_service = _FakeVanna(rows)
+    return service
+
+
+VIEW = {"sql": "SELECT id FROM employees", "is_safe": True, "schema_version": "HR", "policy_version": 2}
+USER = {"role": "analyst", "data_scope": {"tenant_id": "t1"}}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    cache = ResultCache(ttl_seconds=60, max_rows=10, max_entry_bytes=10_000, max_bytes=10_000)
+    monkeypatch.setattr("app.services.orchestration_service.get_result_cache", lambda: cache)
+    yield
+    clear_result_cache()
+
+
+async def _collect(service, key):
+    return [batch async for batch in service.stream_rows(VIEW["sql"], cache_key=key)]
+
+
+def test_repeated_stream_served_from_cache():
+    service = _orchestrator([{"ID": i} for i in range(5)])
+    key = service.result_cache_key(VIEW, USER, "rows")
+
+    first = asyncio.run(_collect(service, key))
+    second = asyncio.run(_collect(service, key))
+
+    assert first == second
+    assert len(first) == 3
+    assert service.vanna_service.executions == 1
+
+
+def test_execute_path_uses_cache():
+    service = _orchestrator([{"ID": 1}])
+    key = service.result_cache_key(VIEW, USER, "rows")
+
+    asyncio.run(service.execute_sql(VIEW["sql"], cache_key=key))
+    cached = asyncio.run(service.execute_sql(VIEW["sql"], cache_key=key))
+
+    assert service.normalise_rows(cached) == [{"ID": 1}]
+    assert service.vanna_service.executions == 1
+
+
+def test_stream_replays_rows_cached_by_execute():
+    # /chat/stream caches through execute_sql, /ask replays through stream_rows.
+    service = _orchestrator([{"ID": i} for i in range(5)])
+    key = service.result_cache_key(VIEW, USER, "rows")
+
+    asyncio.run(service.execute_sql(VIEW["sql"], cache_key=key))
+    replayed = asyncio.run(_collect(service, key))
+
+    assert replayed == [[{"ID": 0}, {"ID": 1}], [{"ID": 2}, {"ID": 3}], [{"ID": 4}]]
+    assert service.vanna_service.executions == 1
+
+
+def test_execute_reads_rows_cached_by_stream():
+    service = _orchestrator([{"ID": i} for i in range(5)])
+    key = service.result_cache_key(VIEW, USER, "rows")
+
+    asyncio.run(_collect(service, key))
+    cached = asyncio.run(service.execute_sql(VIEW["sql"], cache_key=key))
+
+    assert service.normalise_rows(cached) == [{"ID": i} for i in range(5)]
+    assert service.vanna_service.executions == 1
+
+
+def test_columnar_types_survive_cached_rows():
+    service = _orchestrator([{"AMOUNT": Decimal("1.5"), "HIRED": datetime(2024, 1, 2)}])
+    key = service.result_cache_key(VIEW, USER, "rows")
+
+    fresh = service.to_columnar(asyncio.run(service.execute_sql(VIEW["sql"], cache_key=key)))
+    cached = service.to_columnar(asyncio.run(service.execute_sql(VIEW["sql"], cache_key=key)))
+
+    assert fresh == cached
+    assert fresh["types"] == ["number", "datetime"]
+    assert fresh["data"] == [[1.5], ["2024-01-02T00:00:00"]]
+    assert service.vanna_service.executions == 1
+
+
+def test_concurrent_misses_share_one_execution():
+    service = _orchestrator([{"ID": 1}])
+    service.vanna_service.delay = 0.02
+    key = service.result_cache_key(VIEW, USER, "rows")
+
+    async def burst():
+        return await asyncio.gather(*(service.execute_sql(VIEW["sql"], cache_key=key) for _ in range(5)))
+
+    results = asyncio.run(burst())
+
+    assert service.vanna_service.executions == 1
+    assert all(service.normalise_rows(r) == [{"ID": 1}] for r in results)
+
+
+def test_results_over_row_cap_are_not_cached():
+    service = _orchestrator([{"ID": i} for i in range(11)])
+    key = service.result_cache_key(VIEW, USER, "rows")
+
+    asyncio.run(_collect(service, key))
+    asyncio.run(_collect(service, key))
+
+    assert service.vanna_service.executions == 2
+
+
+def test_key_is_scoped_by_tenant_policy_and_sql():
+    service = _orchestrator([])
+    base = service.result_cache_key(VIEW, USER, "rows")
+
+    assert base != service.result_cache_key(VIEW, {"data_scope": {"tenant_id": "t2"}}, "rows")
+    assert base != service.result_cache_key({**VIEW, "policy_version": 3}, USER, "rows")
+    assert base != service.result_cache_key({**VIEW, "sql": "SELECT 1 FROM dual"}, USER, "rows")
+    assert base != service.result_cache_key(VIEW, USER, "columnar")
+    assert service.result_cache_key({**VIEW, "is_safe": False}, USER, "rows") is None
+
+    service.vanna_service.settings.SEMANTIC_CACHE_STORE_RESULTS = False
+    assert service.result_cache_key(VIEW, USER, "rows") is None
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache = ResultCache(ttl_seconds=60, max_rows=10, max_entry_bytes=100, max_bytes=250)
+    for name in ("a", "b", "c"):
+        assert cache.put(name, ["x" * 90], rows=1)
+    assert cache.get("a") is None
+    assert cache.get("c") == ["x" * 90]
+    assert not cache.put("big", ["x" * 200], rows=1)
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["rejected"] == 1
+    assert stats["bytes"] <= 250
+
+
+def test_expired_entries_miss(monkeypatch):
+    cache = ResultCache(ttl_seconds=10, max_rows=10, max_entry_bytes=100, max_bytes=1000)
+    now = [100.0]
+    monkeypatch.setattr(memory_cache.time, "monotonic", lambda: now[0])
+    key = result_cache_key("SELECT 1", schema_version="HR", policy_version=1, data_scope={}, shape="rows")
+    cache.put(key, [1], rows=1)
+    now[0] += 11
+    assert cache.get(key) is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,169 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+oracledb = pytest.importorskip("oracledb", reason="Oracle driver required")
+from app.core.config import Settings
+from app.providers.base import BaseDatabaseProvider
+from app.providers.database import oracle_provider
+from app.providers.database.oracle_provider import OracleProvider
+
+
+class BatchCursor:
+    description = [("ID",)]
+
+    def __init__(self, total):
+        self.remaining = list(range(total))
+        self.fetch_sizes = []
+        self.arraysize = 100
+        self.prefetchrows = 2
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        pass
+
+    def fetchall(self):
+        raise AssertionError("streaming must not call fetchall")
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        batch, self.remaining = self.remaining[:size], self.remaining[size:]
+        return [(i,) for i in batch]
+
+
+class BatchConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.closed = False
+
+    def cursor(self):
+        return self._cursor
+
+    def close(self):
+        self.closed = True
+
+
+def _provider(monkeypatch, cursor):
+    conn = BatchConnection(cursor)
+    monkeypatch.setattr(oracle_provider.oracledb, "connect", lambda **kw: conn)
+    settings = Settings(
+        ORACLE_CONNECTION_STRING="scott/tiger@db.local:1521/XEPDB1",
+        ORACLE_POOL_ENABLED=False,
+    )
+    return OracleProvider(settings), conn
+
+
+def test_oracle_iter_batches_uses_fetchmany(monkeypatch):
+    cursor = BatchCursor(total=7)
+    provider, conn = _provider(monkeypatch, cursor)
+
+    batches = list(provider.iter_batches("SELECT ID FROM T", batch_size=3))
+
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert batches[0][0] == {"ID": 0}
+    assert cursor.arraysize == 3
+    assert cursor.fetch_sizes == [3, 3, 3, 3]
+    assert conn.closed
+
+
+def test_stream_async_yields_ordered_batches_and_releases_session(monkeypatch):
+    cursor = BatchCursor(total=5)
+    provider, conn = _provider(monkeypatch, cursor)
+
+    async def consume():
+        out = []
+        async for batch in provider.stream_async("SELECT ID FROM T", batch_size=2):
+            out.append([row["ID"] for row in batch])
+        return out
+
+    assert asyncio.run(consume()) == [[0, 1], [2, 3], [4]]
+    assert conn.closed
+
+
+def test_stream_async_stops_fetching_when_consumer_stops(monkeypatch):
+    cursor = BatchCursor(total=10)
+    provider, conn = _provider(monkeypatch, cursor)
+
+    async def consume_first():
+        stream = provider.stream_async("SELECT ID FROM T", batch_size=2)
+        first = await stream.__anext__()
+        await stream.aclose()
+        return first
+
+    assert len(asyncio.run(consume_first())) == 2
+    assert cursor.fetch_sizes == [2]
+    assert conn.closed
+
+
+def test_default_iter_batches_slices_execute_result():
+    class ListProvider(BaseDatabaseProvider):
+        def connect(self):
+            return None
+
+        def execute(self, sql, parameters=None):
+            return [{"N": i} for i in range(5)]
+
+    batches = list(ListProvider().iter_batches("SELECT 1", batch_size=2))
+    assert [len(b) for b in batches] == [2, 2, 1]
+
+
+def test_default_columnar_types_fixed_once_per_stream():
+    class ListProvider(BaseDatabaseProvider):
+        def connect(self):
+            return None
+
+        def execute(self, sql, parameters=None):
+            return [
+                {"N": Decimal("1.5"), "D": None},
+                {"N": 2, "D": datetime(2024, 1, 1)},
+            ]
+
+    batches = list(ListProvider().iter_columnar_batches("SELECT 1", batch_size=1))
+
+    assert [b["types"] for b in batches] == [["number", "unknown"], ["number", "unknown"]]
+
+
+def test_oracle_columnar_batches_transpose_cursor_rows(monkeypatch):
+    class LabelCursor(BatchCursor):
+        description = [
+            ("ID", oracledb.DB_TYPE_NUMBER),
+            ("LABEL", oracledb.DB_TYPE_VARCHAR),
+        ]
+
+        def fetchmany(self, size):
+            return [(i + 1, chr(ord("a") + i)) for (i,) in super().fetchmany(size)]
+
+    provider, _ = _provider(monkeypatch, LabelCursor(total=2))
+
+    batches = list(provider.iter_columnar_batches("SELECT ID, LABEL FROM T", batch_size=2))
+
+    assert batches == [
+        {
+            "columns": ["ID", "LABEL"],
+            "types": ["number", "string"],
+            "data": [[1, 2], ["a", "b"]],
+        }
+    ]
+
+
+def test_stream_async_columnar_uses_columnar_source(monkeypatch):
+    cursor = BatchCursor(total=3)
+    provider, _ = _provider(monkeypatch, cursor)
+
+    async def consume():
+        return [
+            batch
+            async for batch in provider.stream_async(
+                "SELECT ID FROM T", batch_size=2, columnar=True
+            )
+        ]
+
+    batches = asyncio.run(consume())
+    assert [b["data"] for b in batches] == [[[0, 1]], [[2]]]
@@ -0,0 +1,143 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from opentelemetry import trace
+
+from app.api import dependencies
+from app.api.v1 import query
+from app.api.v1.admin import settings as admin_settings
+from app.core.config import clear_runtime_toggles, get_settings
+from app.core.tier_router import OperationTier
+from app.services.orchestration_service import OrchestrationService
+from app.services.semantic_cache_service import SemanticCacheService
+from app.services.vanna_service import VannaService
+
+ADMIN = {
+    "user_id": "admin-1",
+    "role": "admin",
+    "permissions": ["admin:*", "query:*"],
+    "data_scope": {},
+    "is_authenticated": True,
+}
+POLICY = SimpleNamespace(
+    id="p-1",
+    version=1,
+    status="active",
+    schema_name="HR",
+    allowed_tables=["EMPLOYEES"],
+    allowed_columns={},
+    denied_tables=[],
+    excluded_tables=[],
+    excluded_columns={},
+)
+
+
+class _Vanna(VannaService):
+    """Live settings from VannaService; fake LLM, RAG and vector store."""
+
+    def __init__(self):
+        self.vector = SimpleNamespace(embed=lambda texts: [[0.1, 0.2] for _ in texts])
+
+    async def retrieve_context(self, question, embedding=None):
+        return []
+
+    async def generate_sql(self, question, embedding=None, context=None, on_progress=None):
+        return "SELECT id FROM employees"
+
+    def referenced_tables(self, sql):
+        return [("", "EMPLOYEES")]
+
+
+class _Cache:
+    def __init__(self):
+        self.lookups = 0
+
+    async def lookup(self, **kwargs):
+        self.lookups += 1
+        return False, None, 0.0, "miss"
+
+    async def store(self, **kwargs):
+        pass
+
+
+def _orchestration():
+    service = OrchestrationService.__new__(OrchestrationService)
+    service.vanna_service = _Vanna()
+    service.cache_service = _Cache()
+    service.policy_service = SimpleNamespace(get_active=lambda: POLICY)
+    service.arabic_engine = SimpleNamespace(_is_arabic=lambda text: False)
+    service.sql_guard = SimpleNamespace(validate_and_normalise=lambda sql, policy=None: sql)
+    service.tracer = trace.get_tracer(__name__)
+    service.execute_sql = lambda sql, cache_key=None: asyncio.sleep(0, result=[{"ID": 1}])
+
+    async def stream_rows(sql, result_format="rows", cache_key=None):
+        yield {"rows": [{"ID": 1}]}
+
+    service.stream_rows = stream_rows
+    return service
+
+
+@pytest.fixture
+def client(monkeypatch):
+    service = _orchestration()
+    audit = SimpleNamespace(log=lambda **kwargs: None)
+    monkeypatch.setattr(query.tier_router, "tier", OperationTier.FORTRESS)
+    monkeypatch.setattr(query.tier_router, "_fortress", service)
+    monkeypatch.setattr(query, "audit_service", audit)
+    monkeypatch.setattr(admin_settings, "audit_service", audit)
+
+    app = FastAPI()
+    app.include_router(query.router, prefix="/api/v1")
+    app.include_router(admin_settings.router, prefix="/api/v1")
+
+    async def admin_user():
+        return dict(ADMIN)
+
+    app.dependency_overrides[dependencies.optional_auth] = admin_user
+    clear_runtime_toggles()
+    yield TestClient(app), service
+    clear_runtime_toggles()
+
+
+def _toggle(client, value):
+    response = client.post(
+        "/api/v1/admin/settings/feature-toggle",
+        json={"feature": "ENABLE_SEMANTIC_CACHE", "value": value, "reason": "runtime toggle test"},
+    )
+    assert response.status_code == 200, response.text
+
+
+def _ask(client):
+    response = client.post("/api/v1/ask", json={"question": "How many employees?"})
+    assert response.status_code == 200
+    assert '"technical_view"' in response.text
+
+
+def test_semantic_cache_toggle_reaches_ask(client):
+    client, service = client
+    initial = get_settings().ENABLE_SEMANTIC_CACHE
+
+    _toggle(client, not initial)
+    _ask(client)
+    assert service.cache_service.lookups == (0 if initial else 1)
+
+    _toggle(client, initial)
+    _ask(client)
+    assert service.cache_service.lookups == 1
+
+
+def test_cache_service_follows_toggle_unless_pinned(client):
+    client, _ = client
+    cache = SemanticCacheService.__new__(SemanticCacheService)
+    initial = get_settings().ENABLE_SEMANTIC_CACHE
+
+    _toggle(client, not initial)
+    assert cache.enabled is (not initial)
+
+    cache.enabled = initial
+    _toggle(client, initial)
+    _toggle(client, not initial)
+    assert cache.enabled is initial
@@ -0,0 +1,153 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.exceptions import InvalidQueryError
+from app.services import semantic_cache_service
+from app.services.semantic_cache_service import SemanticCacheService, clear_local_cache
+
+
+class _FakeCollection:
+    def __init__(self):
+        self.queries = 0
+        self.added = []
+        self.where = None
+        self.n_results = None
+        self.candidates = []
+
+    def query(self, query_texts, n_results, where=None):
+        self.queries += 1
+        self.where, self.n_results = where, n_results
+        hits = self.candidates[:n_results]
+        return {
+            "documents": [[""] * len(hits)],
+            "metadatas": [[{"cache_id": cache_id} for cache_id, _ in hits]],
+            "distances": [[distance for _, distance in hits]],
+        }
+
+    def add(self, ids, documents, metadatas):
+        self.added.append(ids[0])
+
+
+class _Guard:
+    def __init__(self):
+        self.reject = False
+
+    def validate_and_normalise(self, sql, policy=None):
+        if self.reject:
+            raise InvalidQueryError("SECURITY_VIOLATION: denied")
+        return sql
+
+
+POLICY = SimpleNamespace(id="p-1", version=2, status="active", schema_name="HR")
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    collection = _FakeCollection()
+    vector = SimpleNamespace(client=SimpleNamespace(get_or_create_collection=lambda name: collection))
+    monkeypatch.setattr(semantic_cache_service, "create_vector_provider", lambda settings: vector)
+    monkeypatch.setattr(semantic_cache_service, "get_redis_cache", lambda settings: None)
+    clear_local_cache()
+    service = SemanticCacheService(_Guard())
+    service.enabled = True
+    yield service
+    clear_local_cache()
+
+
+def _store(cache, question="How many employees?", scope="admin", data_scope=None):
+    asyncio.run(
+        cache.store(
+            question, "SELECT COUNT(*) FROM employees", POLICY, "openai", "gpt", scope, data_scope=data_scope
+        )
+    )
+
+
+def _lookup(cache, question, policy=POLICY, model="gpt", scope="admin", data_scope=None):
+    return asyncio.run(cache.lookup(question, policy, "openai", model, scope, data_scope=data_scope))
+
+
+def test_repeat_question_skips_vector_search(cache):
+    _store(cache)
+
+    hit, sql, similarity, status = _lookup(cache, "  how MANY   employees ")
+
+    assert (hit, sql, similarity, status) == (True, "SELECT COUNT(*) FROM employees", 1.0, "passed")
+    assert cache.collection.queries == 0
+
+
+def test_exact_tier_works_without_vector_store(cache):
+    cache.collection = None
+    _store(cache)
+
+    assert _lookup(cache, "How many employees?")[:2] == (True, "SELECT COUNT(*) FROM employees")
+    assert _lookup(cache, "employee headcount")[0] is False
+
+
+def test_vector_embedding_awaited_only_on_exact_miss(cache):
+    _store(cache)
+    calls = []
+
+    async def embedding():
+        calls.append(1)
+        return None
+
+    asyncio.run(cache.lookup("How many employees?", POLICY, "openai", "gpt", "admin", embedding=embedding))
+    assert calls == []
+    asyncio.run(cache.lookup("unseen question", POLICY, "openai", "gpt", "admin", embedding=embedding))
+    assert calls == [1]
+
+
+def test_exact_match_is_scoped(cache):
+    _store(cache)
+    other_policy = SimpleNamespace(**{**vars(POLICY), "version": 3})
+
+    assert _lookup(cache, "How many employees?", scope="viewer")[0] is False
+    assert _lookup(cache, "How many employees?", policy=other_policy)[0] is False
+    assert _lookup(cache, "How many employees?", model="gpt-mini")[0] is False
+    assert cache.collection.queries == 3
+
+
+def test_tenants_sharing_a_role_do_not_share_entries(cache):
+    tenant_a, tenant_b = {"tenant_id": "A"}, {"tenant_id": "B"}
+    _store(cache, data_scope=tenant_a)
+    stored_id = cache.collection.added[0]
+
+    assert _lookup(cache, "How many employees?", data_scope=tenant_b)[0] is False
+    scope_filter = {"data_scope": {"$eq": cache._canonical_scope(tenant_b)}}
+    assert scope_filter in cache.collection.where["$and"]
+    # Even a vector candidate returned for tenant A is not under tenant B's key.
+    cache.collection.candidates = [(stored_id, 0.01)]
+    assert _lookup(cache, "employee headcount", data_scope=tenant_b)[0] is False
+    assert _lookup(cache, "How many employees?", data_scope={"tenant_id": "A"})[0] is True
+
+
+def test_failed_revalidation_drops_exact_entry(cache):
+    _store(cache)
+    cache.sql_guard.reject = True
+
+    assert _lookup(cache, "How many employees?")[3] == "failed_revalidation"
+    cache.sql_guard.reject = False
+    assert _lookup(cache, "How many employees?")[0] is False
+    assert cache.collection.queries == 1
+
+
+def test_vector_query_is_scope_filtered(cache):
+    _lookup(cache, "unseen question")
+
+    assert cache.collection.n_results == cache.max_candidates
+    assert {"rbac_scope": {"$eq": "admin"}} in cache.collection.where["$and"]
+    assert {"policy_version": {"$eq": 2}} in cache.collection.where["$and"]
+    assert {"llm_model": {"$eq": "gpt"}} in cache.collection.where["$and"]
+
+
+def test_later_candidate_served_when_nearest_is_stale(cache):
+    _store(cache)
+    stored_id = cache.collection.added[0]
+    cache.collection.candidates = [("scache:gone", 0.01), (stored_id, 0.05), ("scache:far", 0.9)]
+
+    hit, sql, similarity, status = _lookup(cache, "employee headcount")
+
+    assert hit and status == "passed"
+    assert similarity == pytest.approx(0.95)
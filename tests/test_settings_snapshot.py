@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from app.core.config import (
+    Settings,
+    apply_runtime_toggle,
+    clear_runtime_toggles,
+    get_settings,
+    get_settings_version,
+    refresh_settings,
+)
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    path = tmp_path / ".env"
+    path.write_text("APP_NAME=snapshot-a\n", encoding="utf-8")
+    monkeypatch.setitem(Settings.model_config, "env_file", str(path))
+    refresh_settings()
+    yield path
+    monkeypatch.undo()
+    clear_runtime_toggles()
+    refresh_settings()
+
+
+def test_snapshot_is_reused_between_calls(env_file):
+    version = get_settings_version()
+    first = get_settings()
+    second = get_settings()
+
+    assert first is second
+    assert get_settings_version() == version
+    assert first.APP_NAME == "snapshot-a"
+
+
+def test_env_file_change_publishes_new_snapshot(env_file):
+    before = get_settings()
+    version = get_settings_version()
+
+    env_file.write_text("APP_NAME=snapshot-b-changed\n", encoding="utf-8")
+    stat = os.stat(env_file)
+    os.utime(env_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    after = get_settings()
+    assert after is not before
+    assert after.APP_NAME == "snapshot-b-changed"
+    assert get_settings_version() == version + 1
+
+
+def test_runtime_toggle_overrides_env_and_survives_refresh(env_file):
+    current = get_settings().ENABLE_SEMANTIC_CACHE
+    version = get_settings_version()
+
+    apply_runtime_toggle("ENABLE_SEMANTIC_CACHE", not current)
+    assert get_settings().ENABLE_SEMANTIC_CACHE is (not current)
+    assert get_settings_version() == version + 1
+
+    refresh_settings()
+    assert get_settings().ENABLE_SEMANTIC_CACHE is (not current)
+
+    clear_runtime_toggles()
+    assert get_settings().ENABLE_SEMANTIC_CACHE is current
+
+
+def test_unknown_toggle_rejected(env_file):
+    with pytest.raises(ValueError):
+        apply_runtime_toggle("NOT_A_SETTING", True)
+
+
+def test_invalid_toggle_value_leaves_snapshot_untouched(env_file):
+    before = get_settings()
+    version = get_settings_version()
+
+    with pytest.raises(ValueError):
+        apply_runtime_toggle("ENABLE_SEMANTIC_CACHE", "notabool")
+
+    assert get_settings() is before and get_settings_version() == version
+    assert refresh_settings().ENABLE_SEMANTIC_CACHE is before.ENABLE_SEMANTIC_CACHE
@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("sqlglot", reason="sqlglot required for SQL analysis tests")
+from app.core.config import get_settings
+from app.core.exceptions import InvalidQueryError
+from app.utils import sql_analysis
+from app.utils.sql_analysis import analyse_sql, clear_analysis_cache, with_rls
+from app.utils.sql_guard import SQLGuard, SQLGuardViolation
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_analysis_cache()
+    yield
+    clear_analysis_cache()
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    calls = []
+    original = sql_analysis.sqlglot.parse_one
+
+    def counting_parse(sql, **kwargs):
+        calls.append(sql)
+        return original(sql, **kwargs)
+
+    monkeypatch.setattr(sql_analysis.sqlglot, "parse_one", counting_parse)
+    return calls
+
+
+def test_analysis_resolves_aliases_and_limit():
+    statement = analyse_sql(
+        "SELECT e.name /* note */ FROM hr.employees e JOIN departments d ON e.dept_id = d.id LIMIT 5"
+    )
+
+    assert statement.table_refs == (("HR", "EMPLOYEES"), ("", "DEPARTMENTS"))
+    assert statement.tables == frozenset({"EMPLOYEES", "DEPARTMENTS"})
+    assert ("EMPLOYEES", "NAME") in statement.columns
+    assert ("DEPARTMENTS", "ID") in statement.columns
+    assert statement.has_limit
+    assert "FETCH FIRST 5 ROWS ONLY" in statement.sql
+    assert "note" not in statement.sql
+
+
+def test_cte_names_are_not_tables():
+    statement = analyse_sql("WITH x AS (SELECT id FROM employees) SELECT * FROM x")
+    assert statement.tables == frozenset({"EMPLOYEES"})
+    assert not statement.has_limit
+
+
+def test_rls_is_ast_based_and_quoted():
+    statement = analyse_sql("SELECT id FROM employees WHERE a = 1 OR b = 2")
+    filtered = with_rls(statement, "t'1")
+
+    assert "(a = 1 OR b = 2) AND tenant_id = 't''1'" in filtered.sql
+    assert "tenant_id" not in statement.sql
+
+
+def test_pipeline_parses_once(parse_calls):
+    guard = SQLGuard(get_settings())
+    sql = analyse_sql("SELECT id FROM employees").sql
+    filtered = with_rls(analyse_sql(sql), "t1").sql
+
+    guard.validate_and_normalise(filtered)
+    guard.validate_and_normalise(filtered)
+
+    assert parse_calls == ["SELECT id FROM employees"]
+
+
+def test_guard_enforces_columns_through_aliases():
+    guard = SQLGuard(get_settings())
+    policy = SimpleNamespace(
+        allowed_tables=["EMPLOYEES"],
+        denied_tables=[],
+        excluded_tables=[],
+        allowed_columns={"EMPLOYEES": ["ID"]},
+        excluded_columns={},
+    )
+
+    guard.validate_and_normalise("SELECT e.id FROM employees e", policy=policy)
+    with pytest.raises(SQLGuardViolation):
+        guard.validate_and_normalise("SELECT e.salary FROM employees e", policy=policy)
+
+
+def test_unparseable_sql_raises():
+    with pytest.raises(InvalidQueryError):
+        analyse_sql("SELEC FROM WHERE")
+
+
+def test_unterminated_literal_raises():
+    with pytest.raises(InvalidQueryError):
+        analyse_sql("SELECT 'abc FROM dual")
+
+
+def test_subquery_alias_does_not_shadow_outer_alias():
+    statement = analyse_sql(
+        "SELECT e.salary FROM employees e "
+        "WHERE EXISTS (SELECT 1 FROM departments e WHERE e.id = 1) "
+        "AND e.dept_id IN (SELECT d.id FROM departments d WHERE d.head = e.id)"
+    )
+
+    assert ("EMPLOYEES", "SALARY") in statement.columns
+    assert ("DEPARTMENTS", "SALARY") not in statement.columns
+    assert {("DEPARTMENTS", "ID"), ("EMPLOYEES", "ID"), ("DEPARTMENTS", "HEAD")} <= statement.columns
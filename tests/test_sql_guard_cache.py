@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("sqlglot", reason="sqlglot required for SQLGuard tests")
+from app.core.config import get_settings
+from app.utils import sql_guard as sql_guard_module
+from app.utils.sql_analysis import clear_analysis_cache
+from app.utils.sql_guard import (
+    SQLGuard,
+    SQLGuardViolation,
+    clear_verdict_cache,
+    verdict_cache_stats,
+)
+
+
+def _policy(version=1, status="active"):
+    return SimpleNamespace(
+        id="p-1",
+        version=version,
+        status=status,
+        schema_name="HR",
+        allowed_tables=["EMPLOYEES"],
+        denied_tables=["PAYROLL"],
+        excluded_tables=[],
+        allowed_columns={},
+        excluded_columns={},
+    )
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    clear_verdict_cache()
+    clear_analysis_cache()
+    yield
+    clear_verdict_cache()
+    clear_analysis_cache()
+
+
+@pytest.fixture
+def validations(monkeypatch):
+    calls = []
+    original = SQLGuard._validate
+
+    def counting(self, sql, policy):
+        calls.append(sql)
+        return original(self, sql, policy)
+
+    monkeypatch.setattr(SQLGuard, "_validate", counting)
+    return calls
+
+
+def test_repeated_statement_served_from_cache(validations):
+    before = verdict_cache_stats()
+    guard = SQLGuard(get_settings())
+    first = guard.validate_and_normalise("SELECT id FROM employees", policy=_policy())
+    second = SQLGuard(get_settings()).validate_and_normalise(
+        "SELECT id FROM employees", policy=_policy()
+    )
+
+    assert first == second
+    assert len(validations) == 1
+    stats = verdict_cache_stats()
+    assert stats["hits"] - before["hits"] == 1
+    assert stats["misses"] - before["misses"] == 1
+    assert stats["entries"] == 1
+    assert 0 < stats["hit_ratio"] <= 1
+
+
+def test_violations_are_cached_and_reraised(validations):
+    guard = SQLGuard(get_settings())
+    for _ in range(2):
+        with pytest.raises(SQLGuardViolation):
+            guard.validate_and_normalise("SELECT amount FROM payroll", policy=_policy())
+    assert len(validations) == 1
+    assert guard.last_tables == {"PAYROLL"}
+
+
+def test_new_policy_version_and_flags_miss_cache(validations):
+    sql = "SELECT id FROM employees"
+    SQLGuard(get_settings()).validate_and_normalise(sql, policy=_policy(version=1))
+    SQLGuard(get_settings()).validate_and_normalise(sql, policy=_policy(version=2))
+    SQLGuard(get_settings(), allow_dml=True).validate_and_normalise(sql, policy=_policy(version=2))
+    assert len(validations) == 3
+
+
+def test_draft_policies_are_not_cached(validations):
+    guard = SQLGuard(get_settings())
+    for _ in range(2):
+        guard.validate_and_normalise("SELECT id FROM employees", policy=_policy(status="draft"))
+    assert len(validations) == 2
+
+
+def test_cache_disabled_with_zero_size(validations, monkeypatch):
+    monkeypatch.setattr(sql_guard_module._VerdictCache, "capacity", property(lambda self: 0))
+    guard = SQLGuard(get_settings())
+    for _ in range(2):
+        guard.validate_and_normalise("SELECT id FROM employees")
+    assert len(validations) == 2
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from app.api.v1.query import _progress_until_done
+from app.core.config import get_settings
+from app.services.vanna_service import VannaService, complete_statement
+from app.utils.token_counter import estimate_tokens
+
+
+class _StreamingLLM:
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.consumed = 0
+        self.closed = False
+
+    async def generate_sql(self, prompt, temperature, max_tokens):
+        return "".join(self.deltas)
+
+    async def stream_sql(self, prompt, temperature=0.0, max_tokens=512):
+        try:
+            for delta in self.deltas:
+                self.consumed += 1
+                yield delta
+        finally:
+            self.closed = True
+
+
+def _service(deltas, **overrides):
+    service = VannaService.__new__(VannaService)
+    service.settings = get_settings().model_copy(
+        update={
+            "LLM_STREAM_SQL": True,
+            "LLM_STREAM_SQL_DRAFTS": True,
+            "LLM_STREAM_PROGRESS_EVERY_TOKENS": 2,
+            "MAX_SQL_TOKENS": 50,
+            **overrides,
+        }
+    )
+    service.llm = _StreamingLLM(deltas)
+    service.vector = None
+    # Pin the heuristic counter so counts do not depend on tiktoken.
+    service._count_tokens = estimate_tokens
+    return service
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("SELECT id FROM t", None),
+        ("SELECT ';' FROM t; DROP", "SELECT ';' FROM t;"),
+        ("SELECT 1 -- a;b\nFROM dual; x", "SELECT 1 -- a;b\nFROM dual;"),
+        ("```sql\nSELECT 1 FROM dual;\n``` more", "```sql\nSELECT 1 FROM dual;\n```"),
+        ("```sql\nSELECT 1 FROM dual;", None),
+    ],
+)
+def test_complete_statement(text, expected):
+    assert complete_statement(text) == expected
+
+
+def test_stream_stops_at_end_of_statement():
+    deltas = ["SELECT", " id", " FROM", " employees", ";", " Explanation", ":", " this", " query"]
+    service = _service(deltas)
+    events = []
+
+    sql = asyncio.run(service.generate_sql("List ids", context=[], on_progress=events.append))
+
+    assert sql == "SELECT id FROM employees"
+    assert service.llm.consumed == 5 and service.llm.closed
+    assert [e["tokens"] for e in events] == [2, 4, 7, 8]
+    assert all(e["authoritative"] is False for e in events)
+    assert events[-1]["status"] == "generated"
+    assert events[-1]["sql_draft"] == "SELECT id FROM employees;"
+
+
+def test_runaway_generation_is_aborted():
+    service = _service(["SELECT"] + [" x,"] * 100, MAX_SQL_TOKENS=10, LLM_STREAM_SQL_DRAFTS=False)
+    events = []
+
+    sql = asyncio.run(service.generate_sql("List ids", context=[], on_progress=events.append))
+
+    assert sql == ""
+    assert service.llm.consumed == 6 and service.llm.closed
+    assert events and all("sql_draft" not in e for e in events)
+
+
+def test_token_limit_counts_tokens_not_deltas():
+    service = _service(["SELECT a, b, c, d, e, f FROM employees WHERE id = 1"], MAX_SQL_TOKENS=10)
+
+    sql = asyncio.run(service.generate_sql("List ids", context=[], on_progress=lambda event: None))
+
+    assert sql == ""
+    assert service.llm.consumed == 1 and service.llm.closed
+
+
+def test_without_callback_the_completion_is_not_streamed():
+    service = _service(["SELECT id FROM employees"])
+
+    sql = asyncio.run(service.generate_sql("List ids", context=[]))
+
+    assert sql == "SELECT id FROM employees"
+    assert service.llm.consumed == 0
+
+
+def test_progress_is_forwarded_until_prepare_finishes():
+    async def scenario():
+        progress = asyncio.Queue()
+
+        async def prepare():
+            for tokens in (16, 32):
+                progress.put_nowait({"tokens": tokens})
+                await asyncio.sleep(0)
+            await asyncio.sleep(0.01)
+            return {"sql": "SELECT 1 FROM dual"}
+
+        task = asyncio.create_task(prepare())
+        events = [event async for event in _progress_until_done(task, progress)]
+        return events, task.result()
+
+    events, result = asyncio.run(scenario())
+
+    assert events == [{"tokens": 16}, {"tokens": 32}]
+    assert result["sql"] == "SELECT 1 FROM dual"
@@ -51,7 +51,7 @@ async def _prepare_with_mocks(spans):
     tracer = trace.get_tracer(__name__)
     # Patch dependencies to avoid external calls
     svc.arabic_engine = DummyArabicEngine(tracer)
-    async def _gen_sql(q):
+    async def _gen_sql(q, embedding=None, context=None, on_progress=None):
         return "SELECT 1 FROM DUAL"
     svc.vanna_service.generate_sql = _gen_sql
     svc.vanna_service.inject_rls_filters = lambda sql, scope: sql
@@ -68,12 +68,9 @@ async def _prepare_with_mocks(spans):
         },
     )()
     svc.cache_service.enabled = True
-    svc.cache_service.lookup = lambda **kwargs: (
-        False,
-        None,
-        0.0,
-        "miss",
-    )
+    async def _lookup(**kwargs):
+        return False, None, 0.0, "miss"
+    svc.cache_service.lookup = _lookup
     svc.sql_guard.validate_and_normalise = lambda sql, policy=None: sql
 
     try: